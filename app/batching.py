@@ -0,0 +1,103 @@
+import asyncio
+from app.executor import QueueFullError
+from app.monitoring import prediction_batch_size, prediction_batcher_queue_depth, inference_rejections_total
+
+class MicroBatcher:
+    """
+    Dynamic request batching for single-row predictions.
+
+    Concurrent `submit` calls are queued and merged into one batch of up to
+    `max_batch_size` rows, waiting at most `max_wait_ms` after the first row
+    arrives. The batch is scored with one vectorized `score_fn` call (an async
+    callable returning one result per record) and the results are fanned back
+    out to the callers.
+
+    At most `max_concurrency` batches are scored at once; while they run, new
+    requests keep queueing, so batches grow with load. Once `max_pending`
+    requests are waiting, further ones are rejected with QueueFullError.
+    """
+
+    def __init__(self, score_fn, max_batch_size: int = 32, max_wait_ms: float = 5.0,
+                 max_concurrency: int = 1, max_pending: int = None):
+        self.score_fn = score_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_pending
+        self._queue = None
+        self._slots = None
+        self._worker = None
+        self._scoring = set()
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        tasks = list(self._scoring)
+        if self._worker is not None:
+            tasks.append(self._worker)
+            self._worker = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def submit(self, record: dict):
+        """Queues one record and waits for its result."""
+        if self.max_pending is not None and self._queue.qsize() >= self.max_pending:
+            inference_rejections_total.inc()
+            raise QueueFullError(f"Prediction queue is full ({self.max_pending} waiting).")
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((record, future))
+        prediction_batcher_queue_depth.set(self._queue.qsize())
+        return await future
+
+    async def _collect(self):
+        # Block for the first request, then gather more until the batch is full or the window closes
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        prediction_batcher_queue_depth.set(self._queue.qsize())
+        return batch
+
+    async def _run(self):
+        while True:
+            # Wait for a free scoring slot before forming the next batch
+            await self._slots.acquire()
+            batch = await self._collect()
+            # Callers that already gave up (e.g. client disconnected) are dropped
+            batch = [(record, future) for record, future in batch if not future.done()]
+            if not batch:
+                self._slots.release()
+                continue
+
+            prediction_batch_size.observe(len(batch))
+            task = asyncio.create_task(self._score(batch))
+            self._scoring.add(task)
+            task.add_done_callback(self._scoring.discard)
+
+    async def _score(self, batch):
+        try:
+            results = await self.score_fn([record for record, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._slots.release()
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
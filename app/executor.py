@@ -0,0 +1,65 @@
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from app.monitoring import inference_queue_depth, inference_queue_wait_seconds, inference_rejections_total
+
+class QueueFullError(Exception):
+    """Raised when the inference queue is full and the request is shed (HTTP 429)."""
+
+def _timed_call(fn, args):
+    # Runs in the worker (thread or process); wall-clock time is comparable across processes
+    return time.time(), fn(*args)
+
+class InferenceExecutor:
+    """
+    Sized worker pool for model inference with a bounded queue.
+
+    At most `max_workers` calls run at once and at most `max_queue_depth` more
+    wait for a worker. Anything beyond that is rejected immediately with
+    QueueFullError instead of piling up latency.
+    With kind="process", `fn` and its arguments must be picklable.
+    """
+
+    def __init__(self, kind="thread", max_workers=1, max_queue_depth=32, initializer=None, initargs=()):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown executor kind '{kind}', expected 'thread' or 'process'")
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self._in_flight = 0
+        pool_cls = ThreadPoolExecutor if kind == "thread" else ProcessPoolExecutor
+        self._pool = pool_cls(max_workers=max_workers, initializer=initializer, initargs=initargs)
+
+    @property
+    def queue_depth(self):
+        """Calls submitted but still waiting for a free worker."""
+        return max(0, self._in_flight - self.max_workers)
+
+    def _update_depth(self):
+        inference_queue_depth.set(self.queue_depth)
+
+    async def run(self, fn, *args, shed=True):
+        """Runs `fn(*args)` on the pool without blocking the event loop.
+
+        Args:
+            shed (bool): reject with QueueFullError when the queue is full.
+                Pass False for follow-up work of an already admitted request.
+        """
+        if shed and self._in_flight >= self.max_workers + self.max_queue_depth:
+            inference_rejections_total.inc()
+            raise QueueFullError(f"Inference queue is full ({self.max_queue_depth} waiting).")
+
+        self._in_flight += 1
+        self._update_depth()
+        submitted = time.time()
+        try:
+            loop = asyncio.get_running_loop()
+            started, result = await loop.run_in_executor(self._pool, _timed_call, fn, args)
+            inference_queue_wait_seconds.observe(max(0.0, started - submitted))
+            return result
+        finally:
+            self._in_flight -= 1
+            self._update_depth()
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
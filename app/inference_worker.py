@@ -0,0 +1,26 @@
+from src.pipeline.prediction_pipeline import PredictionPipeline
+
+# Per-process pipeline used when serving.executor.kind is "process"
+worker_pipeline = None
+
+def init_worker():
+    """Process pool initializer: each worker loads its own pipeline (from the local model cache)."""
+    global worker_pipeline
+    worker_pipeline = PredictionPipeline()
+
+def score_records_in_worker(records, model_version):
+    """
+    Scores records inside a worker process with `model_version`,
+    reloading first if the parent has hot-swapped to another version.
+    Returns one (prediction, probability, model_version, threshold) tuple per record.
+    """
+    global worker_pipeline
+    if worker_pipeline is None or worker_pipeline.model_version != model_version:
+        worker_pipeline = PredictionPipeline()
+        worker_pipeline.load_resources(version=model_version)
+
+    churn_vals, churn_probs = worker_pipeline.predict_batch(records)
+    return [
+        (int(churn_val), float(churn_prob), worker_pipeline.model_version, worker_pipeline.threshold)
+        for churn_val, churn_prob in zip(churn_vals, churn_probs)
+    ]
@@ -1,30 +1,149 @@
 import uvicorn
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+import json
+import asyncio
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
 from contextlib import asynccontextmanager
 import os
+from typing import Optional
 from src.pipeline.prediction_pipeline import PredictionPipeline
+from src.utils.common import read_yaml
+from src.constants import PARAMS_FILE_PATH
+from app.batching import MicroBatcher
+from app.executor import InferenceExecutor, QueueFullError
+from app.inference_worker import init_worker, score_records_in_worker
+from app.prediction_cache import build_prediction_cache
+from app.reloader import ModelReloader
 
 # Monitoring
 from prometheus_fastapi_instrumentator import Instrumentator
 from app.monitoring import churn_prediction_total, prediction_latency_seconds, churn_probability_histogram
+from app.monitoring import model_load_seconds, record_first_prediction, set_serving_model_version, mark_process_dead
 
 # --- Global Pipeline ---
 pipeline = None
+batcher = None
+executor = None
+prediction_cache = None
+
+# --- Serving Config ---
+serving_config = read_yaml(PARAMS_FILE_PATH).serving
+
+def swap_pipeline(new_pipeline):
+    """Atomically replaces the serving pipeline (a single reference assignment)."""
+    global pipeline
+    pipeline = new_pipeline
+    set_serving_model_version(new_pipeline.model_version)
+    if prediction_cache is not None:
+        prediction_cache.invalidate(new_pipeline.model_version)
+
+def score_records(records):
+    """
+    Scores records with the pipeline being served right now.
+    Returns one (prediction, probability, model_version, threshold) tuple per record,
+    so callers report the threshold and version of the pipeline that actually
+    scored them, even if a hot reload swaps it in the meantime.
+    """
+    serving_pipeline = pipeline
+    churn_vals, churn_probs = serving_pipeline.predict_batch(records)
+    return [
+        (int(churn_val), float(churn_prob), serving_pipeline.model_version, serving_pipeline.threshold)
+        for churn_val, churn_prob in zip(churn_vals, churn_probs)
+    ]
+
+async def run_inference(records, shed=True):
+    """Scores records on the inference executor; raises QueueFullError when it is saturated."""
+    if executor.kind == "process":
+        # Workers hold their own pipeline; pass the served version so they follow hot reloads
+        return await executor.run(score_records_in_worker, records, pipeline.model_version, shed=shed)
+    return await executor.run(score_records, records, shed=shed)
+
+async def predict_records(records, score_fn):
+    """Scores records with `score_fn`, answering repeat customers from the prediction cache."""
+    if prediction_cache is None:
+        return await score_fn(records)
+    serving_pipeline = pipeline
+    return await prediction_cache.score(records, serving_pipeline.model_version, serving_pipeline.threshold, score_fn)
+
+async def submit_to_batcher(records):
+    return [await batcher.submit(records[0])]
+
+async def refresh_model_cache():
+    """Checks the registry in the background after a warm start from the local cache."""
+    try:
+        await asyncio.to_thread(pipeline.refresh_cache)
+    except Exception as e:
+        print(f"⚠️ Background registry check failed: {e}")
 
 # --- Lifespan Manager ---
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global pipeline
+    global pipeline, batcher, executor, prediction_cache
+    cache_refresh = None
+    reloader = None
     
     try:
         pipeline = PredictionPipeline()
         pipeline.load_resources()
+        model_load_seconds.labels(source=pipeline.loaded_from).set(pipeline.load_seconds)
+        set_serving_model_version(pipeline.model_version)
         print("✅ Prediction Pipeline loaded successfully.")
     except Exception as e:
         print(f"❌ Error loading pipeline: {e}")
+
+    reload_config = serving_config.hot_reload
+    if reload_config.enabled:
+        # First check runs right away, which also refreshes a cache-loaded model
+        reloader = ModelReloader(
+            lambda: pipeline,
+            swap_pipeline,
+            PredictionPipeline,
+            poll_interval_seconds=reload_config.poll_interval_seconds
+        )
+        await reloader.start()
+    elif pipeline is not None and pipeline.loaded_from == "cache":
+        cache_refresh = asyncio.create_task(refresh_model_cache())
+
+    cache_config = serving_config.prediction_cache
+    if cache_config.enabled:
+        prediction_cache = build_prediction_cache(cache_config, redis_url=os.getenv("REDIS_URL"))
+        if pipeline is not None:
+            prediction_cache.invalidate(pipeline.model_version)
+
+    executor_config = serving_config.executor
+    executor = InferenceExecutor(
+        kind=executor_config.kind,
+        max_workers=executor_config.max_workers,
+        max_queue_depth=executor_config.max_queue_depth,
+        initializer=init_worker if executor_config.kind == "process" else None
+    )
+
+    batching_config = serving_config.dynamic_batching
+    if batching_config.enabled:
+        # One batch per worker in flight; the queue holds `max_queue_depth` batches worth of rows
+        batcher = MicroBatcher(
+            run_inference,
+            max_batch_size=batching_config.max_batch_size,
+            max_wait_ms=batching_config.max_wait_ms,
+            max_concurrency=executor_config.max_workers,
+            max_pending=executor_config.max_queue_depth * batching_config.max_batch_size
+        )
+        await batcher.start()
+
     yield
 
+    if batcher is not None:
+        await batcher.stop()
+        batcher = None
+    if reloader is not None:
+        await reloader.stop()
+    executor.shutdown()
+    executor = None
+    mark_process_dead()
+    if cache_refresh is not None:
+        cache_refresh.cancel()
+
 # --- API App ---
 app = FastAPI(title="Churn Prediction API", lifespan=lifespan)
 
@@ -32,16 +151,20 @@ app = FastAPI(title="Churn Prediction API", lifespan=lifespan)
 Instrumentator().instrument(app).expose(app)
 
 # --- Pydantic Schema ---
+# Every field may be missing; the model's preprocessor imputes it like it did in training
 class CustomerData(BaseModel):
-    tenure: int
-    monthly_charges: float
-    total_charges: float
-    contract: str
-    payment_method: str
-    internet_service: str
-    tech_support: str
-    online_security: str
-    support_calls: int
+    tenure: Optional[int] = None
+    monthly_charges: Optional[float] = None
+    total_charges: Optional[float] = None
+    contract: Optional[str] = None
+    payment_method: Optional[str] = None
+    internet_service: Optional[str] = None
+    tech_support: Optional[str] = None
+    online_security: Optional[str] = None
+    support_calls: Optional[int] = None
+
+def to_label(churn_val):
+    return "Churn" if churn_val == 1 else "No Churn"
 
 # --- Endpoints ---
 @app.get("/")
@@ -49,7 +172,7 @@ def home():
     return {"message": "Churn Prediction API (Unified Pipeline) is Live."}
 
 @app.post("/predict")
-def predict_churn(customer: CustomerData):
+async def predict_churn(customer: CustomerData):
     global pipeline
     if not pipeline:
          raise HTTPException(status_code=503, detail="Pipeline not loaded.")
@@ -58,26 +181,109 @@ def predict_churn(customer: CustomerData):
         # Measure Latency
         with prediction_latency_seconds.time():
             # Just pass dictionary. Pipeline handles everything.
-            # Returns (prediction, probability)
-            churn_val, churn_prob = pipeline.predict(customer.model_dump())
+            # Returns (prediction, probability, model version, threshold) of the pipeline that scored it
+            # Batched: merged with concurrent requests into one vectorized call
+            score_fn = submit_to_batcher if batcher is not None else run_inference
+            churn_val, churn_prob, model_version, threshold = (await predict_records([customer.model_dump()], score_fn))[0]
             
-        result = "Churn" if churn_val == 1 else "No Churn"
+        result = to_label(churn_val)
         
         # Log Metrics
         churn_prediction_total.labels(
             prediction_class=result, 
-            model_version="v1"  # Ideally dynamically fetched
+            model_version=model_version
         ).inc()
         
         churn_probability_histogram.observe(churn_prob)
+        record_first_prediction()
         
         return {
             "prediction": result,
-            "probability": float(churn_prob)
+            "probability": float(churn_prob),
+            "threshold": threshold,
+            "model_version": model_version
         }
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/predict/batch")
+async def predict_churn_batch(request: Request):
+    """
+    Scores many customers in columnar chunks.
+    Accepts a JSON list of CustomerData, or NDJSON (one CustomerData per line)
+    when sent with an `application/x-ndjson` content type.
+    JSON input is answered with a streamed `{"predictions": [...]}` document,
+    NDJSON input with one result line per record.
+    """
+    global pipeline
+    if not pipeline:
+         raise HTTPException(status_code=503, detail="Pipeline not loaded.")
+
+    body = await request.body()
+    ndjson = "ndjson" in request.headers.get("content-type", "")
+
+    try:
+        if ndjson:
+            raw_records = [json.loads(line) for line in body.splitlines() if line.strip()]
+        else:
+            raw_records = json.loads(body)
+            if not isinstance(raw_records, list):
+                raise ValueError("Expected a JSON list of customer records.")
+        records = [CustomerData.model_validate(r).model_dump() for r in raw_records]
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    chunk_size = serving_config.batch_chunk_size
+    chunks = [records[start:start + chunk_size] for start in range(0, len(records), chunk_size)]
+
+    # Score the first chunk before streaming starts, so a saturated executor can still answer 429
+    try:
+        first_scored = await predict_records(chunks[0], run_inference) if chunks else []
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+    async def unshed_inference(chunk):
+        return await run_inference(chunk, shed=False)
+
+    async def score_chunks():
+        for i, chunk in enumerate(chunks):
+            # The request is already admitted, so the remaining chunks are never shed
+            scored = first_scored if i == 0 else await predict_records(chunk, unshed_inference)
+
+            results = []
+            for churn_val, churn_prob, model_version, threshold in scored:
+                result = to_label(churn_val)
+                churn_prediction_total.labels(prediction_class=result, model_version=model_version).inc()
+                churn_probability_histogram.observe(churn_prob)
+                results.append({
+                    "prediction": result,
+                    "probability": churn_prob,
+                    "threshold": threshold,
+                    "model_version": model_version
+                })
+            record_first_prediction()
+            yield results
+
+    async def stream_ndjson():
+        async for results in score_chunks():
+            yield "".join(json.dumps(r) + "\n" for r in results)
+
+    async def stream_json():
+        yield '{"predictions": ['
+        first = True
+        async for results in score_chunks():
+            if results:
+                yield ("" if first else ", ") + ", ".join(json.dumps(r) for r in results)
+                first = False
+        yield "]}"
+
+    if ndjson:
+        return StreamingResponse(stream_ndjson(), media_type="application/x-ndjson")
+    return StreamingResponse(stream_json(), media_type="application/json")
 
 
 if __name__ == "__main__":
@@ -1,4 +1,11 @@
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+import os
+import time
+from prometheus_client import Counter, Gauge, Histogram
+from prometheus_client import multiprocess
+
+# With several server processes (app/serve.py), PROMETHEUS_MULTIPROC_DIR is set before
+# this module is imported: every metric is written to per-process files in that directory
+# and aggregated at scrape time. `multiprocess_mode` says how each Gauge is combined.
 
 # --- Custom Business Metrics ---
 
@@ -27,7 +34,120 @@ churn_probability_histogram = Histogram(
     buckets=[0.0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0]
 )
 
+# 4. Dynamic Batch Size (Histogram)
+# How many concurrent /predict requests were merged into one model call
+prediction_batch_size = Histogram(
+    "prediction_batch_size",
+    "Number of requests merged into a single model call by the dynamic batcher",
+    buckets=[1, 2, 4, 8, 16, 32, 64, 128]
+)
+
+# 5. Startup (Gauges)
+# Where the model came from on startup and how long it took, plus the
+# time from process launch until the first successful prediction
+model_load_seconds = Gauge(
+    "model_load_seconds",
+    "Time taken to load the serving model in seconds",
+    ["source"],
+    multiprocess_mode="max"
+)
+
+model_cold_start_seconds = Gauge(
+    "model_cold_start_seconds",
+    "Seconds from process launch to the first successful prediction",
+    multiprocess_mode="max"
+)
+
+def process_start_time():
+    """Process launch time (epoch seconds). Uses /proc on Linux, import time elsewhere."""
+    try:
+        with open("/proc/stat") as f:
+            boot_time = next(float(line.split()[1]) for line in f if line.startswith("btime"))
+        with open("/proc/self/stat") as f:
+            # starttime is field 22, counted after the parenthesised command name
+            start_ticks = float(f.read().rsplit(")", 1)[1].split()[19])
+        return boot_time + start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, StopIteration, IndexError):
+        return time.time()
+
+PROCESS_START_TIME = process_start_time()
+_first_prediction_recorded = False
+
+def record_first_prediction():
+    """Sets model_cold_start_seconds once, on the first successful prediction."""
+    global _first_prediction_recorded
+    if not _first_prediction_recorded:
+        _first_prediction_recorded = True
+        model_cold_start_seconds.set(time.time() - PROCESS_START_TIME)
+
+# 6. Hot Reload (Counter / Gauge)
+# Registry alias polling: reload outcomes and the version currently served
+model_reloads_total = Counter(
+    "model_reloads_total",
+    "Number of hot model reloads triggered by a registry alias change",
+    ["status"]
+)
+
+serving_model_info = Gauge(
+    "serving_model_info",
+    "Model version currently being served (value is the number of processes serving it)",
+    ["model_version"],
+    multiprocess_mode="livesum"
+)
+
+_served_version = None
+
+def set_serving_model_version(model_version):
+    """Points serving_model_info at the version now being served."""
+    global _served_version
+    if _served_version is not None:
+        # In multiprocess mode the old value outlives clear() in this process' file
+        serving_model_info.labels(model_version=_served_version).set(0)
+    serving_model_info.clear()
+    _served_version = str(model_version)
+    serving_model_info.labels(model_version=_served_version).set(1)
+
+# 7. Inference Executor (Gauge / Histogram / Counter)
+# Bounded worker pool: backlog, time spent waiting for a worker, and shed requests
+inference_queue_depth = Gauge(
+    "inference_queue_depth",
+    "Inference calls waiting for a free worker",
+    multiprocess_mode="livesum"
+)
+
+inference_queue_wait_seconds = Histogram(
+    "inference_queue_wait_seconds",
+    "Time an inference call waited for a free worker in seconds",
+    buckets=[0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0]
+)
+
+inference_rejections_total = Counter(
+    "inference_rejections_total",
+    "Requests rejected with HTTP 429 because the inference queue was full"
+)
+
+prediction_batcher_queue_depth = Gauge(
+    "prediction_batcher_queue_depth",
+    "Single-row requests waiting to be merged into a batch",
+    multiprocess_mode="livesum"
+)
+
+# 8. Prediction Cache (Counters)
+# Repeat customer profiles answered without running the model
+prediction_cache_hits_total = Counter(
+    "prediction_cache_hits_total",
+    "Predictions served from the prediction cache"
+)
+
+prediction_cache_misses_total = Counter(
+    "prediction_cache_misses_total",
+    "Predictions not found in the prediction cache"
+)
+
 # --- Metric Exposure Logic ---
-def get_metrics():
-    """Returns all metrics in Prometheus text format"""
-    return generate_latest(), CONTENT_TYPE_LATEST
+# /metrics is served by prometheus-fastapi-instrumentator (app/main.py), which builds a
+# MultiProcessCollector itself when PROMETHEUS_MULTIPROC_DIR is set
+def mark_process_dead():
+    """Drops this process' live gauges from the multiprocess files (call on worker shutdown)."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,120 @@
+import json
+import time
+import hashlib
+from collections import OrderedDict
+from app.monitoring import prediction_cache_hits_total, prediction_cache_misses_total
+
+class LocalCacheBackend:
+    """In-process LRU cache with a per-entry TTL."""
+
+    def __init__(self, max_entries=10000, ttl_seconds=300):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+class RedisCacheBackend:
+    """Shared cache for all replicas, with expiry handled by Redis. Needs the `redis` package."""
+
+    def __init__(self, url, ttl_seconds=300, prefix="churn:prediction:"):
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError("serving.prediction_cache.backend 'redis' requires the redis package") from e
+        self.client = redis.Redis.from_url(url)
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        return None if value is None else tuple(json.loads(value))
+
+    def set(self, key, value):
+        self.client.set(self.prefix + key, json.dumps(value), ex=self.ttl_seconds)
+
+    def clear(self):
+        # Keys embed the model version, so entries of other versions are never read; let them expire
+        pass
+
+class PredictionCache:
+    """
+    Caches (prediction, probability, model_version, threshold) results per customer.
+
+    Keys are a sha256 over the canonical JSON of the validated record plus the
+    model version and decision threshold, so a hot reload can never serve a
+    stale prediction; the local backend is also emptied when the served
+    version changes.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.model_version = None
+
+    @staticmethod
+    def key(record, model_version, threshold):
+        payload = json.dumps(record, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(f"{model_version}|{threshold}|{payload}".encode()).hexdigest()
+
+    def invalidate(self, model_version):
+        """Drops every entry once a different model version is being served."""
+        if str(model_version) != self.model_version:
+            self.model_version = str(model_version)
+            self.backend.clear()
+
+    def get_many(self, records, model_version, threshold):
+        """Returns the cached result for each record, or None on a miss."""
+        results = [self.backend.get(self.key(record, model_version, threshold)) for record in records]
+        hits = sum(result is not None for result in results)
+        prediction_cache_hits_total.inc(hits)
+        prediction_cache_misses_total.inc(len(results) - hits)
+        return results
+
+    def set_many(self, records, results):
+        for record, result in zip(records, results):
+            # Stored under the version and threshold that actually scored the record
+            _, _, model_version, threshold = result
+            self.backend.set(self.key(record, model_version, threshold), result)
+
+    async def score(self, records, model_version, threshold, score_fn):
+        """Serves cached results and scores only the misses with `score_fn` (async, records -> results)."""
+        results = self.get_many(records, model_version, threshold)
+        misses = [i for i, result in enumerate(results) if result is None]
+        if misses:
+            missed_records = [records[i] for i in misses]
+            scored = await score_fn(missed_records)
+            self.set_many(missed_records, scored)
+            for i, result in zip(misses, scored):
+                results[i] = result
+        return results
+
+def build_prediction_cache(cache_config, redis_url=None):
+    """Creates the PredictionCache described by `serving.prediction_cache`."""
+    if cache_config.backend == "redis":
+        backend = RedisCacheBackend(redis_url or cache_config.redis_url, ttl_seconds=cache_config.ttl_seconds)
+    elif cache_config.backend == "memory":
+        backend = LocalCacheBackend(max_entries=cache_config.max_entries, ttl_seconds=cache_config.ttl_seconds)
+    else:
+        raise ValueError(f"Unknown prediction cache backend '{cache_config.backend}', expected 'memory' or 'redis'")
+    return PredictionCache(backend)
@@ -0,0 +1,70 @@
+import asyncio
+from src.logger import logger
+from app.monitoring import model_reloads_total
+
+class ModelReloader:
+    """
+    Zero-downtime hot reload of the serving pipeline.
+
+    Polls the registry alias every `poll_interval_seconds`. When it points to
+    a different version, a fresh pipeline is loaded in a worker thread (the
+    event loop keeps serving) and handed to `swap_pipeline`, which replaces
+    the serving reference in one assignment. Requests already in flight keep
+    the pipeline object they started with.
+    """
+
+    def __init__(self, get_pipeline, swap_pipeline, pipeline_factory, poll_interval_seconds: float = 60.0):
+        self.get_pipeline = get_pipeline
+        self.swap_pipeline = swap_pipeline
+        self.pipeline_factory = pipeline_factory
+        self.poll_interval = poll_interval_seconds
+        self._task = None
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _load(self, version):
+        pipeline = self.pipeline_factory()
+        pipeline.load_resources(version=version)
+        return pipeline
+
+    async def check(self):
+        """Reloads if the registry alias moved. Returns True when a new pipeline was swapped in."""
+        current = self.get_pipeline()
+        # Any instance can answer the registry query; build one if startup failed
+        probe = current if current is not None else self.pipeline_factory()
+        version = await asyncio.to_thread(probe.registry_version)
+        # Shared-model pipelines hold only the mapped engine, no sklearn model
+        loaded = current is not None and (current.model is not None or getattr(current, "engine", None) is not None)
+        if loaded and version == current.model_version:
+            return False
+
+        served = current.model_version if current is not None else None
+        logger.info(f"Registry alias moved to version {version} (serving {served}). Loading in background...")
+        try:
+            new_pipeline = await asyncio.to_thread(self._load, version)
+        except Exception:
+            model_reloads_total.labels(status="failure").inc()
+            raise
+
+        self.swap_pipeline(new_pipeline)
+        model_reloads_total.labels(status="success").inc()
+        logger.info(f"Now serving model version {version}.")
+        return True
+
+    async def _run(self):
+        while True:
+            try:
+                await self.check()
+            except Exception as e:
+                logger.warning(f"Model reload check failed: {e}")
+            await asyncio.sleep(self.poll_interval)
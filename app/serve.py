@@ -0,0 +1,42 @@
+import os
+import shutil
+import uvicorn
+from src.utils.common import read_yaml
+from src.constants import PARAMS_FILE_PATH
+
+def prepare_metrics_dir(metrics_dir):
+    """Starts Prometheus multiprocess mode with an empty directory (stale files would be summed in)."""
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir)
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = os.path.abspath(metrics_dir)
+
+def export_shared_model():
+    """Loads the model once in the launcher, so workers only have to map the shared export."""
+    # Imported here: nothing that touches prometheus_client may load before the metrics dir is set
+    from src.pipeline.prediction_pipeline import PredictionPipeline
+    try:
+        pipeline = PredictionPipeline()
+        pipeline.load_resources()
+        print(f"✅ Shared model version {pipeline.model_version} ready ({pipeline.loaded_from}).")
+    except Exception as e:
+        # Workers retry on their own startup
+        print(f"⚠️ Could not export the shared model: {e}")
+
+def main():
+    serving_config = read_yaml(PARAMS_FILE_PATH).serving
+    workers = int(os.getenv("WEB_CONCURRENCY", serving_config.workers))
+
+    if workers > 1:
+        prepare_metrics_dir(os.getenv("PROMETHEUS_MULTIPROC_DIR", serving_config.metrics_dir))
+    if serving_config.shared_model.enabled:
+        export_shared_model()
+
+    uvicorn.run(
+        "app.main:app",
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", 8000)),
+        workers=workers
+    )
+
+if __name__ == "__main__":
+    main()
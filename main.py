@@ -1,46 +1,39 @@
+import argparse
 from src.logger import logger
 from src.pipeline.stage_01_data_ingestion import DataIngestionTrainingPipeline
 from src.pipeline.stage_02_data_transformation import DataTransformationTrainingPipeline
+from src.pipeline.stage_02b_model_tuner import ModelTunerTrainingPipeline
 from src.pipeline.stage_03_model_trainer import ModelTrainerTrainingPipeline
 from src.pipeline.stage_04_model_evaluation import ModelEvaluationTrainingPipeline
+from src.pipeline.stage_runner import StageRunner
+from src.utils.common import read_yaml
+from src.constants import CONFIG_FILE_PATH
 import sys
 
-STAGE_NAME = "Data Ingestion stage"
-try:
-    logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<") 
-    data_ingestion = DataIngestionTrainingPipeline()
-    data_ingestion.main()
-    logger.info(f">>>>>> stage {STAGE_NAME} completed <<<<<<\n\nx==========x")
-except Exception as e:
-    logger.exception(e)
-    raise e
+# (dvc.yaml stage, display name, pipeline class); the run order follows the deps / outs in dvc.yaml
+STAGES = [
+    ("data_ingestion", "Data Ingestion stage", DataIngestionTrainingPipeline),
+    ("data_transformation", "Data Transformation stage", DataTransformationTrainingPipeline),
+    ("model_tuner", "Model Tuner stage", ModelTunerTrainingPipeline),
+    ("model_trainer", "Model Trainer stage", ModelTrainerTrainingPipeline),
+    ("model_evaluation", "Model Evaluation stage", ModelEvaluationTrainingPipeline),
+]
 
-STAGE_NAME = "Data Transformation stage"
-try:
-    logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<") 
-    data_transformation = DataTransformationTrainingPipeline()
-    data_transformation.main()
-    logger.info(f">>>>>> stage {STAGE_NAME} completed <<<<<<\n\nx==========x")
-except Exception as e:
-    logger.exception(e)
-    raise e
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the training pipeline, skipping up-to-date stages")
+    parser.add_argument("--force", action="store_true", help="run every stage, even if its inputs did not change")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="maximum number of independent stages to run at once, each in its own process")
+    args = parser.parse_args()
 
-STAGE_NAME = "Model Trainer stage"
-try:
-    logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<") 
-    model_trainer = ModelTrainerTrainingPipeline()
-    model_trainer.main()
-    logger.info(f">>>>>> stage {STAGE_NAME} completed <<<<<<\n\nx==========x")
-except Exception as e:
-    logger.exception(e)
-    raise e
+    config = read_yaml(CONFIG_FILE_PATH)
+    runner = StageRunner(config.stage_manifest_path, force=args.force)
 
-STAGE_NAME = "Model Evaluation stage"
-try:
-    logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<") 
-    model_evaluation = ModelEvaluationTrainingPipeline()
-    model_evaluation.main()
-    logger.info(f">>>>>> stage {STAGE_NAME} completed <<<<<<\n\nx==========x")
-except Exception as e:
-    logger.exception(e)
-    raise e
+    try:
+        runner.run_all([(name, stage_name, pipeline_cls().main) for name, stage_name, pipeline_cls in STAGES],
+                       jobs=args.jobs)
+    except Exception as e:
+        logger.exception(e)
+        raise e
+
+    logger.info(f"Pipeline summary:\n{runner.summary()}")
@@ -0,0 +1,33 @@
+import mlflow
+import os
+import sys
+import yaml
+from src.utils.model_cache import ModelCache
+
+def bake_model():
+    """Downloads the current target-stage model into the local model cache (e.g. at image build time)."""
+    # 0. Load Config
+    with open("params.yaml", "r") as f:
+        params = yaml.safe_load(f)
+
+    model_name = params["mlflow_config"]["model_name"]
+    target_stage = params["model_deployment"]["target_stage"]
+    cache_dir = os.getenv("MODEL_CACHE_DIR", params["serving"]["model_cache"]["cache_dir"])
+
+    # Credentials check
+    tracking_uri = os.getenv("MLFLOW_TRACKING_URI")
+    if not tracking_uri:
+        print("❌ Error: MLFLOW_TRACKING_URI not set.")
+        sys.exit(1)
+
+    mlflow.set_tracking_uri(tracking_uri)
+    client = mlflow.MlflowClient()
+
+    version = client.get_model_version_by_alias(model_name, target_stage).version
+    print(f"📦 Baking {model_name} version {version} (@{target_stage}) into {cache_dir}...")
+
+    path = ModelCache(cache_dir).fetch(model_name, version, alias=target_stage)
+    print(f"✅ Cached at {path}")
+
+if __name__ == "__main__":
+    bake_model()
@@ -0,0 +1,49 @@
+import argparse
+import os
+import tempfile
+import time
+import pandas as pd
+from src.utils.artifacts import save_dataframe, load_dataframe
+from src.utils.transformers import FeaturePreprocessor
+
+DATASET_PATH = "customer_churn_dataset/customer_churn_dataset.csv"
+
+
+def time_it(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark_artifacts(dataset_path=DATASET_PATH, scale=50, compression="zstd", repeats=3):
+    df = pd.read_csv(dataset_path)
+    raw = pd.concat([df] * scale, ignore_index=True)
+    raw["customer_id"] = range(1, len(raw) + 1)
+
+    # The train/test artifacts hold the label encoded frame
+    clean = raw.drop(columns=["customer_id"]).fillna({"internet_service": "Unknown"})
+    encoded = FeaturePreprocessor().fit_transform(clean)
+
+    print(f"Rows: {len(raw):,}")
+    print(f"{'artifact':<10} {'format':<8} {'size MiB':>9} {'write s':>8} {'load s':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, frame in [("ingested", raw), ("encoded", encoded)]:
+            for suffix in [".csv", ".parquet", ".feather"]:
+                path = os.path.join(tmp, f"{name}{suffix}")
+                write_s = time_it(lambda: save_dataframe(frame, path, compression=compression), 1)
+                load_s = time_it(lambda: load_dataframe(path), repeats)
+                size = os.path.getsize(path) / 2**20
+                print(f"{name:<10} {suffix[1:]:<8} {size:>9.1f} {write_s:>8.3f} {load_s:>8.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Size and load time of pipeline artifacts per format")
+    parser.add_argument("--data", default=DATASET_PATH)
+    parser.add_argument("--scale", type=int, default=50)
+    parser.add_argument("--compression", default="zstd")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    benchmark_artifacts(args.data, args.scale, args.compression, args.repeats)
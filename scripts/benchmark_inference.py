@@ -0,0 +1,207 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+from lightgbm import LGBMClassifier
+from sklearn.pipeline import Pipeline
+from src.utils.transformers import FeaturePreprocessor
+from src.utils.common import read_yaml, get_cpu_quota
+from src.constants import PARAMS_FILE_PATH
+
+DATASET_PATH = "customer_churn_dataset/customer_churn_dataset.csv"
+BASELINE_PATH = "scripts/baselines/inference.json"
+SIZES = [1, 100, 10_000]
+# Gated by default; tail percentiles of a short run swing with other load on the
+# machine, opt into them with --gate-metrics on dedicated runners
+GATE_METRICS = ["p50_ms"]
+
+
+def train_local_pipeline(df, n_estimators=200):
+    """Fits Preprocessor + LightGBM on the bundled dataset, the served model's shape, without MLflow."""
+    preprocessor = FeaturePreprocessor().fit(df)
+    encoded = preprocessor.transform(df)
+    model = LGBMClassifier(n_estimators=n_estimators, class_weight="balanced", random_state=42, verbosity=-1)
+    model.fit(encoded.drop(columns=["churn"]), encoded["churn"])
+    return Pipeline([("preprocessor", preprocessor), ("model", model)])
+
+
+def make_inputs(features, n_rows, seed=42):
+    """`n_rows` raw customers drawn from the dataset, as a DataFrame and as API records (NaN -> None)."""
+    sample = features.sample(n_rows, replace=n_rows > len(features), random_state=seed).reset_index(drop=True)
+    records = sample.astype(object).where(sample.notna(), None).to_dict(orient="records")
+    return sample, records
+
+
+def measure(fn, budget_seconds, min_iterations, max_iterations, warmup=2):
+    """Calls `fn` repeatedly, at least `min_iterations` times and until the time budget is spent.
+
+    Returns:
+        list: wall time of each call in seconds (warmup calls excluded)
+    """
+    for _ in range(warmup):
+        fn()
+    timings = []
+    deadline = time.perf_counter() + budget_seconds
+    while len(timings) < min_iterations or (time.perf_counter() < deadline and len(timings) < max_iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def summarize(target, rows, timings):
+    timings_ms = np.asarray(timings) * 1e3
+    return {
+        "target": target,
+        "rows": rows,
+        "iterations": len(timings),
+        "p50_ms": float(np.percentile(timings_ms, 50)),
+        "p95_ms": float(np.percentile(timings_ms, 95)),
+        "p99_ms": float(np.percentile(timings_ms, 99)),
+        "rows_per_sec": float(rows * len(timings) / sum(timings)),
+    }
+
+
+def compare_to_baseline(results, baseline, max_regression, metrics=GATE_METRICS, min_delta_ms=0.1):
+    """Finds results slower than the baseline by more than `max_regression` (0.2 = 20%).
+
+    A slowdown must also exceed `min_delta_ms`, so scheduler jitter on sub-millisecond
+    cases does not fail the gate. Cases missing from either side are ignored, so adding
+    a case does not fail it either.
+
+    Returns:
+        list: one dict per regressed (target, rows, metric)
+    """
+    baseline_cases = {(case["target"], case["rows"]): case for case in baseline["results"]}
+    regressions = []
+    for case in results["results"]:
+        reference = baseline_cases.get((case["target"], case["rows"]))
+        if reference is None:
+            continue
+        for metric in metrics:
+            ratio = case[metric] / reference[metric]
+            if ratio > 1 + max_regression and case[metric] - reference[metric] > min_delta_ms:
+                regressions.append({"target": case["target"], "rows": case["rows"], "metric": metric,
+                                    "baseline": reference[metric], "current": case[metric], "ratio": ratio})
+    return regressions
+
+
+def benchmark_inference(dataset_path=DATASET_PATH, sizes=SIZES, budget_seconds=1.0, min_iterations=5,
+                        max_iterations=2000, targets=("transform", "pipeline", "endpoint")):
+    df = pd.read_csv(dataset_path).drop(columns=["customer_id"])
+    model = train_local_pipeline(df)
+    features = df.drop(columns=["churn"])
+    inputs = {n: make_inputs(features, n) for n in sizes}
+    results = []
+
+    def run(target, rows, fn):
+        result = summarize(target, rows, measure(fn, budget_seconds, min_iterations, max_iterations))
+        print(f"{target:<10} {rows:>6} rows  p50 {result['p50_ms']:9.3f} ms  p95 {result['p95_ms']:9.3f} ms  "
+              f"p99 {result['p99_ms']:9.3f} ms  {result['rows_per_sec']:>12,.0f} rows/sec")
+        results.append(result)
+
+    # Keep the serving code's side effects (local model cache, tracking DB) out of the repo
+    tmp = tempfile.TemporaryDirectory()
+    os.environ.setdefault("MODEL_CACHE_DIR", os.path.join(tmp.name, "model_cache"))
+    os.environ.setdefault("MLFLOW_TRACKING_URI", f"sqlite:///{os.path.join(tmp.name, 'mlflow.db')}")
+    from src.pipeline.prediction_pipeline import PredictionPipeline
+
+    if "transform" in targets:
+        preprocessor = model.named_steps["preprocessor"]
+        for n, (frame, _) in inputs.items():
+            run("transform", n, lambda: preprocessor.transform(frame))
+
+    if "pipeline" in targets:
+        pipeline = PredictionPipeline()
+        pipeline.model, pipeline.model_version = model, "local"
+        for n, (_, records) in inputs.items():
+            if n == 1:
+                run("pipeline", n, lambda: pipeline.predict(records[0]))
+            else:
+                run("pipeline", n, lambda: pipeline.predict_batch(records))
+
+    if "endpoint" in targets:
+        from fastapi.testclient import TestClient
+        import app.main as app_module
+        # Score every request: no registry polling, no answers from the prediction cache
+        app_module.serving_config.hot_reload.enabled = False
+        app_module.serving_config.prediction_cache.enabled = False
+        with TestClient(app_module.app) as client:
+            app_module.pipeline.model, app_module.pipeline.model_version = model, "local"
+
+            def post(path, payload):
+                response = client.post(path, json=payload)
+                if response.status_code != 200:
+                    raise RuntimeError(f"{path} returned {response.status_code}: {response.text}")
+            for n, (_, records) in inputs.items():
+                if n == 1:
+                    run("endpoint", n, lambda: post("/predict", records[0]))
+                else:
+                    run("endpoint", n, lambda: post("/predict/batch", records))
+
+    tmp.cleanup()
+    serving = read_yaml(PARAMS_FILE_PATH).serving
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpu_quota": get_cpu_quota(),
+            "n_trees": model.named_steps["model"].n_estimators,
+            "fast_path": serving.fast_path,
+            "inference_backend": serving.inference_backend,
+            "dynamic_batching_max_wait_ms": serving.dynamic_batching.max_wait_ms if serving.dynamic_batching.enabled else None,
+        },
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark inference latency (preprocessor, PredictionPipeline, /predict) and gate regressions")
+    parser.add_argument("--data", default=DATASET_PATH)
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--targets", nargs="+", default=["transform", "pipeline", "endpoint"],
+                        choices=["transform", "pipeline", "endpoint"])
+    parser.add_argument("--budget", type=float, default=1.0, help="seconds spent timing each case")
+    parser.add_argument("--min-iterations", type=int, default=5)
+    parser.add_argument("--max-iterations", type=int, default=2000)
+    parser.add_argument("--output", help="write the JSON results to this file")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--check", action="store_true", help="exit with status 1 on a regression against --baseline")
+    parser.add_argument("--max-regression", type=float, default=0.25,
+                        help="allowed slowdown against the baseline, as a fraction (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.1,
+                        help="smallest slowdown in ms counted as a regression, whatever the ratio")
+    parser.add_argument("--gate-metrics", nargs="+", default=GATE_METRICS,
+                        choices=["p50_ms", "p95_ms", "p99_ms"])
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the new baseline")
+    args = parser.parse_args()
+
+    results = benchmark_inference(args.data, args.sizes, args.budget, args.min_iterations, args.max_iterations,
+                                  args.targets)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4)
+        print(f"Results written to {args.output}")
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=4)
+        print(f"Baseline updated: {args.baseline}")
+    elif args.check:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.max_regression, args.gate_metrics, args.min_delta_ms)
+        for r in regressions:
+            print(f"REGRESSION {r['target']} {r['rows']} rows {r['metric']}: "
+                  f"{r['baseline']:.3f} -> {r['current']:.3f} ms ({r['ratio']:.2f}x)")
+        if regressions:
+            sys.exit(1)
+        print(f"No regression beyond {args.max_regression:.0%} against {args.baseline}")
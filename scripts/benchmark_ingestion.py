@@ -0,0 +1,109 @@
+import argparse
+import os
+import tempfile
+import tracemalloc
+import pandas as pd
+from src.components.data_ingestion import DataIngestion
+from src.connection.mongodb_client import MongoDBClient
+from src.constants import DATABASE_NAME, COLLECTION_NAME
+from src.entity.config_entity import DataIngestionConfig
+
+DATASET_PATH = "customer_churn_dataset/customer_churn_dataset.csv"
+
+
+class StreamingCollection:
+    """Stand-in for a server side cursor: documents are produced lazily, like pymongo
+    fetching batches (mongomock materializes the whole result set up front)."""
+
+    def __init__(self, records, n_documents):
+        self.records = records
+        self.n_documents = n_documents
+
+    def find(self, filter=None, projection=None, batch_size=0):
+        return StreamingCursor(self._documents(projection))
+
+    def _documents(self, projection):
+        keep = None
+        if projection:
+            keep = [k for k, v in projection.items() if v]
+        for i in range(self.n_documents):
+            document = dict(self.records[i % len(self.records)], _id=i)
+            if keep is not None:
+                document = {k: document[k] for k in keep}
+            yield document
+
+
+class StreamingCursor:
+    """Documents are generated in _id order already, so sort is a no-op."""
+
+    def __init__(self, documents):
+        self.documents = documents
+
+    def sort(self, key, direction=1):
+        return self
+
+    def __iter__(self):
+        return iter(self.documents)
+
+
+class StreamingClient(dict):
+    def __init__(self, collection):
+        super().__init__({DATABASE_NAME: {COLLECTION_NAME: collection}})
+
+
+def legacy_export(collection, path):
+    """list(collection.find()) -> DataFrame -> CSV (the implementation before streaming)."""
+    df = pd.DataFrame(list(collection.find()))
+    df = df.drop(columns=["_id"])
+    df.replace({"na": pd.NA}, inplace=True)
+    df.to_csv(path, index=False)
+
+
+def peak_mib(fn):
+    """Peak Python heap allocated while `fn` runs, in MiB."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark_ingestion(dataset_path=DATASET_PATH, scales=(1, 5, 10), batch_size=5000):
+    df = pd.read_csv(dataset_path)
+    records = df.astype(object).where(df.notna(), "na").to_dict(orient="records")
+
+    print(f"{'rows':>8}  {'legacy MiB':>10}  {'streaming MiB':>13}")
+    for scale in scales:
+        collection = StreamingCollection(records, len(records) * scale)
+        MongoDBClient.client = StreamingClient(collection)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            config = DataIngestionConfig(
+                root_dir=tmp,
+                data_file_path=os.path.join(tmp, "churn_data.parquet"),
+                raw_data_path=os.path.join(tmp, "raw_data.parquet"),
+                watermark_path=os.path.join(tmp, "watermark.json"),
+                manifest_path=os.path.join(tmp, "manifest.json"),
+                batch_size=batch_size,
+                columns=list(df.columns),
+                dtypes={col: str(dtype) for col, dtype in df.dtypes.items()},
+                compression="zstd",
+                incremental=False,
+                full_refresh=True,
+                watermark_field="_id",
+                key_column="customer_id"
+            )
+            ingestion = DataIngestion(config)
+            legacy = peak_mib(lambda: legacy_export(collection, os.path.join(tmp, "legacy.csv")))
+            streaming = peak_mib(lambda: ingestion.export_collection(config.data_file_path))
+        print(f"{len(records) * scale:>8}  {legacy:>10.1f}  {streaming:>13.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Peak memory of list(find()) vs streaming MongoDB ingestion")
+    parser.add_argument("--data", default=DATASET_PATH)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 5, 10])
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+    benchmark_ingestion(args.data, tuple(args.scales), args.batch_size)
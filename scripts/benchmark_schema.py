@@ -0,0 +1,43 @@
+import argparse
+import pandas as pd
+from src.config.configuration import ConfigurationManager
+from src.entity.schema import apply_schema, fill_label_column, is_label_column, memory_mb
+from src.utils.transformers import FeaturePreprocessor
+
+DATASET_PATH = "customer_churn_dataset/customer_churn_dataset.csv"
+
+
+def stage_frames(raw, legacy_codes=False):
+    """The frames each stage holds: the ingested dataset, then the encoded train / test data."""
+    clean = raw.drop(columns=["customer_id"])
+    for col in clean.columns:
+        if is_label_column(clean[col]):
+            clean[col] = fill_label_column(clean[col])
+    preprocessor = FeaturePreprocessor()
+    encoded = preprocessor.fit_transform(clean)
+    if legacy_codes:
+        # Codes used to be int64
+        encoded = encoded.astype({col: "int64" for col in preprocessor.encoders})
+    return {"data_ingestion": raw, "data_transformation": encoded}
+
+
+def benchmark_schema(dataset_path=DATASET_PATH, scale=10):
+    df = pd.read_csv(dataset_path)
+    # pandas' inferred dtypes (int64 / float64 / object) vs the declared compact schema
+    inferred = pd.concat([df] * scale, ignore_index=True)
+    compact = apply_schema(inferred, dict(ConfigurationManager().params.data_ingestion.schema))
+
+    print(f"Rows: {len(inferred):,}")
+    print(f"{'stage':<20} {'inferred MiB':>13} {'compact MiB':>12} {'reduction':>10}")
+    before, after = stage_frames(inferred, legacy_codes=True), stage_frames(compact)
+    for stage in before:
+        inferred_mb, compact_mb = memory_mb(before[stage]), memory_mb(after[stage])
+        print(f"{stage:<20} {inferred_mb:>13.2f} {compact_mb:>12.2f} {inferred_mb / compact_mb:>9.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="In-memory size of the stage frames with inferred vs declared dtypes")
+    parser.add_argument("--data", default=DATASET_PATH)
+    parser.add_argument("--scale", type=int, default=10)
+    args = parser.parse_args()
+    benchmark_schema(args.data, args.scale)
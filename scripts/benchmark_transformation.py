@@ -0,0 +1,58 @@
+import argparse
+import dataclasses
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from src.components.data_transformation import DataTransformation
+from src.config.configuration import ConfigurationManager
+from src.utils.artifacts import ChunkedWriter
+
+DATASET_PATH = "customer_churn_dataset/customer_churn_dataset.csv"
+
+
+def run_mode(config):
+    # Runs in a fresh process, so ru_maxrss is the peak of this transformation alone
+    start = time.perf_counter()
+    DataTransformation(config).transform_data()
+    return time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def benchmark_transformation(dataset_path=DATASET_PATH, scale=50, chunk_size=50000):
+    df = pd.read_csv(dataset_path)
+    # Some numeric NAs, so the chunked medians are exercised too
+    df.loc[df.sample(frac=0.02, random_state=0).index, "total_charges"] = np.nan
+    base = ConfigurationManager().get_data_transformation_config()
+    context = multiprocessing.get_context("spawn")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = os.path.join(tmp, "churn_data.parquet")
+        # Written chunk by chunk, so the benchmark itself never holds the scaled dataset
+        with ChunkedWriter(data_path, compression="zstd") as writer:
+            for i in range(scale):
+                writer.write(df.assign(customer_id=df["customer_id"] + i * len(df)))
+        print(f"Rows: {len(df) * scale:,}, file {os.path.getsize(data_path) / 2**20:.1f} MiB, chunk size {chunk_size:,}")
+        print(f"{'mode':<8} {'seconds':>8} {'peak MiB':>9}")
+        for mode in ["memory", "chunked"]:
+            config = dataclasses.replace(
+                base, data_path=data_path, mode=mode, chunk_size=chunk_size,
+                transformed_train_path=os.path.join(tmp, f"{mode}_train.parquet"),
+                transformed_test_path=os.path.join(tmp, f"{mode}_test.parquet"),
+                preprocessor_path=os.path.join(tmp, f"{mode}_preprocessor.pkl"),
+                feature_schema_path=os.path.join(tmp, f"{mode}_feature_schema.json"),
+            )
+            with context.Pool(1) as pool:
+                seconds, peak_mb = pool.apply(run_mode, (config,))
+            print(f"{mode:<8} {seconds:>8.2f} {peak_mb:>9.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time and peak memory of the in-memory vs chunked transformation")
+    parser.add_argument("--data", default=DATASET_PATH)
+    parser.add_argument("--scale", type=int, default=50)
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    args = parser.parse_args()
+    benchmark_transformation(args.data, args.scale, args.chunk_size)
@@ -0,0 +1,63 @@
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from lightgbm import LGBMClassifier
+from src.utils.transformers import FeaturePreprocessor
+from src.utils.tree_engine import CompiledTreeEnsemble
+
+DATASET_PATH = "customer_churn_dataset/customer_churn_dataset.csv"
+
+
+def latency_percentiles(fn, inputs):
+    timings = []
+    for x in inputs:
+        start = time.perf_counter()
+        fn(x)
+        timings.append(time.perf_counter() - start)
+    return np.percentile(timings, 50) * 1e3, np.percentile(timings, 99) * 1e3
+
+
+def benchmark_tree_engine(dataset_path=DATASET_PATH, n_estimators=200, iterations=200):
+    df = pd.read_csv(dataset_path).drop(columns=["customer_id"])
+    df = df.fillna({col: "Unknown" for col in df.columns if df[col].dtype == 'object'})
+    encoded = FeaturePreprocessor().fit_transform(df)
+    X = encoded.drop(columns=["churn"])
+    y = encoded["churn"]
+
+    model = LGBMClassifier(n_estimators=n_estimators, class_weight="balanced", random_state=42, verbosity=-1)
+    model.fit(X, y)
+    engine = CompiledTreeEnsemble.from_booster(model.booster_)
+
+    X_np = X.to_numpy(np.float64)
+    max_diff = np.abs(model.predict_proba(X)[:, 1] - engine.predict_proba(X_np)[:, 1]).max()
+    print(f"Trees: {engine.n_trees}, nodes: {len(engine.feature)}, max |proba diff| vs LightGBM: {max_diff:.2e}")
+
+    rng = np.random.default_rng(42)
+    single_idx = rng.integers(0, len(X), size=iterations)
+    batch_starts = rng.integers(0, len(X) - 1000, size=max(iterations // 10, 10))
+
+    cases = {
+        "single row": (
+            [X.iloc[[i]] for i in single_idx],
+            [X_np[i:i + 1] for i in single_idx],
+        ),
+        "1k-row batch": (
+            [X.iloc[s:s + 1000] for s in batch_starts],
+            [X_np[s:s + 1000] for s in batch_starts],
+        ),
+    }
+    for name, (frames, arrays) in cases.items():
+        ref_p50, ref_p99 = latency_percentiles(model.predict_proba, frames)
+        nat_p50, nat_p99 = latency_percentiles(engine.predict_proba, arrays)
+        print(f"{name:<13} LGBMClassifier.predict_proba  p50 {ref_p50:8.3f} ms  p99 {ref_p99:8.3f} ms")
+        print(f"{name:<13} CompiledTreeEnsemble          p50 {nat_p50:8.3f} ms  p99 {nat_p99:8.3f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the native tree engine against LightGBM")
+    parser.add_argument("--data", default=DATASET_PATH)
+    parser.add_argument("--n-estimators", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    benchmark_tree_engine(args.data, args.n_estimators, args.iterations)
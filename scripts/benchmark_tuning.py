@@ -0,0 +1,50 @@
+import argparse
+import dataclasses
+import os
+import tempfile
+import time
+import pandas as pd
+from src.components.model_tuner import ModelTuner
+from src.config.configuration import ConfigurationManager
+from src.utils.artifacts import save_dataframe
+from src.utils.common import get_cpu_quota
+from src.utils.transformers import FeaturePreprocessor
+
+DATASET_PATH = "customer_churn_dataset/customer_churn_dataset.csv"
+
+
+def benchmark_tuning(dataset_path=DATASET_PATH, scale=1, n_trials=None, jobs=None):
+    df = pd.read_csv(dataset_path)
+    df = pd.concat([df] * scale, ignore_index=True).drop(columns=["customer_id"])
+    # Same layout as train.parquet: encoded features, target last
+    encoded = FeaturePreprocessor().fit_transform(df.fillna({"internet_service": "Unknown"}))
+    jobs = jobs or sorted({1, 2, 4, get_cpu_quota()})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        train_path = os.path.join(tmp, "train.parquet")
+        save_dataframe(encoded, train_path)
+        config = ConfigurationManager().get_model_tuner_config()
+        config = dataclasses.replace(config, train_data_path=train_path, n_trials=n_trials or config.n_trials)
+        tuner = ModelTuner(config)
+
+        print(f"Rows: {len(encoded):,}, trials: {config.n_trials}, rungs: {tuner.rungs()}, CPU quota: {get_cpu_quota()}")
+        print(f"{'processes':>9} {'threads':>8} {'wall s':>8} {'speedup':>8} {'best score':>11}")
+        baseline = None
+        for n_jobs in jobs:
+            start = time.perf_counter()
+            trials = tuner.search(n_jobs=n_jobs)
+            seconds = time.perf_counter() - start
+            baseline = baseline or seconds
+            best = tuner.best_trial(trials)["results"][len(tuner.rungs()) - 1]["score"]
+            threads = max(1, get_cpu_quota() // n_jobs)
+            print(f"{n_jobs:>9} {threads:>8} {seconds:>8.2f} {baseline / seconds:>7.2f}x {best:>11.5f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hyperparameter search wall clock per number of processes")
+    parser.add_argument("--data", default=DATASET_PATH)
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--trials", type=int, default=None, help="defaults to tuning.n_trials")
+    parser.add_argument("--jobs", type=int, nargs="+", default=None, help="process counts, defaults to 1 2 4 and the CPU quota")
+    args = parser.parse_args()
+    benchmark_tuning(args.data, args.scale, args.trials, args.jobs)
@@ -0,0 +1,328 @@
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+from collections import Counter
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+import httpx
+from prometheus_client.parser import text_string_to_metric_families
+
+DATASET_PATH = "customer_churn_dataset/customer_churn_dataset.csv"
+# Server-side metrics kept from each /metrics scrape (see app/monitoring.py)
+SCRAPED_METRICS = {
+    "process_cpu_seconds_total", "process_resident_memory_bytes",
+    "prediction_latency_seconds_sum", "prediction_latency_seconds_count",
+    "prediction_batch_size_sum", "prediction_batch_size_count",
+    "inference_queue_depth", "prediction_batcher_queue_depth", "inference_rejections_total",
+}
+
+
+def load_payloads(path=None, dataset_path=DATASET_PATH, n_payloads=1000, seed=42):
+    """CustomerData payloads: read from an NDJSON file, or synthesized from the dataset.
+
+    Synthesized payloads are dataset rows (missing fields as null), sampled with replacement.
+    """
+    if path is not None:
+        with open(path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+    df = pd.read_csv(dataset_path).drop(columns=["customer_id", "churn"])
+    sample = df.sample(n_payloads, replace=n_payloads > len(df), random_state=seed)
+    return sample.astype(object).where(sample.notna(), None).to_dict(orient="records")
+
+
+def parse_metrics(text):
+    """Flattens a Prometheus text exposition into {name{labels}: value}, for SCRAPED_METRICS only."""
+    values = {}
+    for family in text_string_to_metric_families(text):
+        for sample in family.samples:
+            if sample.name in SCRAPED_METRICS:
+                labels = ",".join(f"{k}={v}" for k, v in sorted(sample.labels.items()))
+                values[f"{sample.name}{{{labels}}}" if labels else sample.name] = sample.value
+    return values
+
+
+class MetricsScraper:
+    """Scrapes the server's /metrics every `interval` seconds in the background."""
+
+    def __init__(self, client, url, interval=1.0):
+        self.client = client
+        self.url = url
+        self.interval = interval
+        self.samples = []  # (monotonic time, {metric: value})
+        self.errors = 0
+        self._task = None
+
+    async def scrape(self):
+        try:
+            response = await self.client.get(self.url)
+            response.raise_for_status()
+            self.samples.append((time.perf_counter(), parse_metrics(response.text)))
+        except (httpx.HTTPError, ValueError):
+            self.errors += 1
+
+    async def _loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.scrape()
+
+    async def start(self):
+        # First scrape before any load, so the first step has counters to diff against
+        await self.scrape()
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        # Closes the window of the last step
+        await self.scrape()
+
+    def between(self, start, end):
+        """Server-side view of [start, end]: deltas of counters, peaks of gauges, averaged latencies."""
+        window = [values for t, values in self.samples if start <= t <= end]
+        before = [values for t, values in self.samples if t < start]
+        after = [values for t, values in self.samples if t > end]
+        # Counters are diffed between the last scrape before the window and the first one after it
+        first = before[-1] if before else (window[0] if window else None)
+        last = after[0] if after else (window[-1] if window else None)
+        if first is None or last is None:
+            return {}
+
+        def delta(name):
+            return last.get(name, 0.0) - first.get(name, 0.0)
+
+        def peak(name):
+            return max((values.get(name, 0.0) for values in window + [last]), default=None)
+
+        server = {}
+        if "process_cpu_seconds_total" in last:
+            server["cpu_cores"] = delta("process_cpu_seconds_total") / (end - start)
+            server["peak_rss_mb"] = peak("process_resident_memory_bytes") / 2**20
+        if delta("prediction_latency_seconds_count") > 0:
+            server["mean_inference_ms"] = (delta("prediction_latency_seconds_sum")
+                                           / delta("prediction_latency_seconds_count") * 1e3)
+        if delta("prediction_batch_size_count") > 0:
+            server["mean_batch_size"] = delta("prediction_batch_size_sum") / delta("prediction_batch_size_count")
+        server["peak_inference_queue_depth"] = peak("inference_queue_depth")
+        server["peak_batcher_queue_depth"] = peak("prediction_batcher_queue_depth")
+        server["rejections"] = delta("inference_rejections_total")
+        return server
+
+
+async def send(client, endpoint, payload, scheduled, outcomes):
+    """Posts one request; latency counts from the time it was scheduled, so client lag is not hidden."""
+    try:
+        response = await client.post(endpoint, json=payload)
+        status = response.status_code
+    except httpx.TimeoutException:
+        status = "timeout"
+    except httpx.HTTPError as e:
+        status = type(e).__name__
+    outcomes.append((status, time.perf_counter() - scheduled))
+
+
+async def open_loop(client, endpoint, payloads, rps, duration):
+    """Sends `rps` requests per second for `duration` seconds, whether or not earlier ones have returned."""
+    outcomes, tasks = [], []
+    start = time.perf_counter()
+    for i in range(int(rps * duration)):
+        scheduled = start + i / rps
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(send(client, endpoint, payloads[i % len(payloads)], scheduled, outcomes)))
+    await asyncio.gather(*tasks)
+    return outcomes
+
+
+async def closed_loop(client, endpoint, payloads, concurrency, duration):
+    """`concurrency` users each send their next request as soon as the previous one returns."""
+    outcomes = []
+    deadline = time.perf_counter() + duration
+
+    async def user(offset):
+        i = offset
+        while time.perf_counter() < deadline:
+            await send(client, endpoint, payloads[i % len(payloads)], time.perf_counter(), outcomes)
+            i += concurrency
+
+    await asyncio.gather(*(user(offset) for offset in range(concurrency)))
+    return outcomes
+
+
+def summarize_step(mode, target, outcomes, seconds, rows_per_request=1):
+    """Client-side result of one load step."""
+    statuses = Counter(str(status) for status, _ in outcomes)
+    ok = [latency for status, latency in outcomes if status == 200]
+    latencies_ms = np.asarray(ok) * 1e3
+    step = {
+        "mode": mode,
+        "target": target,
+        "requests": len(outcomes),
+        "seconds": seconds,
+        "achieved_rps": len(ok) / seconds,
+        "rows_per_sec": len(ok) * rows_per_request / seconds,
+        "error_rate": 1 - len(ok) / len(outcomes) if outcomes else 0.0,
+        "statuses": dict(statuses),
+    }
+    if len(ok):
+        step.update({f"p{q}_ms": float(np.percentile(latencies_ms, q)) for q in (50, 95, 99)})
+        step["max_ms"] = float(latencies_ms.max())
+    return step
+
+
+def saturation_point(steps, slo_ms, max_error_rate, min_throughput_ratio=0.9):
+    """First step where the server stops keeping up, and why.
+
+    A step saturates when its error rate exceeds `max_error_rate`, its p95 latency
+    exceeds `slo_ms`, or (open loop only) it completes less than `min_throughput_ratio`
+    of the offered requests per second.
+
+    Returns:
+        (dict, dict, str): last sustainable step, first saturated step and the reason (None if none saturated)
+    """
+    sustainable = None
+    for step in steps:
+        reasons = []
+        if step["error_rate"] > max_error_rate:
+            reasons.append(f"error rate {step['error_rate']:.1%} > {max_error_rate:.1%}")
+        if step.get("p95_ms", float("inf")) > slo_ms:
+            reasons.append(f"p95 {step.get('p95_ms', float('inf')):.1f} ms > {slo_ms:.0f} ms")
+        if step["mode"] == "rps" and step["achieved_rps"] < min_throughput_ratio * step["target"]:
+            reasons.append(f"{step['achieved_rps']:.1f} of {step['target']} rps completed")
+        if reasons:
+            return sustainable, step, "; ".join(reasons)
+        sustainable = step
+    return sustainable, None, None
+
+
+async def run_load_test(url, payloads, rps_steps=None, concurrency_steps=None, duration=10.0,
+                        endpoint="/predict", batch_size=1, timeout=10.0, scrape_interval=1.0, client=None):
+    """Runs one load step per target RPS (open loop) or concurrency (closed loop), scraping /metrics throughout.
+
+    Returns:
+        dict: client-side results and server-side metrics per step, plus the raw scrapes
+    """
+    if batch_size > 1:
+        # /predict/batch takes a JSON list of payloads
+        payloads = [payloads[i:i + batch_size] for i in range(0, len(payloads), batch_size)]
+    mode, targets = ("rps", rps_steps) if rps_steps else ("concurrency", concurrency_steps)
+
+    owns_client = client is None
+    if owns_client:
+        max_connections = max(targets) if mode == "concurrency" else None
+        client = httpx.AsyncClient(base_url=url, timeout=timeout, limits=httpx.Limits(max_connections=max_connections))
+    scraper = MetricsScraper(client, "/metrics", scrape_interval)
+    steps = []
+    try:
+        await scraper.start()
+        for target in targets:
+            start = time.perf_counter()
+            if mode == "rps":
+                outcomes = await open_loop(client, endpoint, payloads, target, duration)
+            else:
+                outcomes = await closed_loop(client, endpoint, payloads, target, duration)
+            end = time.perf_counter()
+            step = summarize_step(mode, target, outcomes, end - start, batch_size)
+            # Let a scrape land after the step, then idle briefly so steps don't bleed into each other
+            await asyncio.sleep(scrape_interval)
+            step["server"] = scraper.between(start, end)
+            steps.append(step)
+            print(format_step(step))
+        await scraper.stop()
+    finally:
+        if owns_client:
+            await client.aclose()
+
+    origin = scraper.samples[0][0] if scraper.samples else 0.0
+    return {"steps": steps, "scrapes": [{"t": t - origin, **values} for t, values in scraper.samples],
+            "scrape_errors": scraper.errors}
+
+
+def format_step(step):
+    latency = (f"p50 {step['p50_ms']:8.1f} ms  p95 {step['p95_ms']:8.1f} ms  p99 {step['p99_ms']:8.1f} ms"
+               if "p50_ms" in step else "no successful requests")
+    server = step.get("server", {})
+    resources = (f"  cpu {server['cpu_cores']:.2f} cores  rss {server['peak_rss_mb']:.0f} MiB"
+                 if "cpu_cores" in server else "")
+    return (f"{step['mode']} {step['target']:>6}: {step['achieved_rps']:8.1f} req/s  {latency}  "
+            f"errors {step['error_rate']:.1%}{resources}")
+
+
+def sizing_hint(sustainable):
+    """deployment.yaml resources for one pod at the last sustainable step, with 25% memory headroom."""
+    server = sustainable.get("server", {}) if sustainable else {}
+    if "cpu_cores" not in server:
+        return None
+    return {
+        "requests": {"cpu": f"{max(0.1, server['cpu_cores']):.2f}", "memory": f"{server['peak_rss_mb']:.0f}Mi"},
+        "limits": {"memory": f"{server['peak_rss_mb'] * 1.25:.0f}Mi"},
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Replay CustomerData payloads against a running API and find its saturation point")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--payloads", help="NDJSON file of CustomerData payloads (default: synthesized from the dataset)")
+    parser.add_argument("--n-payloads", type=int, default=1000, help="payloads to synthesize")
+    parser.add_argument("--save-payloads", help="write the payloads used as NDJSON, to replay the same traffic later")
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument("--rps", type=float, nargs="+", help="open loop: target requests per second, one step each")
+    load.add_argument("--concurrency", type=int, nargs="+", help="closed loop: concurrent users, one step each")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per step")
+    parser.add_argument("--endpoint", default="/predict", choices=["/predict", "/predict/batch"])
+    parser.add_argument("--batch-size", type=int, default=1, help="payloads per /predict/batch request")
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--scrape-interval", type=float, default=1.0)
+    parser.add_argument("--slo-ms", type=float, default=100.0, help="p95 latency above which a step is saturated")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    if args.endpoint == "/predict/batch" and args.batch_size < 2:
+        parser.error("--endpoint /predict/batch needs --batch-size of 2 or more")
+    payloads = load_payloads(args.payloads, n_payloads=args.n_payloads, seed=args.seed)
+    random.Random(args.seed).shuffle(payloads)
+    if args.save_payloads:
+        with open(args.save_payloads, "w") as f:
+            f.writelines(json.dumps(payload) + "\n" for payload in payloads)
+
+    rps_steps = args.rps if args.rps or args.concurrency else [10, 20, 50, 100, 200]
+    report = asyncio.run(run_load_test(args.url, payloads, rps_steps, args.concurrency, args.duration,
+                                       args.endpoint, args.batch_size, args.timeout, args.scrape_interval))
+
+    sustainable, saturated, reason = saturation_point(report["steps"], args.slo_ms, args.max_error_rate)
+    if saturated is None:
+        print("Not saturated at the highest step; add higher steps to find the limit.")
+    else:
+        print(f"Saturated at {saturated['mode']} {saturated['target']}: {reason}")
+    if sustainable is not None:
+        print(f"Sustainable: {sustainable['mode']} {sustainable['target']} "
+              f"({sustainable['achieved_rps']:.1f} req/s, p95 {sustainable['p95_ms']:.1f} ms)")
+    hint = sizing_hint(sustainable)
+    if hint is not None:
+        print(f"deployment.yaml resources for that load: {json.dumps(hint)}")
+
+    report.update({
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "url": args.url, "endpoint": args.endpoint, "batch_size": args.batch_size,
+            "duration": args.duration, "payloads": len(payloads), "slo_ms": args.slo_ms,
+            "max_error_rate": args.max_error_rate,
+        },
+        "sustainable_target": sustainable["target"] if sustainable else None,
+        "saturated_target": saturated["target"] if saturated else None,
+        "saturation_reason": reason,
+        "sizing_hint": hint,
+    })
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=4)
+        print(f"Report written to {args.output}")
+    if report["scrape_errors"]:
+        print(f"⚠️ {report['scrape_errors']} /metrics scrapes failed", file=sys.stderr)
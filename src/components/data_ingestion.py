@@ -1,47 +1,202 @@
 import os
 import sys
+from datetime import datetime
+from pathlib import Path
+from bson import ObjectId
 from src.exception import ChurnException
 from src.logger import logger
 from src.entity.config_entity import DataIngestionConfig
 from src.connection.mongodb_client import MongoDBClient
 from src.constants import DATABASE_NAME, COLLECTION_NAME
+from src.utils.common import save_json, load_json, get_file_hash
+from src.utils.artifacts import ChunkedWriter, iter_dataframe_chunks, link_artifact, artifact_format
 import pandas as pd
-from pymongo import MongoClient
 
 class DataIngestion:
     def __init__(self, config: DataIngestionConfig):
         try:
             self.config = config
             self.mongodb_client = MongoDBClient(database_name=DATABASE_NAME)
+            # Highest watermark_field value seen by the last iter_collection_chunks run
+            self.last_watermark = None
+            # Rows in the dataset written by the last export / merge
+            self.dataset_rows = None
         except Exception as e:
             raise ChurnException(e, sys)
 
-    def export_collection_as_dataframe(self):
+    def iter_collection_chunks(self, since=None):
+        """Streams the collection as DataFrame chunks of at most `batch_size` rows.
+
+        Only the configured columns are sent by the server (`_id` excluded), and at
+        most one batch of documents is held in memory at a time. Documents come in
+        `watermark_field` order; with `since`, only those past that watermark.
+        """
         try:
             database = self.mongodb_client.database
             collection = database[COLLECTION_NAME]
-            df = pd.DataFrame(list(collection.find()))
-            
-            if "_id" in df.columns:
-                df = df.drop(columns=["_id"], axis=1)
-            
-            df.replace({"na": pd.NA}, inplace=True)
-            return df
+            columns = self.config.columns
+            field = self.config.watermark_field
+            # `_id` is only sent when it is the watermark field, and is then dropped below
+            projection = {"_id": 0, **{col: 1 for col in columns}, field: 1}
+            self.last_watermark = None
+            query = {} if since is None else {field: {"$gt": since}}
+            cursor = collection.find(query, projection=projection, batch_size=self.config.batch_size).sort(field, 1)
+
+            batch = []
+            for document in cursor:
+                # Read the watermark, then drop it unless it is a configured column
+                self.last_watermark = document[field] if field in columns else document.pop(field)
+                batch.append(document)
+                if len(batch) >= self.config.batch_size:
+                    yield self._to_frame(batch)
+                    batch = []
+            if batch:
+                yield self._to_frame(batch)
 
         except Exception as e:
             raise ChurnException(e, sys)
 
-    def initiate_data_ingestion(self):
+    def _to_frame(self, documents):
+        # Fixed column order and dtypes, so every chunk shares the typed schema of the first one
+        df = pd.DataFrame.from_records(documents, columns=self.config.columns)
+        df = df.replace({"na": None})
+        return df.astype(self.config.dtypes)
+
+    def _empty_frame(self):
+        return pd.DataFrame(columns=self.config.columns).astype(self.config.dtypes)
+
+    def export_collection_as_dataframe(self):
         try:
-            df = self.export_collection_as_dataframe()
-            logger.info("Exported collection as dataframe")
-            
-            df.to_csv(self.config.raw_data_path, index=False)
-            logger.info(f"Saved raw data at: {self.config.raw_data_path}")
-            
-            # For now, raw and ingested path are same, but usually we might do train/test split here or simple copy
-            df.to_csv(self.config.data_file_path, index=False)
-            logger.info(f"Saved ingested data at: {self.config.data_file_path}")
+            chunks = list(self.iter_collection_chunks())
+            if not chunks:
+                return self._empty_frame()
+            # Chunks each have their own categories; concat falls back to object, so cast again
+            return pd.concat(chunks, ignore_index=True).astype(self.config.dtypes)
+
+        except Exception as e:
+            raise ChurnException(e, sys)
+
+    def export_collection(self, file_path):
+        """Writes the collection to `file_path` chunk by chunk, in the format of its suffix.
+
+        Returns:
+            int: number of rows written
+        """
+        try:
+            with ChunkedWriter(file_path, compression=self.config.compression, dtypes=self.config.dtypes) as writer:
+                for chunk in self.iter_collection_chunks():
+                    writer.write(chunk)
+                writer.close(empty_frame=self._empty_frame())
+            self.dataset_rows = writer.n_rows
+            return writer.n_rows
+
+        except Exception as e:
+            raise ChurnException(e, sys)
+
+    def read_watermark(self):
+        """Returns the stored watermark value, or None if there is none for `watermark_field`."""
+        if not os.path.exists(self.config.watermark_path):
+            return None
+        watermark = load_json(Path(self.config.watermark_path))
+        if watermark.field != self.config.watermark_field:
+            return None
+        if watermark.type == "objectid":
+            return ObjectId(watermark.value)
+        if watermark.type == "datetime":
+            return datetime.fromisoformat(watermark.value)
+        return watermark.value
+
+    def save_watermark(self, value):
+        if isinstance(value, ObjectId):
+            kind, value = "objectid", str(value)
+        elif isinstance(value, datetime):
+            kind, value = "datetime", value.isoformat()
+        else:
+            kind = "json"
+        save_json(Path(self.config.watermark_path), {"field": self.config.watermark_field, "type": kind, "value": value})
+
+    def merge_delta(self, since):
+        """Merges documents past `since` into the existing dataset, newest row per key wins.
+
+        Returns:
+            int: number of new or changed documents
+        """
+        try:
+            chunks = list(self.iter_collection_chunks(since=since))
+            if not chunks:
+                return 0
+            key = self.config.key_column
+            delta = pd.concat(chunks, ignore_index=True).drop_duplicates(subset=[key], keep="last")
+            delta = delta.astype(self.config.dtypes)
+
+            # Rewrite the existing dataset chunk by chunk without the rows the delta replaces
+            tmp_path = self._tmp_path()
+            with ChunkedWriter(tmp_path, compression=self.config.compression, dtypes=self.config.dtypes) as writer:
+                for existing in iter_dataframe_chunks(self.config.data_file_path, self.config.batch_size,
+                                                      dtypes=self.config.dtypes):
+                    writer.write(existing[~existing[key].isin(delta[key])].astype(self.config.dtypes))
+                writer.write(delta)
+            os.replace(tmp_path, self.config.data_file_path)
+            self.dataset_rows = writer.n_rows
+            return len(delta)
+
+        except Exception as e:
+            raise ChurnException(e, sys)
+
+    def _tmp_path(self):
+        # Same directory and suffix as the dataset, so the final os.replace is an atomic rename
+        data_path = Path(self.config.data_file_path)
+        return data_path.with_name(f"{data_path.stem}.tmp{data_path.suffix}")
+
+    def save_manifest(self):
+        """Records the content hash of the dataset, so later stages can tell whether it changed."""
+        manifest = {
+            "path": str(self.config.data_file_path),
+            "format": artifact_format(self.config.data_file_path),
+            "rows": self.dataset_rows,
+            "sha256": get_file_hash(Path(self.config.data_file_path)),
+        }
+        save_json(Path(self.config.manifest_path), manifest)
+        return manifest
+
+    def initiate_data_ingestion(self, full_refresh=None):
+        """Exports the collection, or merges in only what changed since the last run.
+
+        Args:
+            full_refresh (bool, optional): rebuild from the whole collection; defaults to the config flag
+        """
+        try:
+            if full_refresh is None:
+                full_refresh = self.config.full_refresh
+            since = None
+            if self.config.incremental and not full_refresh and os.path.exists(self.config.data_file_path):
+                since = self.read_watermark()
+
+            if since is None:
+                # Written next to the dataset and renamed over it: the file DVC tracked is never modified in place
+                tmp_path = self._tmp_path()
+                n_rows = self.export_collection(tmp_path)
+                os.replace(tmp_path, self.config.data_file_path)
+                logger.info(f"Saved ingested data at: {self.config.data_file_path} ({n_rows} rows, full export)")
+            else:
+                n_rows = self.merge_delta(since)
+                logger.info(f"Merged {n_rows} new or changed documents since watermark {since}")
+                if n_rows == 0:
+                    # Leave the artifact untouched so downstream stages see no change
+                    return
+
+            if self.last_watermark is not None:
+                self.save_watermark(self.last_watermark)
+            elif since is None and os.path.exists(self.config.watermark_path):
+                # Empty full export: a watermark from the previous dataset would skip documents next run
+                os.remove(self.config.watermark_path)
+
+            # For now, raw and ingested data are the same file; the raw path is a link, not a second write
+            link = link_artifact(self.config.data_file_path, self.config.raw_data_path)
+            logger.info(f"Raw data at: {self.config.raw_data_path} ({link} of {self.config.data_file_path})")
+
+            manifest = self.save_manifest()
+            logger.info(f"Dataset sha256 {manifest['sha256']} recorded at: {self.config.manifest_path}")
 
         except Exception as e:
             raise ChurnException(e, sys)
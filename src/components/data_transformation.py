@@ -2,56 +2,119 @@ import sys
 from src.exception import ChurnException
 from src.logger import logger
 from src.entity.config_entity import DataTransformationConfig
+from src.utils.common import save_json
+from src.utils.artifacts import load_dataframe, save_dataframe, iter_dataframe_chunks, ChunkedWriter
+from src.utils.transformers import FeaturePreprocessor
+from src.entity.schema import memory_mb
+from pathlib import Path
 import pandas as pd
-import numpy as np
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder
 import joblib
 
 class DataTransformation:
     def __init__(self, config: DataTransformationConfig):
         self.config = config
 
+    def save_preprocessor(self, preprocessor, feature_names):
+        # Save Preprocessor object (for Pipeline construction later)
+        joblib.dump(preprocessor, self.config.preprocessor_path)
+
+        # Record the model input layout (target is the last column) for the serving fast path
+        feature_schema = preprocessor.get_feature_schema(feature_names)
+        save_json(path=Path(self.config.feature_schema_path), data=feature_schema)
+        logger.info("Preprocessing complete and objects saved")
+
     def transform_data(self):
         try:
-            # Load Data
-            df = pd.read_csv(self.config.data_path)
-            logger.info("Loaded data for transformation")
-
-            # Drop ID
-            if 'customer_id' in df.columns:
-                df.drop("customer_id", axis=1, inplace=True)
-
-            # --- PREPROCESSING START (Consistent with Analysis) ---
-            # 1. Fill NA
-            for col in df.columns:
-                if df[col].dtype == 'object':
-                    df[col] = df[col].fillna("Unknown")
-                else:
-                    if df[col].isnull().sum() > 0:
-                        df[col] = df[col].fillna(df[col].median())
-
-            # 2. Preprocessing
-            from src.utils.transformers import FeaturePreprocessor
-            preprocessor = FeaturePreprocessor()
-            df_processed = preprocessor.fit_transform(df)
-            
-            # Save Preprocessor object (for Pipeline construction later)
-            joblib.dump(preprocessor, self.config.preprocessor_path)
-            logger.info("Preprocessing complete and objects saved")
-            
-            # Update df to processed version
-            df = df_processed
-
-            # 3. Train Test Split
-            train_df, test_df = train_test_split(df, test_size=0.2, random_state=42)
-            
-            # Save
-            train_df.to_csv(self.config.transformed_train_path, index=False)
-            test_df.to_csv(self.config.transformed_test_path, index=False)
-            
+            if self.config.mode == "chunked":
+                self.transform_chunked()
+            else:
+                self.transform_in_memory()
+
             logger.info(f"Train data saved at: {self.config.transformed_train_path}")
             logger.info(f"Test data saved at: {self.config.transformed_test_path}")
 
         except Exception as e:
             raise ChurnException(e, sys)
+
+    def transform_in_memory(self):
+        # Load Data
+        df = load_dataframe(self.config.data_path, dtypes=self.config.dtypes)
+        logger.info(f"Loaded data for transformation: {len(df)} rows, {memory_mb(df):.1f} MiB in memory")
+
+        # Drop ID
+        if 'customer_id' in df.columns:
+            df.drop("customer_id", axis=1, inplace=True)
+
+        # --- PREPROCESSING START (Consistent with Analysis) ---
+        # 1. Fill NA and encode: the preprocessor fits the fill values ("Unknown" for labels,
+        # medians for numbers) so the served model imputes exactly the same way
+        preprocessor = FeaturePreprocessor(median_precision=self.config.median_precision)
+        df_processed = preprocessor.fit_transform(df)
+        self.save_preprocessor(preprocessor, list(df.columns[:-1]))
+
+        # Update df to processed version
+        df = df_processed
+        logger.info(f"Encoded data: {memory_mb(df):.1f} MiB in memory")
+
+        # 2. Train Test Split
+        train_df, test_df = train_test_split(df, test_size=self.config.test_size, random_state=42)
+
+        # Save
+        save_dataframe(train_df, self.config.transformed_train_path, compression=self.config.compression)
+        save_dataframe(test_df, self.config.transformed_test_path, compression=self.config.compression)
+
+    def iter_chunks(self):
+        """The ingested dataset, `chunk_size` rows at a time, with the ID dropped.
+
+        Yields:
+            (pd.DataFrame, pd.Series): features + target, and the split key of each row
+        """
+        for chunk in iter_dataframe_chunks(self.config.data_path, self.config.chunk_size, dtypes=self.config.dtypes):
+            keys = chunk[self.config.split_key]
+            chunk = chunk.drop(columns=[col for col in {"customer_id", self.config.split_key} if col in chunk.columns])
+            yield chunk, keys
+
+    def scan(self):
+        """First pass: fits the preprocessor's vocabularies and fill values chunk by chunk.
+
+        Returns:
+            FeaturePreprocessor: fitted preprocessor
+        """
+        preprocessor = FeaturePreprocessor(median_precision=self.config.median_precision)
+        for chunk, _ in self.iter_chunks():
+            preprocessor.partial_fit(chunk)
+        return preprocessor
+
+    def is_test_row(self, keys):
+        """Deterministic split: a row is in the test set based on a hash of its key, not on its position."""
+        buckets = pd.util.hash_pandas_object(keys, index=False).to_numpy() % 10_000
+        return buckets < int(self.config.test_size * 10_000)
+
+    def transform_chunked(self):
+        """Two passes over `chunk_size` row chunks, so peak memory does not grow with the dataset.
+
+        Pass one fits the preprocessor (`scan`), pass two fills, encodes and appends
+        each chunk to the train or test file by `is_test_row`.
+        """
+        preprocessor = self.scan()
+        feature_names = list(preprocessor.feature_dtypes_)[:-1]
+        self.save_preprocessor(preprocessor, feature_names)
+
+        # Encoded columns become compact integer codes, the others keep their dtype
+        dtypes = {col: (preprocessor.code_dtype(col) if col in preprocessor.encoders else dtype)
+                  for col, dtype in preprocessor.feature_dtypes_.items()}
+        compression = self.config.compression
+        with ChunkedWriter(self.config.transformed_train_path, compression=compression, dtypes=dtypes) as train_writer, \
+                ChunkedWriter(self.config.transformed_test_path, compression=compression, dtypes=dtypes) as test_writer:
+            for chunk, keys in self.iter_chunks():
+                chunk = preprocessor.transform(chunk).astype(dtypes)
+                is_test = self.is_test_row(keys)
+                if (~is_test).any():
+                    train_writer.write(chunk[~is_test])
+                if is_test.any():
+                    test_writer.write(chunk[is_test])
+            empty_frame = pd.DataFrame(columns=list(dtypes)).astype(dtypes)
+            train_writer.close(empty_frame=empty_frame)
+            test_writer.close(empty_frame=empty_frame)
+        logger.info(f"Chunked transformation: {train_writer.n_rows} train and {test_writer.n_rows} test rows")
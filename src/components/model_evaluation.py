@@ -6,9 +6,12 @@ import mlflow.lightgbm
 from urllib.parse import urlparse
 from src.logger import logger
 from src.entity.config_entity import ModelEvaluationConfig
-from sklearn.metrics import accuracy_score, f1_score, recall_score, precision_score, confusion_matrix
+from sklearn.metrics import (accuracy_score, f1_score, recall_score, precision_score, roc_auc_score, log_loss,
+                             brier_score_loss)
 import joblib
-from src.utils.common import save_json
+import time
+from src.utils.common import save_json, get_file_hash
+from src.utils.artifacts import load_dataframe
 from src.exception import ChurnException
 import sys
 import numpy as np
@@ -17,9 +20,77 @@ class ModelEvaluation:
     def __init__(self, config: ModelEvaluationConfig):
         self.config = config
 
+    @staticmethod
+    def compute_scores(y_true, probabilities, threshold=0.5, n_bins=10):
+        """All evaluation metrics from one vector of positive class probabilities.
+
+        Labels are `probabilities >= threshold`, the rule the API classifies with
+        (serving.decision_threshold). Calibration is
+        reported as the Brier score and the expected calibration error over
+        `n_bins` equal width probability bins.
+        """
+        y_true = np.asarray(y_true)
+        predicted = (probabilities >= threshold).astype(int)
+
+        bins = np.minimum((probabilities * n_bins).astype(int), n_bins - 1)
+        ece = 0.0
+        for b in range(n_bins):
+            in_bin = bins == b
+            if in_bin.any():
+                ece += in_bin.mean() * abs(y_true[in_bin].mean() - probabilities[in_bin].mean())
+
+        return {
+            "accuracy": accuracy_score(y_true, predicted),
+            "f1_score": f1_score(y_true, predicted),
+            "recall": recall_score(y_true, predicted),
+            "precision": precision_score(y_true, predicted),
+            "roc_auc": roc_auc_score(y_true, probabilities),
+            "log_loss": log_loss(y_true, probabilities, labels=[0, 1]),
+            "brier_score": brier_score_loss(y_true, probabilities),
+            "expected_calibration_error": float(ece)
+        }
+
+    def champion_probabilities(self, client, model_name, test_x, test_hash):
+        """Production model probabilities on the test set, or None if there is no Production model.
+
+        They are cached per (model version, test set sha256): the champion is only
+        pulled from the registry and re-scored when either of them changed.
+        """
+        try:
+            champion = client.get_model_version_by_alias(model_name, "Production")
+        except Exception as e:
+            logger.warning(f"No Production model to compare against: {e}")
+            return None
+
+        cache_path = Path(self.config.champion_cache_dir) / f"v{champion.version}_{test_hash[:16]}.npy"
+        if cache_path.exists():
+            logger.info(f"Production model v{champion.version} predictions loaded from cache: {cache_path}")
+            return np.load(cache_path)
+
+        logger.info(f"Loading Production model from: models:/{model_name}@Production")
+        prod_model = mlflow.sklearn.load_model(f"models:/{model_name}@Production")
+        # The test data is already transformed, so score with the model step only
+        prod_estimator = prod_model.named_steps['model'] if hasattr(prod_model, 'named_steps') else prod_model
+        probabilities = prod_estimator.predict_proba(test_x)[:, 1]
+
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(".tmp.npy")
+        np.save(tmp_path, probabilities)
+        os.replace(tmp_path, cache_path)
+        return probabilities
+
+    @staticmethod
+    def logged_model_uri(run_id):
+        """URI of a model this run already logged, so evaluating it again does not log a duplicate."""
+        outputs = mlflow.get_run(run_id).outputs
+        model_outputs = outputs.model_outputs if outputs else []
+        return f"models:/{model_outputs[-1].model_id}" if model_outputs else None
+
     def evaluate(self):
         try:
-            test_data = pd.read_csv(self.config.test_data_path)
+            start = time.perf_counter()
+            test_data = load_dataframe(self.config.test_data_path)
+            test_hash = get_file_hash(Path(self.config.test_data_path))
             pipeline = joblib.load(self.config.model_path)
             
             # Read Run ID
@@ -34,23 +105,11 @@ class ModelEvaluation:
             # 'pipeline' expects RAW data.
             # So we extract the trained model step to evaluate on transformed data.
             model_step = pipeline.named_steps['model']
-            predicted_qualities = model_step.predict(test_x)
-
-            acc = accuracy_score(test_y, predicted_qualities)
-            f1 = f1_score(test_y, predicted_qualities)
-            recall = recall_score(test_y, predicted_qualities)
-            precision = precision_score(test_y, predicted_qualities)
-            
-            scores = {
-                "accuracy": acc, 
-                "f1_score": f1,
-                "recall": recall,
-                "precision": precision
-            }
+            # One predict_proba call; labels and every metric are derived from it
+            scores = self.compute_scores(test_y, model_step.predict_proba(test_x)[:, 1], self.config.decision_threshold)
             
             save_json(path=Path(self.config.metric_file_name), data=scores)
             
-            # MLflow Logging
             # MLflow Logging
             # Remove hardcoded URI, rely on env var or system default
             # mlflow.set_tracking_uri("sqlite:///mlflow.db") # Handled by env var
@@ -59,11 +118,9 @@ class ModelEvaluation:
             
             # Resume the Training Run
             with mlflow.start_run(run_id=run_id):
-                # 0. Log Model (ALWAYS) - Single Source of Truth
-                model_info = mlflow.sklearn.log_model(pipeline, name="model")
-                model_uri = model_info.model_uri
-
                 mlflow.log_metrics(scores)
+                mlflow.log_param("test_data_sha256", test_hash)
+                mlflow.log_param("decision_threshold", self.config.decision_threshold)
                 
                 # --- CHAMPION / CHALLENGER LOGIC ---
                 model_name = self.config.mlflow_config['model_name']
@@ -75,28 +132,12 @@ class ModelEvaluation:
                 client = mlflow.tracking.MlflowClient()
                 
                 try:
-                    # 1. Search for Production Model
-                    # 1. Load Production Model (Directly via Alias)
-                    # matches API behavior
-                    logger.info(f"Loading Production model from: models:/{model_name}@Production")
-                    prod_model_uri = f"models:/{model_name}@Production"
-                    prod_model = mlflow.sklearn.load_model(prod_model_uri)
-                    
-                    # 2. Predict on Current Test Data
-                    if hasattr(prod_model, 'named_steps'):
-                        prod_estimator = prod_model.named_steps['model']
-                    else:
-                         prod_estimator = prod_model
-                    
-                    prod_preds = prod_estimator.predict(test_x)
-                    
-                    # 3. Calculate Score
-                    if target_metric == "f1_score":
-                        production_score = f1_score(test_y, prod_preds)
-                    else:
-                        production_score = accuracy_score(test_y, prod_preds)
-                        
-                    logger.info(f"Re-evaluated Production Score ({target_metric}): {production_score}")
+                    champion_probabilities = self.champion_probabilities(client, model_name, test_x, test_hash)
+                    if champion_probabilities is not None:
+                        champion_scores = self.compute_scores(test_y, champion_probabilities, self.config.decision_threshold)
+                        mlflow.log_metrics({f"champion_{name}": value for name, value in champion_scores.items()})
+                        production_score = champion_scores[target_metric]
+                        logger.info(f"Re-evaluated Production Score ({target_metric}): {production_score}")
                 
                 except Exception as e:
                     logger.warning(f"Could not re-evaluate production model: {e}")
@@ -106,18 +147,26 @@ class ModelEvaluation:
                 # Champion/Challenger Comparison
                 if current_score > production_score:
                     logger.info(f"New Model ({current_score}) > Production ({production_score}). Registering...")
-                    
-                    # Register Model (Point to the artifact we just logged above)
+
+                    # Only a model that gets registered is logged (once per run); the artifact is the registry's source
+                    model_uri = self.logged_model_uri(run_id)
+                    if model_uri is None:
+                        model_uri = mlflow.sklearn.log_model(pipeline, name="model").model_uri
                     model_version = mlflow.register_model(model_uri, model_name)
                     
                     # Promote to Staging Stage (Manual approval needed for Production)
                     # (This moves the version to Staging)
                     # Promote to Staging (Using Aliases - Future Proof)
-                    client = mlflow.tracking.MlflowClient()
                     client.set_registered_model_alias(model_name, "Staging", model_version.version)
                     logger.info(f"Model Version {model_version.version} registered and assigned alias 'Staging'.")
                 else:
                     logger.info(f"New Model ({current_score}) < Production ({production_score}). Discarding...")
 
+                evaluation_seconds = time.perf_counter() - start
+                mlflow.log_metric("evaluation_seconds", evaluation_seconds)
+            logger.info(f"Evaluation finished in {evaluation_seconds:.2f}s")
+
+            return scores
+
         except Exception as e:
             raise ChurnException(e, sys)
@@ -1,52 +1,130 @@
 import pandas as pd
+import numpy as np
 import os
+import time
 from src.logger import logger
 from src.entity.config_entity import ModelTrainerConfig
 import joblib
-from lightgbm import LGBMClassifier
+from lightgbm import LGBMClassifier, early_stopping
+from sklearn.model_selection import train_test_split
 import mlflow
 import mlflow.lightgbm
 from src.exception import ChurnException
+from src.utils.tree_engine import CompiledTreeEnsemble
+from src.utils.common import load_json
+from src.utils.artifacts import load_dataframe
+from src.entity.schema import memory_mb
+from pathlib import Path
 import sys
 
 class ModelTrainer:
     def __init__(self, config: ModelTrainerConfig):
         self.config = config
 
+    def get_model_params(self):
+        """LightGBM params from params.yaml, overridden by the tuner's best params if there are any."""
+        params = {
+            "n_estimators": self.config.n_estimators,
+            "learning_rate": self.config.learning_rate,
+            "class_weight": self.config.class_weight,
+            "random_state": self.config.random_state,
+            "verbosity": self.config.verbosity
+        }
+        if os.path.exists(self.config.best_params_path):
+            best_params = load_json(Path(self.config.best_params_path)).to_dict()
+            if best_params:
+                logger.info(f"Using tuned params from {self.config.best_params_path}: {best_params}")
+            params.update(best_params)
+        return params
+
+    def get_categorical_features(self, preprocessor, feature_names):
+        """Label encoded columns, trained as LightGBM categorical features unless disabled."""
+        if not self.config.native_categorical:
+            return []
+        return [name for name in feature_names if name in preprocessor.encoders]
+
+    def find_n_estimators(self, train_x, train_y, model_params, categorical_features):
+        """Tree count picked by early stopping on a validation split held out of the training data.
+
+        Returns the configured `n_estimators` when early stopping is disabled.
+        """
+        if not self.config.early_stopping_rounds:
+            return model_params["n_estimators"]
+        fit_x, valid_x, fit_y, valid_y = train_test_split(
+            train_x, train_y, test_size=self.config.validation_size,
+            random_state=self.config.random_state, stratify=train_y
+        )
+        model = LGBMClassifier(**model_params)
+        model.fit(
+            fit_x, fit_y,
+            # eval_set rather than eval_X / eval_y, which only exist from LightGBM 4.7
+            eval_set=[(valid_x, valid_y)],
+            eval_names=[self.config.valid_name],
+            categorical_feature=categorical_features or "auto",
+            callbacks=[early_stopping(self.config.early_stopping_rounds, verbose=False)]
+        )
+        return model.best_iteration_ or model_params["n_estimators"]
+
+    @staticmethod
+    def measure_latency(predict_fn, rows, repeats=200):
+        """p50 / p95 latency in ms of scoring one row at a time, as the /predict endpoint does."""
+        timings = []
+        for i in range(repeats):
+            row = rows[i % len(rows)]
+            start = time.perf_counter()
+            predict_fn(row)
+            timings.append((time.perf_counter() - start) * 1000)
+        return float(np.percentile(timings, 50)), float(np.percentile(timings, 95))
+
     def train(self):
         try:
-            train_data = pd.read_csv(self.config.train_data_path)
-            test_data = pd.read_csv(self.config.test_data_path)
+            train_data = load_dataframe(self.config.train_data_path)
+            test_data = load_dataframe(self.config.test_data_path)
             
             # Assuming last column is target as per transformation
             train_x = train_data.iloc[:, :-1]
             train_y = train_data.iloc[:, -1]
             test_x = test_data.iloc[:, :-1]
             test_y = test_data.iloc[:, -1]
+            logger.info(f"Loaded train / test data: {memory_mb(train_data):.1f} / {memory_mb(test_data):.1f} MiB in memory")
+
+            # --- NEW: Pipeline Construction ---
+            from sklearn.pipeline import Pipeline
+
+            # Load Preprocessor
+            preprocessor_path = "artifacts/data_transformation/preprocessor.pkl"
+            if os.path.exists(preprocessor_path):
+                preprocessor = joblib.load(preprocessor_path)
+            else:
+                raise Exception(f"Preprocessor not found at {preprocessor_path}")
 
             # mlflow.set_tracking_uri("sqlite:///mlflow.db") # Handled by env var
             mlflow.set_experiment(self.config.mlflow_config['experiment_name'])
 
             with mlflow.start_run():
-                model = LGBMClassifier(
-                    n_estimators=self.config.n_estimators,
-                    learning_rate=self.config.learning_rate,
-                    class_weight=self.config.class_weight,
-                    random_state=self.config.random_state,
-                    verbosity=self.config.verbosity
-                )
-                
-                model.fit(train_x, train_y)
+                model_params = self.get_model_params()
+                categorical_features = self.get_categorical_features(preprocessor, list(train_x.columns))
 
-                # --- NEW: Pipeline Construction ---
-                from sklearn.pipeline import Pipeline
-                
-                # Load Preprocessor
-                preprocessor_path = "artifacts/data_transformation/preprocessor.pkl"
-                if os.path.exists(preprocessor_path):
-                    preprocessor = joblib.load(preprocessor_path)
-                else:
-                    raise Exception(f"Preprocessor not found at {preprocessor_path}")
+                # Early stopping picks the tree count; the final model is refit on all
+                # training rows with exactly that many trees, so the saved model (and the
+                # compiled ensemble) holds no trees past the best iteration
+                start = time.perf_counter()
+                n_estimators = self.find_n_estimators(train_x, train_y, model_params, categorical_features)
+                model_params["n_estimators"] = n_estimators
+                model = LGBMClassifier(**model_params)
+                model.fit(train_x, train_y, categorical_feature=categorical_features or "auto")
+                train_seconds = time.perf_counter() - start
+                logger.info(f"Trained {model.booster_.num_trees()} trees in {train_seconds:.2f}s "
+                            f"(categorical: {categorical_features})")
+
+                # The serving fast path encodes payloads from the preprocessor's schema;
+                # make sure it lines up with the columns the model was actually trained on
+                feature_schema_path = os.path.join(os.path.dirname(preprocessor_path), "feature_schema.json")
+                if os.path.exists(feature_schema_path):
+                    recorded_schema = load_json(Path(feature_schema_path)).to_dict()
+                    if preprocessor.get_feature_schema(list(model.feature_name_)) != recorded_schema:
+                        raise Exception(f"Model features do not match the schema at {feature_schema_path}")
+                    mlflow.log_artifact(feature_schema_path)
 
                 final_pipeline = Pipeline([
                     ('preprocessor', preprocessor),
@@ -55,13 +133,33 @@ class ModelTrainer:
 
                 # Save PIPELINE, not just model
                 joblib.dump(final_pipeline, os.path.join(self.config.root_dir, self.config.model_name))
-                
-                # Retrieve parameters from config
-                mlflow.log_params({
-                    "n_estimators": self.config.n_estimators,
-                    "learning_rate": self.config.learning_rate,
-                    "class_weight": self.config.class_weight
+
+                # Export the booster as flat node arrays for the native inference backend
+                compiled_model_path = os.path.join(self.config.root_dir, self.config.compiled_model_name)
+                compiled_model = CompiledTreeEnsemble.from_booster(model.booster_)
+                compiled_model.save(compiled_model_path)
+                logger.info(f"Compiled tree ensemble saved at: {compiled_model_path}")
+
+                # Single row scoring latency of both inference backends, on encoded test rows
+                rows = [test_x.iloc[[i]] for i in range(min(len(test_x), 50))]
+                latency_p50, latency_p95 = self.measure_latency(model.predict_proba, rows)
+                compiled_p50, compiled_p95 = self.measure_latency(
+                    compiled_model.predict_proba, [row.to_numpy(dtype=np.float64) for row in rows]
+                )
+                mlflow.log_metrics({
+                    "train_seconds": train_seconds,
+                    "n_trees": model.booster_.num_trees(),
+                    "model_size_kb": os.path.getsize(os.path.join(self.config.root_dir, self.config.model_name)) / 1024,
+                    "latency_ms_p50": latency_p50,
+                    "latency_ms_p95": latency_p95,
+                    "compiled_latency_ms_p50": compiled_p50,
+                    "compiled_latency_ms_p95": compiled_p95
                 })
+                logger.info(f"Single row latency p50 {latency_p50:.3f} ms (sklearn), {compiled_p50:.3f} ms (native)")
+                
+                # Parameters from config, or tuned by the model_tuner stage
+                mlflow.log_params({name: value for name, value in model_params.items() if name != "verbosity"})
+                mlflow.log_param("categorical_features", ",".join(categorical_features))
 
                 # Log PIPELINE
                 # We use sklearn flavor now because it's a Pipeline
@@ -0,0 +1,219 @@
+import os
+import sys
+import math
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+import mlflow
+from lightgbm import LGBMClassifier, early_stopping
+from sklearn.metrics import f1_score
+from sklearn.model_selection import train_test_split
+from src.logger import logger
+from src.exception import ChurnException
+from src.entity.config_entity import ModelTunerConfig
+from src.utils.common import save_json, load_json, get_cpu_quota
+from src.utils.artifacts import load_dataframe
+
+# Early stopping metrics where higher is better; every other LightGBM metric is a loss
+MAXIMIZE_METRICS = {"auc", "average_precision"}
+
+# Train / validation split of the worker process, set once by _init_search_worker
+_search_data = {}
+
+def _init_search_worker(train_data_path, validation_size, random_state, categorical_features, decision_threshold):
+    """Loads the training data once per worker and holds out the validation split."""
+    train_data = load_dataframe(train_data_path)
+    x, y = train_data.iloc[:, :-1], train_data.iloc[:, -1]
+    train_x, valid_x, train_y, valid_y = train_test_split(
+        x, y, test_size=validation_size, random_state=random_state, stratify=y
+    )
+    _search_data.update(train_x=train_x, train_y=train_y, valid_x=valid_x, valid_y=valid_y,
+                        categorical_features=categorical_features or "auto", decision_threshold=decision_threshold)
+
+def _fit_trial(params, n_estimators, valid_name, metric, early_stopping_rounds):
+    """Fits one configuration with a budget of `n_estimators` trees, stopping early on the validation split."""
+    start = time.perf_counter()
+    model = LGBMClassifier(**params, n_estimators=n_estimators)
+    model.fit(
+        _search_data["train_x"], _search_data["train_y"],
+        # eval_set rather than eval_X / eval_y, which only exist from LightGBM 4.7
+        eval_set=[(_search_data["valid_x"], _search_data["valid_y"])],
+        eval_names=[valid_name],
+        eval_metric=metric,
+        categorical_feature=_search_data["categorical_features"],
+        callbacks=[early_stopping(early_stopping_rounds, first_metric_only=True, verbose=False)],
+    )
+    best_iteration = model.best_iteration_ or n_estimators
+    # Classified like evaluation and serving do, not at LightGBM's fixed 0.5 cutoff
+    predictions = model.predict_proba(_search_data["valid_x"])[:, 1] >= _search_data["decision_threshold"]
+    return {
+        "score": float(model.best_score_[valid_name][metric]),
+        "best_iteration": int(best_iteration),
+        "stopped_early": best_iteration < n_estimators,
+        "f1_score": float(f1_score(_search_data["valid_y"], predictions)),
+        "seconds": time.perf_counter() - start,
+    }
+
+class ModelTuner:
+    """
+    Searches LightGBM hyperparameters with successive halving.
+
+    `n_trials` configurations are sampled from the search space and trained with
+    a small tree budget. Only the best 1/`halving_factor` of them go on to the next
+    rung, which has a budget `halving_factor` times larger, up to `max_estimators`.
+    Every fit stops early on a validation split held out of the training data
+    (the test set is left to evaluation), and the trials of a rung run in parallel
+    in a process pool. The best configuration, with its early stopped tree count,
+    is saved for the trainer.
+    """
+
+    def __init__(self, config: ModelTunerConfig):
+        self.config = config
+
+    def get_categorical_features(self):
+        """Label encoded columns of the feature schema, searched as LightGBM categorical features."""
+        if not self.config.native_categorical or not os.path.exists(self.config.feature_schema_path):
+            return []
+        feature_schema = load_json(Path(self.config.feature_schema_path))
+        return [feature.name for feature in feature_schema.features if feature.encoded]
+
+    def sample_trials(self):
+        """Draws `n_trials` parameter sets from the search space."""
+        rng = np.random.default_rng(self.config.random_state)
+        trials = []
+        for _ in range(self.config.n_trials):
+            params = {}
+            for name, space in self.config.search_space.items():
+                if space["type"] == "categorical":
+                    params[name] = space["choices"][rng.integers(len(space["choices"]))]
+                elif space.get("log", False):
+                    value = math.exp(rng.uniform(math.log(space["low"]), math.log(space["high"])))
+                    params[name] = int(round(value)) if space["type"] == "int" else float(value)
+                elif space["type"] == "int":
+                    params[name] = int(rng.integers(space["low"], space["high"] + 1))
+                else:
+                    params[name] = float(rng.uniform(space["low"], space["high"]))
+            trials.append(params)
+        return trials
+
+    def rungs(self):
+        """Tree budgets of the successive halving rungs, e.g. [50, 150, 450, 1000]."""
+        budgets = []
+        budget = self.config.min_estimators
+        while budget < self.config.max_estimators:
+            budgets.append(budget)
+            budget *= self.config.halving_factor
+        budgets.append(self.config.max_estimators)
+        return budgets
+
+    def workers(self):
+        """(processes, LightGBM threads per trial) within the CPU quota."""
+        quota = get_cpu_quota()
+        n_jobs = quota if self.config.n_jobs == "auto" else int(self.config.n_jobs)
+        return n_jobs, max(1, quota // n_jobs)
+
+    def search(self, n_jobs=None):
+        """Runs the successive halving search.
+
+        Returns:
+            list: one dict per trial with its params, per-rung results and the rung it was pruned at
+        """
+        processes, threads = self.workers()
+        if n_jobs is not None:
+            processes, threads = n_jobs, max(1, get_cpu_quota() // n_jobs)
+        maximize = self.config.metric in MAXIMIZE_METRICS
+        trials = [{"trial": i, "params": params, "results": {}, "pruned_at": None}
+                  for i, params in enumerate(self.sample_trials())]
+        logger.info(f"Tuning {len(trials)} trials over rungs {self.rungs()} with {processes} processes x {threads} threads")
+
+        context = multiprocessing.get_context("spawn")
+        initargs = (self.config.train_data_path, self.config.validation_size, self.config.random_state,
+                    self.get_categorical_features(), self.config.decision_threshold)
+        with ProcessPoolExecutor(max_workers=processes, mp_context=context,
+                                 initializer=_init_search_worker, initargs=initargs) as pool:
+            survivors = trials
+            for rung, budget in enumerate(self.rungs()):
+                futures = {}
+                for trial in survivors:
+                    previous = trial["results"].get(rung - 1)
+                    if previous is not None and previous["stopped_early"]:
+                        # It converged below the last budget; more trees would not change the result
+                        trial["results"][rung] = dict(previous, seconds=0.0)
+                        continue
+                    params = dict(self.config.base_params, **trial["params"], n_jobs=threads)
+                    futures[trial["trial"]] = pool.submit(_fit_trial, params, budget, self.config.valid_name,
+                                                          self.config.metric, self.config.early_stopping_rounds)
+                for trial in survivors:
+                    if trial["trial"] in futures:
+                        trial["results"][rung] = futures[trial["trial"]].result()
+
+                survivors = sorted(survivors, key=lambda t: t["results"][rung]["score"], reverse=maximize)
+                keep = max(1, math.ceil(len(survivors) / self.config.halving_factor))
+                if rung < len(self.rungs()) - 1:
+                    for trial in survivors[keep:]:
+                        trial["pruned_at"] = rung
+                    survivors = survivors[:keep]
+                logger.info(f"Rung {rung} ({budget} trees): best {self.config.metric} "
+                            f"{survivors[0]['results'][rung]['score']:.5f}, {len(survivors)} trials continue")
+
+        return trials
+
+    def best_trial(self, trials):
+        last_rung = len(self.rungs()) - 1
+        finalists = [t for t in trials if last_rung in t["results"]]
+        return sorted(finalists, key=lambda t: t["results"][last_rung]["score"],
+                      reverse=self.config.metric in MAXIMIZE_METRICS)[0]
+
+    def log_trials(self, trials):
+        """Logs every trial as a nested MLflow run, with its score per rung budget as the step."""
+        rungs = self.rungs()
+        for trial in trials:
+            with mlflow.start_run(run_name=f"trial_{trial['trial']}", nested=True):
+                mlflow.log_params(trial["params"])
+                for rung, result in trial["results"].items():
+                    mlflow.log_metric(f"valid_{self.config.metric}", result["score"], step=rungs[rung])
+                    mlflow.log_metric("valid_f1_score", result["f1_score"], step=rungs[rung])
+                    mlflow.log_metric("best_iteration", result["best_iteration"], step=rungs[rung])
+                    mlflow.log_metric("fit_seconds", result["seconds"], step=rungs[rung])
+                mlflow.set_tag("pruned", trial["pruned_at"] is not None)
+                if trial["pruned_at"] is not None:
+                    mlflow.set_tag("pruned_at_estimators", rungs[trial["pruned_at"]])
+
+    def tune(self):
+        try:
+            if not self.config.enabled:
+                # Keep the stage output in place; an empty file means "use params.yaml"
+                save_json(Path(self.config.best_params_path), {})
+                logger.info("Tuning disabled, the trainer uses the LightGBM params from params.yaml")
+                return {}
+
+            mlflow.set_experiment(self.config.mlflow_config['experiment_name'])
+            with mlflow.start_run(run_name="model_tuning"):
+                start = time.perf_counter()
+                trials = self.search()
+                seconds = time.perf_counter() - start
+
+                best = self.best_trial(trials)
+                best_result = best["results"][len(self.rungs()) - 1]
+                best_params = dict(best["params"], n_estimators=best_result["best_iteration"])
+                save_json(Path(self.config.best_params_path), best_params)
+
+                self.log_trials(trials)
+                mlflow.log_params({f"best_{name}": value for name, value in best_params.items()})
+                mlflow.log_param("decision_threshold", self.config.decision_threshold)
+                mlflow.log_metrics({
+                    f"best_valid_{self.config.metric}": best_result["score"],
+                    "best_valid_f1_score": best_result["f1_score"],
+                    "search_seconds": seconds,
+                    "trials_pruned": sum(t["pruned_at"] is not None for t in trials),
+                })
+                mlflow.log_artifact(self.config.best_params_path)
+
+            logger.info(f"Best trial {best['trial']} ({self.config.metric} {best_result['score']:.5f}) "
+                        f"found in {seconds:.1f}s, params saved at: {self.config.best_params_path}")
+            return best_params
+
+        except Exception as e:
+            raise ChurnException(e, sys)
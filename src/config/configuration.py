@@ -1,6 +1,7 @@
 from src.constants import CONFIG_FILE_PATH, PARAMS_FILE_PATH
 from src.utils.common import read_yaml, create_directories
-from src.entity.config_entity import DataIngestionConfig, DataTransformationConfig, ModelTrainerConfig, ModelEvaluationConfig
+from src.utils.artifacts import artifact_format
+from src.entity.config_entity import DataIngestionConfig, DataTransformationConfig, ModelTunerConfig, ModelTrainerConfig, ModelEvaluationConfig
 from box import ConfigBox
 
 class ConfigurationManager:
@@ -14,52 +15,125 @@ class ConfigurationManager:
 
         create_directories([self.config.artifacts_root])
 
+    def check_artifact_format(self, *paths):
+        """Every tabular artifact must use the configured `artifact_format`."""
+        for path in paths:
+            if artifact_format(path) != self.config.artifact_format:
+                raise ValueError(
+                    f"{path} does not match artifact_format '{self.config.artifact_format}' in config.yaml"
+                )
+
     def get_data_ingestion_config(self) -> DataIngestionConfig:
         config = self.config.data_ingestion
+        params = self.params.data_ingestion
 
         create_directories([config.root_dir])
+        self.check_artifact_format(config.data_file_path, config.raw_data_path)
 
         data_ingestion_config = DataIngestionConfig(
             root_dir=config.root_dir,
             data_file_path=config.data_file_path,
             raw_data_path=config.raw_data_path,
+            watermark_path=config.watermark_path,
+            manifest_path=config.manifest_path,
+            batch_size=params.batch_size,
+            columns=list(params.schema.keys()),
+            dtypes=dict(params.schema),
+            compression=self.config.artifact_compression,
+            incremental=params.incremental,
+            full_refresh=params.full_refresh,
+            watermark_field=params.watermark_field,
+            key_column=params.key_column,
         )
 
         return data_ingestion_config
 
     def get_data_transformation_config(self) -> DataTransformationConfig:
         config = self.config.data_transformation
+        params = self.params.data_transformation
         
         create_directories([config.root_dir])
+        self.check_artifact_format(config.data_path, config.transformed_train_path, config.transformed_test_path)
         
         data_transformation_config = DataTransformationConfig(
             root_dir=config.root_dir,
             data_path=config.data_path,
             transformed_train_path=config.transformed_train_path,
             transformed_test_path=config.transformed_test_path,
-            preprocessor_path=config.preprocessor_path
+            preprocessor_path=config.preprocessor_path,
+            feature_schema_path=config.feature_schema_path,
+            compression=self.config.artifact_compression,
+            dtypes=dict(self.params.data_ingestion.schema),
+            mode=params.mode,
+            chunk_size=params.chunk_size,
+            test_size=params.test_size,
+            split_key=params.split_key,
+            median_precision=params.median_precision
         )
         
         return data_transformation_config
 
+    def get_model_tuner_config(self) -> ModelTunerConfig:
+        config = self.config.model_tuner
+        params = self.params.tuning
+        lgbm_params = self.params.LightGBM
+
+        create_directories([config.root_dir])
+        self.check_artifact_format(config.train_data_path)
+
+        model_tuner_config = ModelTunerConfig(
+            root_dir=config.root_dir,
+            train_data_path=config.train_data_path,
+            feature_schema_path=config.feature_schema_path,
+            best_params_path=config.best_params_path,
+            enabled=params.enabled,
+            native_categorical=lgbm_params.native_categorical,
+            valid_name=lgbm_params.valid_name,
+            base_params={
+                "class_weight": lgbm_params.class_weight,
+                "random_state": lgbm_params.random_state,
+                "verbosity": lgbm_params.verbosity
+            },
+            search_space=params.search_space.to_dict(),
+            n_trials=params.n_trials,
+            n_jobs=params.n_jobs,
+            validation_size=params.validation_size,
+            metric=params.metric,
+            early_stopping_rounds=params.early_stopping_rounds,
+            min_estimators=params.halving.min_estimators,
+            max_estimators=params.halving.max_estimators,
+            halving_factor=params.halving.factor,
+            random_state=lgbm_params.random_state,
+            decision_threshold=float(self.params.serving.decision_threshold),
+            mlflow_config=self.params.mlflow_config
+        )
+
+        return model_tuner_config
+
     def get_model_trainer_config(self) -> ModelTrainerConfig:
         config = self.config.model_trainer
         params = self.params.LightGBM
         mlflow_config = self.params.mlflow_config
         
         create_directories([config.root_dir])
+        self.check_artifact_format(config.train_data_path, config.test_data_path)
         
         model_trainer_config = ModelTrainerConfig(
             root_dir=config.root_dir,
             train_data_path=config.train_data_path,
             test_data_path=config.test_data_path,
+            best_params_path=config.best_params_path,
             model_name=config.model_name,
+            compiled_model_name=config.compiled_model_name,
             valid_name=params.valid_name,
             n_estimators=params.n_estimators,
             learning_rate=params.learning_rate,
             class_weight=params.class_weight,
             random_state=params.random_state,
             verbosity=params.verbosity,
+            validation_size=params.validation_size,
+            early_stopping_rounds=params.early_stopping_rounds,
+            native_categorical=params.native_categorical,
             mlflow_config=mlflow_config
         )
         
@@ -70,12 +144,16 @@ class ConfigurationManager:
         mlflow_config = self.params.mlflow_config
         
         create_directories([config.root_dir])
+        self.check_artifact_format(config.test_data_path)
         
         model_evaluation_config = ModelEvaluationConfig(
             root_dir=config.root_dir,
             test_data_path=config.test_data_path,
             model_path=config.model_path,
             metric_file_name=config.metric_file_name,
+            champion_cache_dir=config.champion_cache_dir,
+            # Score with the threshold the API classifies with
+            decision_threshold=float(self.params.serving.decision_threshold),
             mlflow_config=mlflow_config
         )
         
@@ -2,6 +2,7 @@ from pathlib import Path
 
 CONFIG_FILE_PATH = Path("config/config.yaml")
 PARAMS_FILE_PATH = Path("params.yaml")
+DVC_FILE_PATH = Path("dvc.yaml")
 
 DATABASE_NAME = "MLOPS-project-2"
 COLLECTION_NAME = "churn_data"
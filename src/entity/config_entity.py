@@ -10,6 +10,16 @@ class DataIngestionConfig:
     root_dir: Path
     data_file_path: Path
     raw_data_path: Path
+    watermark_path: Path
+    manifest_path: Path
+    batch_size: int
+    columns: list
+    dtypes: dict
+    compression: str
+    incremental: bool
+    full_refresh: bool
+    watermark_field: str
+    key_column: str
 
 @dataclass
 class MongoDBEnvironmentVariable:
@@ -22,19 +32,55 @@ class DataTransformationConfig:
     transformed_train_path: Path
     transformed_test_path: Path
     preprocessor_path: Path
+    feature_schema_path: Path
+    compression: str
+    dtypes: dict
+    mode: str
+    chunk_size: int
+    test_size: float
+    split_key: str
+    median_precision: int
+
+@dataclass(frozen=True)
+class ModelTunerConfig:
+    root_dir: Path
+    train_data_path: Path
+    feature_schema_path: Path
+    best_params_path: Path
+    enabled: bool
+    native_categorical: bool
+    valid_name: str
+    base_params: dict
+    search_space: dict
+    n_trials: int
+    n_jobs: str
+    validation_size: float
+    metric: str
+    early_stopping_rounds: int
+    min_estimators: int
+    max_estimators: int
+    halving_factor: int
+    random_state: int
+    decision_threshold: float
+    mlflow_config: dict
 
 @dataclass(frozen=True)
 class ModelTrainerConfig:
     root_dir: Path
     train_data_path: Path
     test_data_path: Path
+    best_params_path: Path
     model_name: str
+    compiled_model_name: str
     valid_name: str
     n_estimators: int
     learning_rate: float
     class_weight: str
     random_state: int
     verbosity: int
+    validation_size: float
+    early_stopping_rounds: int
+    native_categorical: bool
     mlflow_config: dict
 
 @dataclass(frozen=True)
@@ -43,4 +89,6 @@ class ModelEvaluationConfig:
     test_data_path: Path
     model_path: Path
     metric_file_name: Path
+    champion_cache_dir: Path
+    decision_threshold: float
     mlflow_config: dict
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+# The churn dataset's columns and dtypes are declared in params.yaml (data_ingestion.schema):
+# category for labels, nullable Int8 / Int16 / Int32 for counts and IDs, float32 for charges.
+# These helpers apply such a declaration and size the frames derived from it.
+
+def apply_schema(df: pd.DataFrame, dtypes: dict) -> pd.DataFrame:
+    """Casts the columns of `df` listed in `dtypes`, leaving the others (and matching ones) as they are."""
+    casts = {col: dtype for col, dtype in dtypes.items() if col in df.columns and str(df[col].dtype) != str(dtype)}
+    return df.astype(casts) if casts else df
+
+def is_label_column(series: pd.Series) -> bool:
+    """True for columns holding labels to encode: object, string or category dtype."""
+    return (pd.api.types.is_object_dtype(series.dtype) or pd.api.types.is_string_dtype(series.dtype)
+            or isinstance(series.dtype, pd.CategoricalDtype))
+
+def fill_label_column(series: pd.Series, value="Unknown") -> pd.Series:
+    """fillna for label columns; category columns get `value` added as a category first."""
+    if isinstance(series.dtype, pd.CategoricalDtype) and value not in series.cat.categories:
+        series = series.cat.add_categories([value])
+    return series.fillna(value)
+
+def code_dtype(n_categories: int, unknown_value: int = 0) -> str:
+    """Smallest signed integer dtype holding the codes 0 .. n_categories - 1 and `unknown_value`."""
+    low, high = min(0, unknown_value), max(n_categories - 1, unknown_value)
+    for dtype in ("int8", "int16", "int32"):
+        if np.iinfo(dtype).min <= low and high <= np.iinfo(dtype).max:
+            return dtype
+    return "int64"
+
+def memory_mb(df: pd.DataFrame) -> float:
+    """In-memory size of `df`, strings included."""
+    return df.memory_usage(deep=True).sum() / 2**20
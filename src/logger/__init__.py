@@ -17,4 +17,11 @@ logging.basicConfig(
     ]
 )
 
+# Own handlers, so libraries that reconfigure the root logger (e.g. MLflow's
+# database migrations) cannot silence pipeline logs
 logger = logging.getLogger("churnLogger")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+for handler in [logging.FileHandler(log_filepath), logging.StreamHandler(sys.stdout)]:
+    handler.setFormatter(logging.Formatter(logging_str))
+    logger.addHandler(handler)
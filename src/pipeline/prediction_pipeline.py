@@ -1,11 +1,16 @@
 import os
+import time
 import joblib
+import numpy as np
 import pandas as pd
 import mlflow
 from src.exception import ChurnException
 import sys
 from src.utils.transformers import FeaturePreprocessor
-from src.utils.common import read_yaml
+from src.utils.tree_engine import CompiledTreeEnsemble
+from src.utils.model_cache import ModelCache
+from src.utils.shared_model import SharedModelStore
+from src.utils.common import read_yaml, get_cpu_quota
 from src.constants import PARAMS_FILE_PATH
 from dotenv import load_dotenv
 
@@ -14,50 +19,214 @@ load_dotenv()
 class PredictionPipeline:
     def __init__(self):
         self.model = None
+        self.model_version = None
+        # Fast path / native backend state (derived from the loaded sklearn Pipeline)
+        self.prepared = False
+        self.preprocessor = None
+        self.feature_names = None
+        self.feature_schema = None
+        self.engine = None
         # Load params to get model name
         self.params = read_yaml(PARAMS_FILE_PATH)
         self.model_name = self.params.mlflow_config.model_name
+        # Probability at or above which a customer is classified as churn
+        self.threshold = float(self.params.serving.decision_threshold)
+        # "sklearn" (Pipeline.predict_proba) or "native" (CompiledTreeEnsemble)
+        self.backend = self.params.serving.inference_backend
+        # Encode payloads straight into a NumPy matrix instead of a DataFrame
+        self.fast_path = self.params.serving.fast_path
+        # LightGBM (OpenMP) threads per predict call; "auto" splits the CPU quota across
+        # inference workers in every server process
+        executor_config = self.params.serving.executor
+        server_workers = int(os.getenv("WEB_CONCURRENCY", self.params.serving.workers))
+        self.num_threads = executor_config.lgbm_threads
+        if self.num_threads == "auto":
+            self.num_threads = max(1, get_cpu_quota() // (executor_config.max_workers * server_workers))
+
+        # Local artifact cache (warm start without the registry)
+        cache_config = self.params.serving.model_cache
+        self.cache = None
+        if cache_config.enabled:
+            self.cache = ModelCache(os.getenv("MODEL_CACHE_DIR", cache_config.cache_dir))
+        # Memory-mapped model shared by all server processes (serves with the native engine)
+        shared_config = self.params.serving.shared_model
+        self.shared_store = None
+        if shared_config.enabled:
+            self.shared_store = SharedModelStore(os.getenv("SHARED_MODEL_DIR", shared_config.dir))
+        self.loaded_from = None  # "cache", "registry" or "shared"
+        self.load_seconds = None
         
         # Optional: Set URI if provided in env, else rely on default
         tracking_uri = os.getenv("MLFLOW_TRACKING_URI")
         if tracking_uri:
             mlflow.set_tracking_uri(tracking_uri)
 
-    def load_resources(self):
-        """Loads the Unified Pipeline Model"""
+    def load_resources(self, version=None):
+        """Loads the Unified Pipeline Model
+
+        Args:
+            version (str, optional): exact registry version to load instead of resolving the alias
+        """
         try:
-            if self.model is None:
+            # With a shared model there is no sklearn Pipeline in this process, only the engine
+            if self.model is None and self.engine is None:
                 try:
                     target_stage = self.params.model_deployment.target_stage
+                    start = time.perf_counter()
+                    version, model_uri, source = self.resolve_model(target_stage, version=version)
+
                     # Load Production Pipeline (Using sklearn loader to get predict_proba support)
-                    print(f"Loading Pipeline ({self.model_name}) from alias '@{target_stage}'...")
-                    self.model = mlflow.sklearn.load_model(f"models:/{self.model_name}@{target_stage}")
+                    print(f"Loading Pipeline ({self.model_name}) version {version} from alias '@{target_stage}' ({source})...")
+                    if self.shared_store is not None:
+                        source = self.load_shared(version, model_uri, source)
+                    else:
+                        self.model = mlflow.sklearn.load_model(model_uri)
+                    self.model_version = str(version)
+                    self.loaded_from = source
+                    self.load_seconds = time.perf_counter() - start
                     
                 except Exception as e:
                     print(f"❌ Model not found in Registry: {e}")
                     raise Exception(f"No model found with alias '@{target_stage}'. Service Unavailable.")
+
+            if not self.prepared:
+                self.prepare_inference()
                     
         except Exception as e:
             raise ChurnException(e, sys)
 
+    def resolve_model(self, alias, version=None):
+        """Finds the model to load for `alias` (or an exact `version`), preferring the local cache.
+
+        Returns:
+            tuple: (version, model URI or local path, "cache" | "registry")
+        """
+        if self.cache is not None and version is None:
+            cached = self.cache.lookup(self.model_name, alias=alias)
+            if cached is not None:
+                version, path = cached
+                return version, path, "cache"
+
+        # Resolve the alias first so the version we report is the version we load
+        if version is None:
+            version = self.registry_version()
+        if self.cache is not None:
+            source = "cache" if self.cache.lookup(self.model_name, version=version) else "registry"
+            return version, self.cache.fetch(self.model_name, version, alias=alias), source
+        return version, f"models:/{self.model_name}/{version}", "registry"
+
+    def load_shared(self, version, model_uri, source):
+        """Maps the shared export of `version`, exporting it first if no worker has yet.
+
+        Returns:
+            str: "shared" if another process had already exported it, else `source`
+        """
+        shared = self.shared_store.load(self.model_name, version)
+        if shared is not None:
+            source = "shared"
+        else:
+            model = mlflow.sklearn.load_model(model_uri)
+            engine = CompiledTreeEnsemble.from_booster(model.named_steps['model'].booster_)
+            self.shared_store.export(self.model_name, version, model.named_steps['preprocessor'], engine)
+            # Drop the private copy and map the exported files like every other worker
+            del model, engine
+            shared = self.shared_store.load(self.model_name, version)
+        self.preprocessor, self.engine = shared
+        return source
+
+    def registry_version(self):
+        """Returns the version the target-stage alias currently points to in the registry."""
+        target_stage = self.params.model_deployment.target_stage
+        client = mlflow.MlflowClient()
+        return str(client.get_model_version_by_alias(self.model_name, target_stage).version)
+
+    def refresh_cache(self):
+        """Checks the registry alias and pulls its current version into the cache.
+
+        Meant to run in the background after a warm start from the cache.
+
+        Returns:
+            str: version the registry alias currently points to
+        """
+        target_stage = self.params.model_deployment.target_stage
+        version = self.registry_version()
+        if self.cache is not None:
+            self.cache.fetch(self.model_name, version, alias=target_stage)
+        if version != self.model_version:
+            print(f"ℹ️ Registry '@{target_stage}' is at version {version}, serving version {self.model_version}.")
+        return version
+
+    def prepare_inference(self):
+        """Sets up the fast path and native backend for the loaded model (once per model)."""
+        if self.model is None:
+            # Shared model: the memory-mapped engine carries the feature order
+            self.feature_names = list(self.engine.feature_names)
+        else:
+            self.preprocessor = self.model.named_steps['preprocessor']
+            self.feature_names = list(self.model.named_steps['model'].feature_name_)
+            # Don't let LightGBM spawn more threads than the pod is allowed to use
+            self.model.named_steps['model'].set_params(n_jobs=self.num_threads)
+
+        if self.backend == "native" and self.engine is None:
+            self.compile_native_backend()
+
+        if self.fast_path:
+            try:
+                # Fails for preprocessors that did not record their training columns
+                self.feature_schema = self.preprocessor.get_feature_schema(self.feature_names)
+            except (ValueError, AttributeError) as e:
+                print(f"⚠️ NumPy fast path disabled, falling back to DataFrame input: {e}")
+
+        self.prepared = True
+
+    def compile_native_backend(self):
+        """Flattens the loaded LightGBM booster into a CompiledTreeEnsemble."""
+        self.preprocessor = self.model.named_steps['preprocessor']
+        self.engine = CompiledTreeEnsemble.from_booster(self.model.named_steps['model'].booster_)
+        print(f"Compiled native inference engine ({self.engine.n_trees} trees).")
+
     def predict(self, data: dict):
+        """Scores a single raw customer dict.
+
+        Returns:
+            tuple: (predicted class, churn probability)
+        """
+        predictions, probas = self.predict_batch([data])
+        return predictions[0], probas[0]
+
+    def predict_batch(self, records: list):
+        """Scores many raw customer records with a single columnar model call.
+
+        Args:
+            records (list): list of raw customer dicts (same fields as `predict`)
+
+        Returns:
+            tuple: (np.ndarray of predicted classes, np.ndarray of churn probabilities)
+        """
         try:
             self.load_resources()
-            
-            # Create DataFrame from input
-            # Note: We pass Raw customer data. The Pipeline handles encoding.
-            input_df = pd.DataFrame([data])
-            
-            # Predict
-            prediction = self.model.predict(input_df)
-            
-            # Get Probability
-            try:
-                proba = float(self.model.predict_proba(input_df)[0][1])
-            except Exception:
-                proba = 0.0
-                
-            return prediction[0], proba
-            
+
+            # Run the model once; the class is derived from the probability
+            if self.feature_schema is not None:
+                # Fast path: payloads -> float64 matrix in training column order, no DataFrame
+                features = self.preprocessor.to_matrix(records, self.feature_names)
+                if self.engine is not None:
+                    proba = self.engine.predict_proba(features)[:, 1]
+                else:
+                    proba = self.model.named_steps['model'].booster_.predict(features, num_threads=self.num_threads)
+            else:
+                # Note: We pass Raw customer data. The Pipeline handles imputation and encoding;
+                # absent fields become NaN columns so it can fill them
+                input_df = pd.DataFrame.from_records(records, columns=self.feature_names)
+                if self.engine is not None:
+                    features = self.preprocessor.transform(input_df)[self.feature_names]
+                    proba = self.engine.predict_proba(features.to_numpy(np.float64))[:, 1]
+                else:
+                    proba = self.model.predict_proba(input_df)[:, 1]
+            proba = np.asarray(proba, dtype=float)
+            predictions = (proba >= self.threshold).astype(int)
+
+            return predictions, proba
+
         except Exception as e:
             raise ChurnException(e, sys)
@@ -1,3 +1,4 @@
+import argparse
 from src.config.configuration import ConfigurationManager
 from src.components.data_ingestion import DataIngestion
 from src.logger import logger
@@ -8,17 +9,21 @@ class DataIngestionTrainingPipeline:
     def __init__(self):
         pass
 
-    def main(self):
+    def main(self, full_refresh=None):
         config = ConfigurationManager()
         data_ingestion_config = config.get_data_ingestion_config()
         data_ingestion = DataIngestion(config=data_ingestion_config)
-        data_ingestion.initiate_data_ingestion()
+        data_ingestion.initiate_data_ingestion(full_refresh=full_refresh)
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=STAGE_NAME)
+    parser.add_argument("--full-refresh", action="store_true", default=None,
+                        help="re-export the whole collection instead of merging the changes since the last run")
+    args = parser.parse_args()
     try:
         logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<")
         obj = DataIngestionTrainingPipeline()
-        obj.main()
+        obj.main(full_refresh=args.full_refresh)
         logger.info(f">>>>>> stage {STAGE_NAME} completed <<<<<<\n\nx==========x")
     except Exception as e:
         logger.exception(e)
@@ -0,0 +1,25 @@
+from src.config.configuration import ConfigurationManager
+from src.components.model_tuner import ModelTuner
+from src.logger import logger
+
+STAGE_NAME = "Model Tuner stage"
+
+class ModelTunerTrainingPipeline:
+    def __init__(self):
+        pass
+
+    def main(self):
+        config = ConfigurationManager()
+        model_tuner_config = config.get_model_tuner_config()
+        model_tuner = ModelTuner(config=model_tuner_config)
+        model_tuner.tune()
+
+if __name__ == '__main__':
+    try:
+        logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<")
+        obj = ModelTunerTrainingPipeline()
+        obj.main()
+        logger.info(f">>>>>> stage {STAGE_NAME} completed <<<<<<\n\nx==========x")
+    except Exception as e:
+        logger.exception(e)
+        raise e
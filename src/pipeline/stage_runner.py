@@ -0,0 +1,237 @@
+import os
+import json
+import time
+import hashlib
+import resource
+import traceback
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from src.logger import logger
+from src.utils.common import read_yaml, get_file_hash
+from src.constants import DVC_FILE_PATH, PARAMS_FILE_PATH
+
+class StageRunner:
+    """
+    Runs pipeline stages, each in its own process, and skips those whose inputs did not change.
+
+    Deps, params and outs of each stage are read from dvc.yaml, so `python main.py`
+    and `dvc repro` agree on what a stage depends on. A stage's fingerprint is a
+    sha256 over its command, the content of every dep (data and code) and the
+    values of its params. It is stored with the hashes of the stage outputs in a
+    JSON manifest; a stage is up to date when its fingerprint matches and all of
+    its outputs are still there, unmodified. Stages marked `always_changed`
+    (e.g. ingestion from MongoDB) always run.
+
+    `run_all` executes a set of stages as a DAG: a stage waits for the stages
+    producing its deps, and stages that do not depend on each other run side by
+    side in a process pool.
+    """
+
+    def __init__(self, manifest_path, dvc_file=DVC_FILE_PATH, params_file=PARAMS_FILE_PATH, force=False):
+        self.manifest_path = Path(manifest_path)
+        self.stages = read_yaml(Path(dvc_file)).stages
+        self.params = read_yaml(Path(params_file))
+        self.force = force
+        self.timings = []
+        # Wall time of the last run_all, shorter than the summed stage times when stages overlap
+        self.elapsed = None
+        self.manifest = {}
+        if self.manifest_path.exists():
+            with open(self.manifest_path) as f:
+                self.manifest = json.load(f)
+
+    @staticmethod
+    def _path_hash(path):
+        """Content hash of a file, or of every file under a directory; None if it is missing."""
+        path = Path(path)
+        if path.is_file():
+            return get_file_hash(path)
+        if not path.is_dir():
+            return None
+        sha = hashlib.sha256()
+        for file_path in sorted(p for p in path.rglob("*") if p.is_file()):
+            sha.update(str(file_path.relative_to(path)).encode())
+            sha.update(get_file_hash(file_path).encode())
+        return sha.hexdigest()
+
+    @staticmethod
+    def _out_paths(stage):
+        # outs are plain paths or {path: {persist: ...}} entries
+        paths = []
+        for out in stage.get("outs", []):
+            paths.extend(out.keys() if isinstance(out, dict) else [out])
+        return paths
+
+    def dependencies(self, names):
+        """Maps each stage in `names` to the stages among `names` that produce one of its deps."""
+        producers = {path: name for name in names for path in self._out_paths(self.stages[name])}
+        upstream = {}
+        for name in names:
+            upstream[name] = set()
+            for dep in self.stages[name].get("deps", []):
+                for out, producer in producers.items():
+                    # A dep may be an output itself or a file inside an output directory
+                    if producer != name and (dep == out or Path(dep).is_relative_to(out)):
+                        upstream[name].add(producer)
+        return upstream
+
+    def _param_values(self, stage):
+        values = {}
+        for entry in stage.get("params", []):
+            keys = [entry] if isinstance(entry, str) else [key for keys in entry.values() for key in keys]
+            for key in keys:
+                value = self.params
+                for part in key.split("."):
+                    value = value[part]
+                values[key] = value.to_dict() if hasattr(value, "to_dict") else value
+        return values
+
+    def fingerprint(self, name):
+        """sha256 over the stage command, its deps' content and its params' values."""
+        stage = self.stages[name]
+        sha = hashlib.sha256(stage.cmd.encode())
+        for dep in sorted(stage.get("deps", [])):
+            sha.update(f"{dep}:{self._path_hash(dep)}".encode())
+        sha.update(json.dumps(self._param_values(stage), sort_keys=True, default=str).encode())
+        return sha.hexdigest()
+
+    def skip_reason(self, name, fingerprint):
+        """Returns why the stage can be skipped, or None if it has to run."""
+        stage = self.stages[name]
+        recorded = self.manifest.get(name)
+        if self.force or stage.get("always_changed", False) or recorded is None:
+            return None
+        if recorded["fingerprint"] != fingerprint:
+            return None
+        for path, digest in recorded["outs"].items():
+            if self._path_hash(path) != digest:
+                return None
+        return "inputs, params and outputs unchanged"
+
+    def _save_manifest(self):
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.manifest, f, indent=4)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _record_run(self, name, fingerprint):
+        self.manifest[name] = {
+            "fingerprint": fingerprint,
+            "outs": {path: self._path_hash(path) for path in self._out_paths(self.stages[name])},
+        }
+        self._save_manifest()
+
+    def _check_skip(self, name, stage_name):
+        """Returns (fingerprint, skipped); a skipped stage is logged and timed here."""
+        start = time.perf_counter()
+        fingerprint = self.fingerprint(name)
+        reason = self.skip_reason(name, fingerprint)
+        if reason is None:
+            return fingerprint, False
+        seconds = time.perf_counter() - start
+        logger.info(f">>>>>> stage {stage_name} skipped: {reason} ({seconds:.2f}s) <<<<<<")
+        self.timings.append((stage_name, "skipped", seconds, None))
+        return fingerprint, True
+
+    def _log_completed(self, stage_name, seconds, peak_mb):
+        logger.info(f">>>>>> stage {stage_name} completed in {seconds:.2f}s, peak memory {peak_mb:.0f} MiB "
+                    f"<<<<<<\n\nx==========x")
+        self.timings.append((stage_name, "ran", seconds, peak_mb))
+
+    def run_all(self, stages, jobs=1):
+        """Runs `stages` in dependency order, up to `jobs` of them at a time.
+
+        Each stage that has to run gets a fresh worker process, so its peak memory
+        is its own and a crash cannot take the others down. Whether a stage is up
+        to date is only decided once everything upstream of it has finished. On a
+        failure, no new stage is started, running ones are awaited and the error is
+        raised.
+
+        Args:
+            stages (list): (dvc.yaml stage, display name, callable) tuples; callables must be picklable
+            jobs (int): maximum number of stages running at once
+
+        Returns:
+            list: names of the stages that ran
+        """
+        start = time.perf_counter()
+        display = {name: stage_name for name, stage_name, _ in stages}
+        stage_fns = {name: stage_fn for name, _, stage_fn in stages}
+        upstream = self.dependencies(list(stage_fns))
+        pending, finished, ran = list(stage_fns), set(), []
+        running, error = {}, None
+
+        # spawn: a fresh interpreter per stage; max_tasks_per_child keeps peak memory per stage
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=jobs, mp_context=context, max_tasks_per_child=1) as pool:
+            while pending or running:
+                ready = [name for name in pending if upstream[name] <= finished] if error is None else []
+                for name in ready:
+                    pending.remove(name)
+                    fingerprint, skipped = self._check_skip(name, display[name])
+                    if skipped:
+                        finished.add(name)
+                        continue
+                    logger.info(f">>>>>> stage {display[name]} started <<<<<<")
+                    future = pool.submit(_run_stage_in_worker, stage_fns[name])
+                    running[future] = (name, fingerprint)
+                if ready and not running:
+                    # Everything ready was skipped: look again for newly ready stages
+                    continue
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, fingerprint = running.pop(future)
+                    try:
+                        seconds, peak_mb = future.result()
+                    except Exception as e:
+                        logger.error(f">>>>>> stage {display[name]} failed: {e}")
+                        error = error or e
+                        continue
+                    self._record_run(name, fingerprint)
+                    self._log_completed(display[name], seconds, peak_mb)
+                    finished.add(name)
+                    ran.append(name)
+
+        self.elapsed = time.perf_counter() - start
+        if error is not None:
+            raise error
+        if pending:
+            raise ValueError(f"Stages {pending} depend on each other in a cycle")
+        return ran
+
+    def summary(self):
+        """One line per stage: what happened, how long it took and its peak memory."""
+        lines = []
+        for stage_name, status, seconds, peak_mb in self.timings:
+            memory = f"{peak_mb:8.0f} MiB" if peak_mb is not None else ""
+            lines.append(f"{stage_name:<28} {status:<8} {seconds:8.2f}s {memory}".rstrip())
+        total = sum(seconds for _, _, seconds, _ in self.timings)
+        lines.append(f"{'Total':<28} {'':<8} {total:8.2f}s")
+        if self.elapsed is not None:
+            lines.append(f"{'Elapsed':<28} {'':<8} {self.elapsed:8.2f}s")
+        return "\n".join(lines)
+
+def _peak_memory_mb():
+    # High-water mark of this process or of its largest finished child, e.g. the tuner's
+    # pool workers, which do the stage's training (ru_maxrss is in KiB on Linux)
+    return max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) / 1024
+
+def _timed_stage(stage_fn):
+    """Runs `stage_fn`, returning (wall seconds, peak memory in MiB) of the process running it or its children."""
+    start = time.perf_counter()
+    stage_fn()
+    return time.perf_counter() - start, _peak_memory_mb()
+
+def _run_stage_in_worker(stage_fn):
+    try:
+        return _timed_stage(stage_fn)
+    except Exception as e:
+        # Re-raised as a plain error: ChurnException cannot be pickled back to the parent
+        logger.exception(e)
+        raise RuntimeError(f"{e}\n{traceback.format_exc()}") from None
@@ -0,0 +1,174 @@
+import os
+import shutil
+from pathlib import Path
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pyarrow.feather as feather
+from src.entity.schema import apply_schema
+
+# Tabular artifact formats handed between pipeline stages, keyed by file suffix
+ARTIFACT_FORMATS = {".csv": "csv", ".parquet": "parquet", ".feather": "feather"}
+
+def artifact_format(path) -> str:
+    """Returns "csv", "parquet" or "feather" from the file suffix of `path`."""
+    suffix = Path(path).suffix
+    if suffix not in ARTIFACT_FORMATS:
+        raise ValueError(f"Unsupported artifact format '{suffix}' for {path}, expected one of {list(ARTIFACT_FORMATS)}")
+    return ARTIFACT_FORMATS[suffix]
+
+def arrow_schema(dtypes: dict, dictionary=True) -> pa.Schema:
+    """Typed Arrow schema for a {column: pandas dtype} mapping; object columns hold strings.
+
+    Category columns are dictionary encoded, or plain strings with `dictionary=False`.
+    Nullable integer dtypes (e.g. "Int16") map to the Arrow integer of the same width.
+    """
+    fields = []
+    for column, dtype in dtypes.items():
+        dtype = pd.api.types.pandas_dtype(dtype)
+        if dtype == object:
+            fields.append(pa.field(column, pa.string()))
+        elif isinstance(dtype, pd.CategoricalDtype):
+            fields.append(pa.field(column, pa.dictionary(pa.int32(), pa.string()) if dictionary else pa.string()))
+        elif isinstance(dtype, pd.api.extensions.ExtensionDtype):
+            fields.append(pa.field(column, pa.from_numpy_dtype(dtype.numpy_dtype)))
+        else:
+            fields.append(pa.field(column, pa.from_numpy_dtype(dtype)))
+    return pa.schema(fields)
+
+def save_dataframe(df: pd.DataFrame, path, compression=None):
+    """Saves `df` (without its index) in the format given by the suffix of `path`.
+
+    Args:
+        compression (str, optional): parquet / feather codec, e.g. "zstd"; ignored for csv
+    """
+    fmt = artifact_format(path)
+    if fmt == "csv":
+        df.to_csv(path, index=False)
+    elif fmt == "parquet":
+        df.to_parquet(path, index=False, compression=compression)
+    else:
+        feather.write_feather(df.reset_index(drop=True), path, compression=compression or "uncompressed")
+
+def load_dataframe(path, columns=None, dtypes=None) -> pd.DataFrame:
+    """Loads an artifact saved by `save_dataframe` or `ChunkedWriter`.
+
+    Args:
+        columns (list, optional): only read these columns (pushed down to the reader)
+        dtypes (dict, optional): declared column dtypes, applied whatever the format stored
+    """
+    fmt = artifact_format(path)
+    if fmt == "csv":
+        df = pd.read_csv(path, usecols=columns)
+    elif fmt == "parquet":
+        df = pd.read_parquet(path, columns=columns)
+    else:
+        df = feather.read_feather(path, columns=columns)
+    return apply_schema(df, dtypes) if dtypes else df
+
+def iter_dataframe_chunks(path, chunksize, dtypes=None):
+    """Yields an artifact as DataFrames of at most `chunksize` rows, without loading it whole.
+
+    Args:
+        dtypes (dict, optional): declared column dtypes, applied to every chunk
+    """
+    for chunk in _iter_chunks(path, chunksize):
+        yield apply_schema(chunk, dtypes) if dtypes else chunk
+
+def _iter_chunks(path, chunksize):
+    fmt = artifact_format(path)
+    if fmt == "csv":
+        yield from pd.read_csv(path, chunksize=chunksize)
+    elif fmt == "parquet":
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        with pa.memory_map(str(path)) as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i)
+                for start in range(0, batch.num_rows, chunksize):
+                    yield batch.slice(start, chunksize).to_pandas()
+
+def link_artifact(source, link_path) -> str:
+    """Exposes `source` at `link_path` without writing the data again.
+
+    Uses a hardlink (same inode, no extra disk), falling back to a copy where the
+    filesystem does not support one. Any previous file at `link_path` is replaced.
+
+    Returns:
+        str: "hardlink" or "copy"
+    """
+    if os.path.lexists(link_path):
+        os.remove(link_path)
+    try:
+        os.link(source, link_path)
+        return "hardlink"
+    except OSError:
+        shutil.copyfile(source, link_path)
+        return "copy"
+
+class ChunkedWriter:
+    """
+    Writes one artifact incrementally from DataFrame chunks that share the same dtypes.
+
+    csv chunks are appended as text; parquet chunks become row groups and feather
+    chunks record batches, both under one typed schema: `arrow_schema(dtypes)` if
+    given, else the schema of the first chunk. Each chunk of a category column may
+    have its own categories; feather, which allows one dictionary per file, stores
+    them as strings, and the declared schema turns them back into categories on load.
+    """
+
+    def __init__(self, path, compression=None, dtypes=None):
+        self.path = path
+        self.format = artifact_format(path)
+        self.compression = compression
+        self.n_rows = 0
+        self._file = None
+        self._writer = None
+        self._schema = arrow_schema(dtypes, dictionary=self.format != "feather") if dtypes else None
+
+    def __enter__(self):
+        return self
+
+    def write(self, chunk: pd.DataFrame):
+        if self.format == "csv":
+            if self._file is None:
+                self._file = open(self.path, "w", newline="")
+                chunk.to_csv(self._file, header=True, index=False)
+            else:
+                chunk.to_csv(self._file, header=False, index=False)
+        else:
+            if self.format == "feather":
+                chunk = chunk.astype({col: object for col in chunk.columns
+                                      if isinstance(chunk[col].dtype, pd.CategoricalDtype)})
+            if self._schema is None:
+                self._schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+            table = pa.Table.from_pandas(chunk, schema=self._schema, preserve_index=False)
+            if self._writer is None:
+                # The first table's schema also carries the pandas dtypes (e.g. nullable ints)
+                self._schema = table.schema
+                if self.format == "parquet":
+                    self._writer = pq.ParquetWriter(self.path, self._schema, compression=self.compression or "none")
+                else:
+                    options = pa.ipc.IpcWriteOptions(compression=self.compression)
+                    self._writer = pa.ipc.new_file(self.path, self._schema, options=options)
+            self._writer.write_table(table)
+        self.n_rows += len(chunk)
+
+    def close(self, empty_frame=None):
+        """Finishes the file. `empty_frame` gives the layout if no chunk was ever written."""
+        if self._file is None and self._writer is None and empty_frame is not None:
+            self.write(empty_frame)
+        if self._file is not None:
+            self._file.close()
+        if self._writer is not None:
+            self._writer.close()
+        self._file = self._writer = None
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        if exc_type is not None and os.path.exists(self.path):
+            # Don't leave a truncated artifact behind
+            os.remove(self.path)
+        return False
@@ -1,4 +1,6 @@
 import os
+import math
+import hashlib
 from box.exceptions import BoxValueError
 import yaml
 from src.logger import logger
@@ -112,3 +114,50 @@ def get_size(path: Path) -> str:
     """
     size_in_kb = round(os.path.getsize(path)/1024)
     return f"~ {size_in_kb} KB"
+
+@ensure_annotations
+def get_file_hash(path: Path) -> str:
+    """sha256 of a file's content, read in 1 MB blocks
+
+    Args:
+        path (Path): path to the file
+
+    Returns:
+        str: hex digest
+    """
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+def get_cpu_quota() -> int:
+    """get the number of CPUs this process may use
+
+    Reads the cgroup CPU limit (v2 `cpu.max` or v1 `cpu.cfs_quota_us`), e.g. the
+    Kubernetes `resources.limits.cpu`, and falls back to the visible CPU count.
+
+    Returns:
+        int: CPU quota rounded up, at least 1
+    """
+    cpu_count = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    quota = None
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            limit, period = f.read().split()
+            if limit != "max":
+                quota = int(limit) / int(period)
+    except (OSError, ValueError):
+        try:
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+                limit = int(f.read())
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+                period = int(f.read())
+            if limit > 0:
+                quota = limit / period
+        except (OSError, ValueError):
+            pass
+
+    if quota is None:
+        return max(1, cpu_count or 1)
+    return max(1, min(math.ceil(quota), cpu_count or 1))
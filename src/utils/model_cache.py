@@ -0,0 +1,111 @@
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import mlflow
+from src.logger import logger
+
+class ModelCache:
+    """
+    Content-addressed on-disk cache of registry model artifacts.
+
+    Layout:
+        <root>/objects/<sha256>/   downloaded MLflow model directory
+        <root>/index.json          {"versions": {"<name>/<version>": "<sha256>"},
+                                    "aliases": {"<name>@<alias>": "<version>"}}
+
+    Identical artifacts are stored once; the index maps model name, version
+    and alias onto the stored objects so a pod can start without the registry.
+    """
+
+    def __init__(self, root_dir):
+        self.root_dir = root_dir
+        self.objects_dir = os.path.join(root_dir, "objects")
+        self.index_path = os.path.join(root_dir, "index.json")
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+    def _read_index(self):
+        if not os.path.exists(self.index_path):
+            return {"versions": {}, "aliases": {}}
+        with open(self.index_path) as f:
+            return json.load(f)
+
+    def _write_index(self, index):
+        # Write-then-rename so concurrent readers never see a half written index
+        fd, tmp_path = tempfile.mkstemp(dir=self.root_dir, suffix=".json")
+        with os.fdopen(fd, "w") as f:
+            json.dump(index, f, indent=4)
+        os.replace(tmp_path, self.index_path)
+
+    @staticmethod
+    def digest(path):
+        """sha256 over the relative paths and contents of every file under `path`."""
+        sha = hashlib.sha256()
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                file_path = os.path.join(dirpath, filename)
+                sha.update(os.path.relpath(file_path, path).encode())
+                with open(file_path, "rb") as f:
+                    for block in iter(lambda: f.read(1 << 20), b""):
+                        sha.update(block)
+        return sha.hexdigest()
+
+    def lookup(self, name, version=None, alias=None):
+        """Returns (version, local_path) for a cached model, or None.
+
+        Args:
+            name (str): registered model name
+            version (str, optional): exact version to look up
+            alias (str, optional): alias to resolve through the last known mapping
+        """
+        index = self._read_index()
+        if version is None:
+            version = index["aliases"].get(f"{name}@{alias}")
+            if version is None:
+                return None
+        digest = index["versions"].get(f"{name}/{version}")
+        if digest is None:
+            return None
+        path = os.path.join(self.objects_dir, digest)
+        if not os.path.isdir(path):
+            return None
+        return str(version), path
+
+    def store(self, name, version, source_dir, alias=None):
+        """Moves a downloaded model directory into the cache and indexes it. Returns the cached path."""
+        digest = self.digest(source_dir)
+        path = os.path.join(self.objects_dir, digest)
+        if os.path.isdir(path):
+            shutil.rmtree(source_dir, ignore_errors=True)
+        else:
+            shutil.move(source_dir, path)
+
+        index = self._read_index()
+        index["versions"][f"{name}/{version}"] = digest
+        if alias is not None:
+            index["aliases"][f"{name}@{alias}"] = str(version)
+        self._write_index(index)
+        logger.info(f"Cached model {name} version {version} at {path}")
+        return path
+
+    def fetch(self, name, version, alias=None):
+        """Returns the local path of `name/version`, downloading it from the registry on a miss."""
+        cached = self.lookup(name, version=version)
+        if cached is not None:
+            if alias is not None:
+                # Already have the artifact, only the alias mapping may be new
+                index = self._read_index()
+                index["aliases"][f"{name}@{alias}"] = str(version)
+                self._write_index(index)
+            return cached[1]
+
+        download_dir = tempfile.mkdtemp(dir=self.root_dir)
+        try:
+            local_path = mlflow.artifacts.download_artifacts(
+                artifact_uri=f"models:/{name}/{version}", dst_path=download_dir
+            )
+            return self.store(name, version, local_path, alias=alias)
+        finally:
+            shutil.rmtree(download_dir, ignore_errors=True)
@@ -0,0 +1,60 @@
+import os
+import shutil
+import tempfile
+import joblib
+from src.utils.tree_engine import CompiledTreeEnsemble
+from src.logger import logger
+
+class SharedModelStore:
+    """
+    Read-only, memory-mappable export of serving models for multi-worker serving.
+
+    Layout:
+        <root>/<name>/<version>/preprocessor.joblib   fitted FeaturePreprocessor
+        <root>/<name>/<version>/engine/               CompiledTreeEnsemble.save_arrays
+
+    The first process to load a version exports it; every worker then maps the
+    same files read-only, so the tree arrays live once in the page cache no
+    matter how many workers serve them.
+    """
+
+    def __init__(self, root_dir):
+        self.root_dir = root_dir
+        os.makedirs(root_dir, exist_ok=True)
+
+    def path(self, name, version):
+        return os.path.join(self.root_dir, name, str(version))
+
+    def exists(self, name, version):
+        return os.path.isdir(self.path(name, version))
+
+    def export(self, name, version, preprocessor, engine):
+        """Writes `name/version` atomically; a concurrent export of the same version is harmless."""
+        target = self.path(name, version)
+        if os.path.isdir(target):
+            return target
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+
+        # Build next to the target, then rename: workers never see a partial export
+        tmp_dir = tempfile.mkdtemp(dir=os.path.dirname(target))
+        try:
+            joblib.dump(preprocessor, os.path.join(tmp_dir, "preprocessor.joblib"))
+            engine.save_arrays(os.path.join(tmp_dir, "engine"))
+            os.rename(tmp_dir, target)
+            logger.info(f"Exported shared model {name} version {version} to {target}")
+        except OSError:
+            # Another worker won the race
+            if not os.path.isdir(target):
+                raise
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        return target
+
+    def load(self, name, version):
+        """Returns (preprocessor, engine) with the engine arrays memory-mapped, or None if not exported."""
+        if not self.exists(name, version):
+            return None
+        path = self.path(name, version)
+        preprocessor = joblib.load(os.path.join(path, "preprocessor.joblib"))
+        engine = CompiledTreeEnsemble.load_arrays(os.path.join(path, "engine"), mmap_mode="r")
+        return preprocessor, engine
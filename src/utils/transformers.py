@@ -2,37 +2,236 @@ from sklearn.base import BaseEstimator, TransformerMixin
 from sklearn.preprocessing import LabelEncoder
 import pandas as pd
 import numpy as np
+from src.entity.schema import is_label_column, fill_label_column, code_dtype
 
 class FeaturePreprocessor(BaseEstimator, TransformerMixin):
-    def __init__(self):
+    def __init__(self, unknown_value=0, missing_label="Unknown", median_precision=6):
         self.encoders = {}
         self.columns_to_encode = [] # Detected automatically or can be passed
+        # Code assigned to labels never seen during fit.
+        # Defaults to 0 to stay compatible with previously trained models.
+        self.unknown_value = unknown_value
+        # Missing labels are encoded as this label, missing numbers as the training median
+        self.missing_label = missing_label
+        # Decimals numeric values are rounded to when `partial_fit` counts them for the median
+        self.median_precision = median_precision
+
+    def _fill_value(self, series, median):
+        """Value a missing entry of a fitted column is imputed with; integer columns get a rounded median."""
+        if is_label_column(series):
+            return self.missing_label
+        if pd.isna(median):
+            # Never observed: nothing to impute with, the model's own NaN handling applies
+            return None
+        return int(round(median)) if pd.api.types.is_integer_dtype(series.dtype) else float(median)
 
     def fit(self, X, y=None):
         # Identify columns to encode
         # In a real scenario, you might want to pass these explicitly or detect 'object' types
         # Here we re-detect as we did in analysis
         if isinstance(X, pd.DataFrame):
-            self.columns_to_encode = [col for col in X.columns if X[col].dtype == 'object']
-        
+            self.columns_to_encode = [col for col in X.columns if is_label_column(X[col])]
+            # Training column order and dtypes, used by the NumPy fast path (see `to_matrix`)
+            self.feature_dtypes_ = {col: str(X[col].dtype) for col in X.columns}
+            # Imputation is fitted state, so serving fills missing fields exactly like training did
+            self.fill_values_ = {}
+            for col in X.columns:
+                median = None if is_label_column(X[col]) else X[col].median()
+                self.fill_values_[col] = self._fill_value(X[col], median)
+
         for col in self.columns_to_encode:
             le = LabelEncoder()
-            # Handle potential NaNs for encoding by filling with a placeholder temporarily or ensuring clean data
-            # Assuming clean data or handled by previous steps, but let's be safe
-            self.encoders[col] = le.fit(X[col].astype(str))
-            
+            values = X[col]
+            if col in getattr(self, "fill_values_", {}):
+                values = fill_label_column(values, self.missing_label)
+            self.encoders[col] = le.fit(values.astype(str))
+
+        return self
+
+    def partial_fit(self, X, y=None):
+        """Fits on one chunk at a time; after all chunks, same encoders as `fit` on their concatenation.
+
+        Columns and dtypes are taken from the first chunk, and each encoder's labels
+        are the union of the labels seen so far. Medians come from merged per-chunk
+        value counts, with values rounded to `median_precision` decimals: exact for
+        integers and for values with fewer decimals, and bounded by the number of
+        distinct values rather than the number of rows.
+        """
+        if not hasattr(self, "vocabularies_"):
+            self.columns_to_encode = [col for col in X.columns if is_label_column(X[col])]
+            self.feature_dtypes_ = {col: str(X[col].dtype) for col in X.columns}
+            self.vocabularies_ = {col: set() for col in self.columns_to_encode}
+            self.value_counts_ = {col: pd.Series(dtype=np.float64) for col in X.columns
+                                  if col not in self.vocabularies_}
+            self.fill_values_ = {}
+
+        for col, counts in self.value_counts_.items():
+            chunk_counts = X[col].dropna().astype(np.float64).round(self.median_precision).value_counts()
+            self.value_counts_[col] = counts.add(chunk_counts, fill_value=0)
+            median = self.median_from_counts(self.value_counts_[col]) if len(self.value_counts_[col]) else None
+            self.fill_values_[col] = self._fill_value(X[col], median)
+
+        for col in self.columns_to_encode:
+            self.fill_values_[col] = self.missing_label
+            X_col = fill_label_column(X[col], self.missing_label)
+            vocabulary = self.vocabularies_[col]
+            size = len(vocabulary)
+            vocabulary.update(X_col.astype(str).unique())
+            if size != len(vocabulary) or col not in self.encoders:
+                self.encoders[col] = LabelEncoder().fit(sorted(vocabulary))
+                # Codes changed; drop the lookups built from the old labels
+                for cache in ("_category_indexes", "_category_dicts"):
+                    getattr(self, cache, {}).pop(col, None)
         return self
 
+    @staticmethod
+    def median_from_counts(counts):
+        """Median of the values in a {value: count} Series, averaging the two middle values like pandas."""
+        counts = counts.sort_index()
+        values, cumulative = counts.index.to_numpy(), counts.to_numpy().cumsum()
+        total = cumulative[-1]
+        lower = values[np.searchsorted(cumulative, (total - 1) // 2, side="right")]
+        upper = values[np.searchsorted(cumulative, total // 2, side="right")]
+        return float((lower + upper) / 2)
+
+    def _category_index(self, col):
+        """Returns the pd.Index of known labels for `col` (built once, then cached).
+
+        LabelEncoder.classes_ is sorted, so the position of a label in the index
+        is exactly the code LabelEncoder.transform would return for it.
+        """
+        # Older pickles predate the cache, so create it lazily
+        if not hasattr(self, "_category_indexes"):
+            self._category_indexes = {}
+        index = self._category_indexes.get(col)
+        if index is None:
+            index = pd.Index(self.encoders[col].classes_)
+            self._category_indexes[col] = index
+        return index
+
+    def encode_column(self, values, col):
+        """Vectorized label encoding of a single column.
+
+        Args:
+            values: array-like of raw labels
+            col (str): name of the fitted column
+
+        Returns:
+            np.ndarray: int64 codes, missing labels mapped to the code of `missing_label`
+            and unseen labels to `unknown_value`
+        """
+        labels = pd.Series(values, copy=False)
+        codes = self._category_index(col).get_indexer(labels.astype(str)).astype(np.int64)
+        unknown = np.flatnonzero(codes == -1)
+        codes[unknown] = getattr(self, "unknown_value", 0)
+        if len(unknown) and col in getattr(self, "fill_values_", {}):
+            # Missing labels only show up among the unknown ones; checking those alone keeps
+            # known labels at one hash lookup. Older pickles have no fill values: their
+            # missing labels stay unseen labels.
+            codes[unknown[labels.iloc[unknown].isna().to_numpy()]] = self._missing_code(col)
+        return codes
+
+    def code_dtype(self, col):
+        """Integer dtype of the codes of `col`: sized for its labels and for `unknown_value`."""
+        return code_dtype(len(self.encoders[col].classes_), getattr(self, "unknown_value", 0))
+
+    def _missing_code(self, col):
+        """Code of the missing label for `col`, or `unknown_value` if training had no missing labels."""
+        return self._category_codes(col).get(self.fill_values_[col], getattr(self, "unknown_value", 0))
+
+    def _category_codes(self, col):
+        """Returns a plain {label: code} dict for `col`; faster than an Index for a handful of rows."""
+        if not hasattr(self, "_category_dicts"):
+            self._category_dicts = {}
+        mapping = self._category_dicts.get(col)
+        if mapping is None:
+            mapping = {label: code for code, label in enumerate(self.encoders[col].classes_)}
+            self._category_dicts[col] = mapping
+        return mapping
+
+    def get_feature_schema(self, feature_names):
+        """Describes the model input matrix: column order, training dtype and encoding.
+
+        Args:
+            feature_names (list): model feature order (e.g. LGBMClassifier.feature_name_)
+
+        Returns:
+            dict: JSON-serializable schema
+        """
+        dtypes = getattr(self, "feature_dtypes_", None)
+        if dtypes is None:
+            raise ValueError("Preprocessor was fitted without a DataFrame; no feature schema recorded.")
+
+        features = []
+        for name in feature_names:
+            if name not in dtypes:
+                raise ValueError(f"Feature '{name}' was not seen when fitting the preprocessor.")
+            feature = {"name": name, "dtype": dtypes[name], "encoded": name in self.encoders}
+            if feature["encoded"]:
+                feature["categories"] = [str(c) for c in self.encoders[name].classes_]
+            features.append(feature)
+
+        return {
+            "features": features,
+            "fill_values": {name: getattr(self, "fill_values_", {}).get(name) for name in feature_names},
+            "matrix_dtype": "float64",
+            "unknown_value": getattr(self, "unknown_value", 0)
+        }
+
+    def to_matrix(self, records, feature_names):
+        """Encodes raw records straight into a float64 matrix, without building a DataFrame.
+
+        Produces the same values as `transform(pd.DataFrame(records))[feature_names]`.
+
+        Args:
+            records (list): list of dicts with raw (unencoded) feature values
+            feature_names (list): column order of the output matrix
+
+        Returns:
+            np.ndarray: array of shape (len(records), len(feature_names))
+        """
+        unknown_value = getattr(self, "unknown_value", 0)
+        fill_values = getattr(self, "fill_values_", {})
+        matrix = np.empty((len(records), len(feature_names)), dtype=np.float64)
+        for j, name in enumerate(feature_names):
+            # Absent fields and None are missing
+            values = [record.get(name) for record in records]
+            if name in self.encoders:
+                mapping = self._category_codes(name)
+                matrix[:, j] = [mapping.get(str(v), unknown_value) for v in values]
+                if name in fill_values:
+                    matrix[[v is None or v != v for v in values], j] = self._missing_code(name)
+            else:
+                column = np.asarray(values, dtype=np.float64)
+                if fill_values.get(name) is not None:
+                    column[np.isnan(column)] = fill_values[name]
+                matrix[:, j] = column
+        return matrix
+
     def transform(self, X):
         X_copy = X.copy()
-        for col, le in self.encoders.items():
+        # Impute numeric columns with their training medians; labels are handled by the encoding
+        for col, value in getattr(self, "fill_values_", {}).items():
+            if col in X_copy.columns and col not in self.encoders and value is not None and X_copy[col].hasnans:
+                X_copy[col] = X_copy[col].fillna(value)
+        for col in self.encoders:
             if col in X_copy.columns:
-                # Handle unseen labels: Map to a default or special token if possible
-                # LabelEncoder doesn't handle unseen labels well natively.
-                # Production trick: map 'new' -> 0 or 'unknown'
-                
-                # Using a safe transformation approach
-                X_copy[col] = X_copy[col].astype(str).map(
-                    lambda s: le.transform([s])[0] if s in le.classes_ else 0 # defaulting to 0 might be dangerous if 0 is a valid class, but acceptable for this MVP
-                )
+                # One hash lookup per column instead of one LabelEncoder call per cell.
+                # Unseen labels get `unknown_value` (0 by default, which is a valid class,
+                # but acceptable for this MVP and matches older models).
+                # Codes are stored in the smallest integer dtype that holds them.
+                codes = self.encode_column(X_copy[col], col)
+                X_copy[col] = codes.astype(self.code_dtype(col))
         return X_copy
+
+    def __getstate__(self):
+        # The lookup caches are derived from `encoders`; don't pickle them.
+        # BaseEstimator returns the live __dict__: pop from a copy, not from this object
+        state = dict(super().__getstate__())
+        state.pop("_category_indexes", None)
+        state.pop("_category_dicts", None)
+        # Per-value counts can be as large as the data; fill_values_ holds what serving needs.
+        # partial_fit on a restored preprocessor starts over.
+        state.pop("vocabularies_", None)
+        state.pop("value_counts_", None)
+        return state
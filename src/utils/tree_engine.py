@@ -0,0 +1,207 @@
+import os
+import json
+import numpy as np
+
+# LightGBM missing_type encoding (see LightGBM's tree.h)
+MISSING_NONE, MISSING_ZERO, MISSING_NAN = 0, 1, 2
+_MISSING_TYPES = {"None": MISSING_NONE, "Zero": MISSING_ZERO, "NaN": MISSING_NAN}
+_ZERO_THRESHOLD = 1e-35
+
+class CompiledTreeEnsemble:
+    """
+    Flattened, NumPy-only representation of a binary LightGBM booster.
+
+    Every node of every tree lives in a set of parallel arrays (array-of-nodes,
+    leaves have feature -1). All (row, tree) pairs are advanced one level at a
+    time with vectorized gathers; pairs are summed and dropped as they reach a
+    leaf. No Python per-node or per-row work, and no pandas.
+    """
+
+    ARRAY_FIELDS = [
+        "feature", "threshold", "children", "default_left", "missing_type",
+        "cat_row", "cat_table", "value", "roots"
+    ]
+
+    def __init__(self, feature_names, sigmoid, **arrays):
+        self.feature_names = list(feature_names)
+        self.sigmoid = float(sigmoid)
+        for field in self.ARRAY_FIELDS:
+            setattr(self, field, arrays[field])
+        # Skip the missing-value / categorical decision logic when the model never needs it
+        self._has_zero_missing = bool((self.missing_type == MISSING_ZERO).any())
+        self._has_categorical = bool((self.cat_row >= 0).any())
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @classmethod
+    def from_booster(cls, booster):
+        """Compiles a trained lightgbm.Booster (e.g. LGBMClassifier.booster_)."""
+        dump = booster.dump_model()
+        objective = dump.get("objective", "")
+        if not objective.startswith("binary") or dump["num_tree_per_iteration"] != 1:
+            raise ValueError(f"Only binary LightGBM models can be compiled, got '{objective}'")
+        sigmoid = 1.0
+        for token in objective.split():
+            if token.startswith("sigmoid:"):
+                sigmoid = float(token.split(":")[1])
+
+        nodes = {field: [] for field in ["feature", "threshold", "left", "right", "default_left",
+                                         "missing_type", "cat_row", "value"]}
+        cat_sets = []
+        roots = []
+
+        def add_node(tree_node):
+            idx = len(nodes["feature"])
+            for field in nodes:
+                nodes[field].append(0)
+
+            if "leaf_value" in tree_node:
+                nodes["feature"][idx] = -1
+                nodes["left"][idx] = nodes["right"][idx] = idx
+                nodes["threshold"][idx] = np.inf
+                nodes["cat_row"][idx] = -1
+                nodes["value"][idx] = tree_node["leaf_value"]
+                return idx
+
+            nodes["feature"][idx] = tree_node["split_feature"]
+            nodes["default_left"][idx] = tree_node["default_left"]
+            nodes["missing_type"][idx] = _MISSING_TYPES[tree_node["missing_type"]]
+            if tree_node["decision_type"] == "==":
+                # Categorical split: the listed categories go left
+                nodes["threshold"][idx] = np.nan
+                nodes["cat_row"][idx] = len(cat_sets)
+                cat_sets.append([int(c) for c in str(tree_node["threshold"]).split("||")])
+            else:
+                nodes["threshold"][idx] = tree_node["threshold"]
+                nodes["cat_row"][idx] = -1
+
+            nodes["left"][idx] = add_node(tree_node["left_child"])
+            nodes["right"][idx] = add_node(tree_node["right_child"])
+            return idx
+
+        for tree in dump["tree_info"]:
+            roots.append(add_node(tree["tree_structure"]))
+
+        n_cats = max((max(c) for c in cat_sets), default=-1) + 1
+        cat_table = np.zeros((len(cat_sets), max(n_cats, 1)), dtype=bool)
+        for row, categories in enumerate(cat_sets):
+            cat_table[row, categories] = True
+
+        return cls(
+            feature_names=dump["feature_names"],
+            sigmoid=sigmoid,
+            feature=np.asarray(nodes["feature"], dtype=np.int32),
+            threshold=np.asarray(nodes["threshold"], dtype=np.float64),
+            children=np.column_stack([nodes["left"], nodes["right"]]).astype(np.int32).ravel(),
+            default_left=np.asarray(nodes["default_left"], dtype=bool),
+            missing_type=np.asarray(nodes["missing_type"], dtype=np.int8),
+            cat_row=np.asarray(nodes["cat_row"], dtype=np.int32),
+            cat_table=cat_table,
+            value=np.asarray(nodes["value"], dtype=np.float64),
+            roots=np.asarray(roots, dtype=np.int32),
+        )
+
+    def _go_left(self, node, fval, has_nan):
+        """Vectorized version of LightGBM's NumericalDecision / CategoricalDecision."""
+        # NaN compares False, so it falls right unless a missing-value rule below applies
+        go_left = fval <= self.threshold[node]
+
+        if has_nan or self._has_zero_missing:
+            missing_type = self.missing_type[node]
+            is_nan = np.isnan(fval)
+            # Without a NaN rule, LightGBM treats NaN as 0.0
+            num_val = np.where(is_nan & (missing_type != MISSING_NAN), 0.0, fval)
+            use_default = ((missing_type == MISSING_ZERO) & (np.abs(num_val) <= _ZERO_THRESHOLD)) | \
+                          ((missing_type == MISSING_NAN) & is_nan)
+            go_left = np.where(use_default, self.default_left[node], num_val <= self.threshold[node])
+
+        if self._has_categorical:
+            cat_row = self.cat_row[node]
+            is_cat = cat_row >= 0
+            if is_cat.any():
+                # Categorical splits: NaN / negative / unseen categories go right
+                cat_val = np.nan_to_num(fval[is_cat], nan=-1).astype(np.int64)
+                rows = cat_row[is_cat]
+                in_range = (cat_val >= 0) & (cat_val < self.cat_table.shape[1])
+                cat_left = np.zeros(len(cat_val), dtype=bool)
+                cat_left[in_range] = self.cat_table[rows[in_range], cat_val[in_range]]
+                go_left[is_cat] = cat_left
+        return go_left
+
+    def predict_raw(self, X):
+        """Returns the raw (log-odds) score for each row of a 2-D array in `feature_names` order."""
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != len(self.feature_names):
+            raise ValueError(f"Expected a 2-D array with {len(self.feature_names)} features, got shape {X.shape}")
+        n_rows, n_features = X.shape
+        flat_X = X.ravel()
+        has_nan = bool(np.isnan(flat_X).any())
+
+        # One (row, tree) pair per element; pairs that reach a leaf are summed and dropped
+        row = np.repeat(np.arange(n_rows, dtype=np.int32), self.n_trees)
+        node = np.tile(self.roots, n_rows)
+        raw = np.zeros(n_rows, dtype=np.float64)
+
+        feature = self.feature[node]
+        offset = row * n_features
+
+        while len(node):
+            fval = flat_X[offset + feature]
+            # children[2 * node] is the left child, children[2 * node + 1] the right one
+            node = self.children[2 * node + ~self._go_left(node, fval, has_nan)]
+
+            feature = self.feature[node]
+            at_leaf = feature < 0
+            n_leaf = np.count_nonzero(at_leaf)
+            if n_leaf:
+                raw += np.bincount(row[at_leaf], weights=self.value[node[at_leaf]], minlength=n_rows)
+                if n_leaf == len(node):
+                    break
+                active = ~at_leaf
+                row, node, feature, offset = row[active], node[active], feature[active], offset[active]
+        return raw
+
+    def predict_proba(self, X):
+        """Returns class probabilities shaped like LGBMClassifier.predict_proba: (n_rows, 2)."""
+        proba = 1.0 / (1.0 + np.exp(-self.sigmoid * self.predict_raw(X)))
+        return np.column_stack([1.0 - proba, proba])
+
+    def save(self, path):
+        """Saves the compiled arrays (uncompressed .npz)."""
+        np.savez(
+            path,
+            feature_names=np.asarray(self.feature_names),
+            sigmoid=np.float64(self.sigmoid),
+            **{field: getattr(self, field) for field in self.ARRAY_FIELDS}
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(
+                feature_names=data["feature_names"].tolist(),
+                sigmoid=float(data["sigmoid"]),
+                **{field: data[field] for field in cls.ARRAY_FIELDS}
+            )
+
+    def save_arrays(self, directory):
+        """Saves one .npy file per array, so the model can be memory-mapped with `load_arrays`."""
+        os.makedirs(directory, exist_ok=True)
+        for field in self.ARRAY_FIELDS:
+            np.save(os.path.join(directory, f"{field}.npy"), np.ascontiguousarray(getattr(self, field)))
+        with open(os.path.join(directory, "meta.json"), "w") as f:
+            json.dump({"feature_names": self.feature_names, "sigmoid": self.sigmoid}, f)
+
+    @classmethod
+    def load_arrays(cls, directory, mmap_mode="r"):
+        """Loads a `save_arrays` directory; with mmap_mode="r" processes share the pages read-only."""
+        with open(os.path.join(directory, "meta.json")) as f:
+            meta = json.load(f)
+        return cls(
+            feature_names=meta["feature_names"],
+            sigmoid=meta["sigmoid"],
+            **{field: np.load(os.path.join(directory, f"{field}.npy"), mmap_mode=mmap_mode)
+               for field in cls.ARRAY_FIELDS}
+        )
@@ -0,0 +1,63 @@
+import asyncio
+import unittest
+from app.batching import MicroBatcher
+from app.executor import QueueFullError
+
+class TestMicroBatcher(unittest.TestCase):
+
+    def run_requests(self, batcher, n_requests):
+        async def scenario():
+            await batcher.start()
+            try:
+                return await asyncio.gather(*(batcher.submit({"x": i}) for i in range(n_requests)))
+            finally:
+                await batcher.stop()
+        return asyncio.run(scenario())
+
+    def test_concurrent_requests_are_merged(self):
+        batch_sizes = []
+
+        async def predict_batch(records):
+            batch_sizes.append(len(records))
+            return [(r["x"] % 2, r["x"] / 100) for r in records]
+
+        batcher = MicroBatcher(predict_batch, max_batch_size=8, max_wait_ms=50)
+        results = self.run_requests(batcher, 20)
+
+        # Every caller gets its own row back, in order
+        self.assertEqual(results, [(i % 2, i / 100) for i in range(20)])
+        self.assertEqual(sum(batch_sizes), 20)
+        self.assertLessEqual(max(batch_sizes), 8)
+        self.assertLess(len(batch_sizes), 20)
+
+    def test_errors_are_propagated_to_callers(self):
+        async def predict_batch(records):
+            raise RuntimeError("model exploded")
+
+        batcher = MicroBatcher(predict_batch, max_batch_size=4, max_wait_ms=1)
+        with self.assertRaises(RuntimeError):
+            self.run_requests(batcher, 3)
+
+    def test_requests_beyond_max_pending_are_rejected(self):
+        async def predict_batch(records):
+            await asyncio.sleep(0.05)
+            return [r["x"] for r in records]
+
+        batcher = MicroBatcher(predict_batch, max_batch_size=1, max_wait_ms=1, max_pending=2)
+
+        async def scenario():
+            await batcher.start()
+            try:
+                return await asyncio.gather(
+                    *(batcher.submit({"x": i}) for i in range(6)), return_exceptions=True
+                )
+            finally:
+                await batcher.stop()
+
+        results = asyncio.run(scenario())
+        rejected = [r for r in results if isinstance(r, QueueFullError)]
+        self.assertTrue(rejected)
+        self.assertEqual([r for r in results if not isinstance(r, Exception)], [0, 1])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+from scripts.benchmark_inference import compare_to_baseline, summarize
+
+def results(*cases):
+    return {"results": [summarize(target, rows, [seconds] * 10) for target, rows, seconds in cases]}
+
+class TestRegressionGate(unittest.TestCase):
+
+    def test_only_slowdowns_beyond_the_threshold_regress(self):
+        baseline = results(("pipeline", 1, 0.001), ("pipeline", 100, 0.010), ("endpoint", 1, 0.005))
+        current = results(("pipeline", 1, 0.0012), ("pipeline", 100, 0.014), ("transform", 1, 1.0))
+        regressions = compare_to_baseline(current, baseline, max_regression=0.25, metrics=["p50_ms", "p95_ms"])
+        # 20% slower passes, 40% slower fails, cases missing on either side are ignored
+        self.assertEqual({(r["target"], r["rows"]) for r in regressions}, {("pipeline", 100)})
+        self.assertEqual({r["metric"] for r in regressions}, {"p50_ms", "p95_ms"})
+        self.assertAlmostEqual(regressions[0]["ratio"], 1.4)
+
+    def test_sub_threshold_jitter_is_ignored(self):
+        baseline, current = results(("pipeline", 1, 0.0001)), results(("pipeline", 1, 0.00015))
+        self.assertEqual(compare_to_baseline(current, baseline, max_regression=0.25), [])
+        self.assertEqual(len(compare_to_baseline(current, baseline, max_regression=0.25, min_delta_ms=0.01)), 1)
+
+    def test_summary(self):
+        summary = summarize("transform", 100, [0.001] * 99 + [0.101])
+        self.assertEqual(summary["iterations"], 100)
+        self.assertAlmostEqual(summary["p50_ms"], 1.0)
+        self.assertGreater(summary["p99_ms"], summary["p95_ms"])
+        self.assertAlmostEqual(summary["rows_per_sec"], 100 * 100 / 0.2)
+
+if __name__ == "__main__":
+    unittest.main()
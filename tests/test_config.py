@@ -0,0 +1,41 @@
+import unittest
+import yaml
+from src.config.configuration import ConfigurationManager
+from src.utils.artifacts import artifact_format
+
+class TestArtifactConfig(unittest.TestCase):
+
+    def test_stage_configs_use_the_artifact_format(self):
+        manager = ConfigurationManager()
+        # Each getter validates its dataset paths against artifact_format
+        manager.get_data_ingestion_config()
+        manager.get_data_transformation_config()
+        manager.get_model_tuner_config()
+        manager.get_model_trainer_config()
+        manager.get_model_evaluation_config()
+
+    def test_dvc_stages_match_config_paths(self):
+        manager = ConfigurationManager()
+        with open("dvc.yaml") as f:
+            dvc_paths = set()
+            for stage in yaml.safe_load(f)["stages"].values():
+                for entry in stage.get("deps", []) + stage.get("outs", []):
+                    dvc_paths.update(entry if isinstance(entry, dict) else [entry])
+
+        config = manager.config
+        dataset_paths = [
+            config.data_ingestion.data_file_path,
+            config.data_transformation.data_path,
+            config.data_transformation.transformed_train_path,
+            config.data_transformation.transformed_test_path,
+            config.model_tuner.train_data_path,
+            config.model_trainer.train_data_path,
+            config.model_trainer.test_data_path,
+            config.model_evaluation.test_data_path,
+        ]
+        for path in dataset_paths:
+            self.assertEqual(artifact_format(path), config.artifact_format)
+            self.assertIn(path, dvc_paths)
+
+if __name__ == "__main__":
+    unittest.main()
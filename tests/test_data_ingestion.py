@@ -0,0 +1,138 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from dataclasses import replace
+import mongomock
+import numpy as np
+import pandas as pd
+from src.components.data_ingestion import DataIngestion
+from src.connection.mongodb_client import MongoDBClient
+from src.constants import DATABASE_NAME, COLLECTION_NAME
+from src.entity.config_entity import DataIngestionConfig
+from src.utils.artifacts import load_dataframe
+from src.utils.common import load_json, get_file_hash
+
+class TestDataIngestion(unittest.TestCase):
+
+    def setUp(self):
+        # Local stand-in for MongoDB; MongoDBClient reuses a class level client
+        self.previous_client = MongoDBClient.client
+        MongoDBClient.client = mongomock.MongoClient()
+        self.df = pd.read_csv("customer_churn_dataset/customer_churn_dataset.csv", nrows=1234)
+        records = self.df.astype(object).where(self.df.notna(), "na").to_dict(orient="records")
+        for record in records:
+            record["internal_note"] = "not projected"
+        self.collection = MongoDBClient.client[DATABASE_NAME][COLLECTION_NAME]
+        self.collection.insert_many(records)
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config = DataIngestionConfig(
+            root_dir=self.tmp.name,
+            data_file_path=os.path.join(self.tmp.name, "churn_data.parquet"),
+            raw_data_path=os.path.join(self.tmp.name, "raw_data.parquet"),
+            watermark_path=os.path.join(self.tmp.name, "watermark.json"),
+            manifest_path=os.path.join(self.tmp.name, "manifest.json"),
+            batch_size=100,
+            columns=list(self.df.columns),
+            dtypes={col: str(dtype) for col, dtype in self.df.dtypes.items()},
+            compression="zstd",
+            incremental=True,
+            full_refresh=False,
+            watermark_field="_id",
+            key_column="customer_id"
+        )
+
+    def tearDown(self):
+        MongoDBClient.client = self.previous_client
+        self.tmp.cleanup()
+
+    def test_chunks_are_bounded_and_projected(self):
+        chunks = list(DataIngestion(self.config).iter_collection_chunks())
+
+        self.assertEqual(len(chunks), 13)
+        self.assertTrue(all(len(chunk) <= 100 for chunk in chunks))
+        for chunk in chunks:
+            self.assertEqual(list(chunk.columns), list(self.df.columns))
+
+    def test_streamed_artifact_matches_collection(self):
+        for suffix in [".parquet", ".feather", ".csv"]:
+            config = replace(
+                self.config,
+                data_file_path=os.path.join(self.tmp.name, f"churn_data{suffix}"),
+                raw_data_path=os.path.join(self.tmp.name, f"raw_data{suffix}")
+            )
+            DataIngestion(config).initiate_data_ingestion()
+
+            for path in [config.raw_data_path, config.data_file_path]:
+                df = load_dataframe(path)
+                self.assertEqual(dict(df.dtypes), dict(self.df.dtypes))
+                # Arrow formats give None for missing strings, csv gives NaN
+                pd.testing.assert_frame_equal(df.where(df.notna(), np.nan), self.df)
+
+    def test_dataset_is_written_once_and_hashed(self):
+        DataIngestion(self.config).initiate_data_ingestion()
+
+        # The raw path is the same file, not a second copy
+        self.assertTrue(os.path.samefile(self.config.raw_data_path, self.config.data_file_path))
+        manifest = load_json(Path(self.config.manifest_path))
+        self.assertEqual(manifest.sha256, get_file_hash(Path(self.config.data_file_path)))
+        self.assertEqual(manifest.rows, len(self.df))
+
+    def test_incremental_run_merges_only_new_documents(self):
+        DataIngestion(self.config).initiate_data_ingestion()
+
+        # One returning customer with changed data, one new customer
+        changed = self.df.iloc[[5]].astype(object).where(self.df.iloc[[5]].notna(), "na").to_dict(orient="records")[0]
+        changed["support_calls"] = 9
+        new = dict(changed, customer_id=99999)
+        self.collection.insert_many([changed, new])
+
+        ingestion = DataIngestion(self.config)
+        ingestion.initiate_data_ingestion()
+        merged = load_dataframe(self.config.data_file_path)
+
+        self.assertEqual(len(merged), len(self.df) + 1)
+        self.assertTrue(merged["customer_id"].is_unique)
+        self.assertEqual(merged.set_index("customer_id").loc[changed["customer_id"], "support_calls"], 9)
+        self.assertEqual(ingestion.read_watermark(), ingestion.last_watermark)
+
+        # Nothing new: the artifact is left untouched
+        mtime = os.path.getmtime(self.config.data_file_path)
+        DataIngestion(self.config).initiate_data_ingestion()
+        self.assertEqual(os.path.getmtime(self.config.data_file_path), mtime)
+
+    def test_full_refresh_rebuilds_from_the_collection(self):
+        DataIngestion(self.config).initiate_data_ingestion()
+        self.collection.delete_many({"customer_id": {"$lte": 10}})
+
+        DataIngestion(self.config).initiate_data_ingestion(full_refresh=True)
+        self.assertEqual(len(load_dataframe(self.config.data_file_path)), len(self.df) - 10)
+
+    def test_empty_full_export_drops_the_previous_watermark(self):
+        DataIngestion(self.config).initiate_data_ingestion()
+        self.assertTrue(os.path.exists(self.config.watermark_path))
+
+        self.collection.delete_many({})
+        DataIngestion(self.config).initiate_data_ingestion(full_refresh=True)
+        self.assertFalse(os.path.exists(self.config.watermark_path))
+
+        # The next run is a full export again, not a delta past the old watermark
+        self.collection.insert_many(self.df.iloc[:10].astype(object).where(self.df.iloc[:10].notna(), "na")
+                                    .to_dict(orient="records"))
+        DataIngestion(self.config).initiate_data_ingestion()
+        self.assertEqual(len(load_dataframe(self.config.data_file_path)), 10)
+
+    def test_id_watermark_is_not_passed_on(self):
+        ingestion = DataIngestion(self.config)
+        documents = []
+        to_frame = ingestion._to_frame
+        ingestion._to_frame = lambda batch: documents.extend(batch) or to_frame(batch)
+        list(ingestion.iter_collection_chunks())
+
+        self.assertEqual(len(documents), len(self.df))
+        self.assertTrue(all(set(document) == set(self.df.columns) for document in documents))
+        self.assertEqual(ingestion.last_watermark, self.collection.find_one(sort=[("_id", -1)])["_id"])
+
+if __name__ == "__main__":
+    unittest.main()
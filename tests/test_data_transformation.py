@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+import dataclasses
+import joblib
+import numpy as np
+import pandas as pd
+from src.components.data_transformation import DataTransformation
+from src.config.configuration import ConfigurationManager
+from src.utils.artifacts import save_dataframe, load_dataframe
+from src.utils.transformers import FeaturePreprocessor
+
+class TestChunkedTransformation(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        df = pd.read_csv("customer_churn_dataset/customer_churn_dataset.csv").head(3001)
+        df.loc[df.sample(frac=0.05, random_state=0).index, "total_charges"] = np.nan
+        self.df = df
+        self.data_path = os.path.join(self.tmp.name, "data.parquet")
+        save_dataframe(df, self.data_path)
+        self.base = ConfigurationManager().get_data_transformation_config()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def transformation(self, mode, name=None):
+        name = name or mode
+        path = lambda file_name: os.path.join(self.tmp.name, f"{name}_{file_name}")
+        return DataTransformation(dataclasses.replace(
+            self.base, data_path=self.data_path, mode=mode, chunk_size=700,
+            transformed_train_path=path("train.parquet"), transformed_test_path=path("test.parquet"),
+            preprocessor_path=path("preprocessor.pkl"), feature_schema_path=path("feature_schema.json"),
+        ))
+
+    def outputs(self, transformation):
+        config = transformation.config
+        return (load_dataframe(config.transformed_train_path), load_dataframe(config.transformed_test_path),
+                joblib.load(config.preprocessor_path))
+
+    def test_chunked_matches_in_memory_encoding(self):
+        chunked = self.transformation("chunked")
+        fill_values = chunked.scan().fill_values_
+        # Charges are float32 under the declared schema
+        self.assertAlmostEqual(fill_values["total_charges"], self.df["total_charges"].median(), places=2)
+        self.assertEqual(fill_values["tenure"], round(self.df["tenure"].median()))
+        self.assertEqual(fill_values["internet_service"], "Unknown")
+
+        memory = self.transformation("memory")
+        memory.transform_data()
+        chunked.transform_data()
+        memory_train, memory_test, memory_preprocessor = self.outputs(memory)
+        chunked_train, chunked_test, chunked_preprocessor = self.outputs(chunked)
+
+        for col, encoder in memory_preprocessor.encoders.items():
+            self.assertListEqual(list(encoder.classes_), list(chunked_preprocessor.encoders[col].classes_))
+        # Same rows, only split differently
+        sort = lambda frame: frame.sort_values(list(frame.columns)).reset_index(drop=True)
+        pd.testing.assert_frame_equal(sort(pd.concat([memory_train, memory_test])),
+                                      sort(pd.concat([chunked_train, chunked_test])))
+
+    def test_hash_split_is_deterministic(self):
+        first, second = self.transformation("chunked", "first"), self.transformation("chunked", "second")
+        first.transform_data()
+        second.transform_data()
+        pd.testing.assert_frame_equal(self.outputs(first)[1], self.outputs(second)[1])
+        self.assertAlmostEqual(len(self.outputs(first)[1]) / len(self.df), 0.2, delta=0.03)
+
+    def test_median_from_counts(self):
+        for values in ([3, 1, 2], [4, 1, 3, 2], [5, 5, 5, 1]):
+            counts = pd.Series(values).value_counts()
+            self.assertEqual(FeaturePreprocessor.median_from_counts(counts), pd.Series(values).median())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import time
+import asyncio
+import unittest
+from app.executor import InferenceExecutor, QueueFullError
+
+def slow_square(x):
+    time.sleep(0.05)
+    return x * x
+
+class TestInferenceExecutor(unittest.TestCase):
+
+    def run_calls(self, executor, n_calls, shed=True):
+        async def scenario():
+            return await asyncio.gather(
+                *(executor.run(slow_square, i, shed=shed) for i in range(n_calls)), return_exceptions=True
+            )
+        try:
+            return asyncio.run(scenario())
+        finally:
+            executor.shutdown()
+
+    def test_calls_run_off_the_event_loop(self):
+        executor = InferenceExecutor(max_workers=2, max_queue_depth=4)
+        self.assertEqual(self.run_calls(executor, 6), [i * i for i in range(6)])
+        self.assertEqual(executor.queue_depth, 0)
+
+    def test_calls_beyond_the_queue_are_shed(self):
+        executor = InferenceExecutor(max_workers=1, max_queue_depth=1)
+        results = self.run_calls(executor, 4)
+
+        # One running, one queued, the rest rejected straight away
+        self.assertEqual(results[:2], [0, 1])
+        self.assertTrue(all(isinstance(r, QueueFullError) for r in results[2:]))
+
+    def test_admitted_work_is_not_shed(self):
+        executor = InferenceExecutor(max_workers=1, max_queue_depth=0)
+        self.assertEqual(self.run_calls(executor, 3, shed=False), [0, 1, 4])
+
+    def test_unknown_kind_is_rejected(self):
+        with self.assertRaises(ValueError):
+            InferenceExecutor(kind="gpu")
+
+if __name__ == "__main__":
+    unittest.main()
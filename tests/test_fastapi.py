@@ -1,6 +1,24 @@
+import json
 import unittest
+import pandas as pd
 from fastapi.testclient import TestClient
+from lightgbm import LGBMClassifier
+from sklearn.pipeline import Pipeline
+import app.main as app_module
 from app.main import app
+from src.utils.transformers import FeaturePreprocessor
+
+DATASET_PATH = "customer_churn_dataset/customer_churn_dataset.csv"
+
+def train_local_pipeline(n_rows=2000):
+    """Fits a small Preprocessor + LightGBM pipeline on the bundled dataset (no MLflow)."""
+    df = pd.read_csv(DATASET_PATH, nrows=n_rows).drop(columns=["customer_id"])
+    df["internet_service"] = df["internet_service"].fillna("Unknown")
+    preprocessor = FeaturePreprocessor().fit(df)
+    encoded = preprocessor.transform(df)
+    model = LGBMClassifier(n_estimators=20, verbosity=-1, random_state=42)
+    model.fit(encoded.drop(columns=["churn"]), encoded["churn"])
+    return Pipeline([("preprocessor", preprocessor), ("model", model)])
 
 class TestFastAPI(unittest.TestCase):
     
@@ -56,5 +74,79 @@ class TestFastAPI(unittest.TestCase):
         self.assertIn("probability", data)
         self.assertIsInstance(data["probability"], float)
 
+class TestBatchPrediction(unittest.TestCase):
+    """
+    Exercises /predict/batch against a locally trained pipeline,
+    so it runs without a model in the MLflow registry.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        # Keep the injected local model; don't let the registry poller swap it out
+        app_module.serving_config.hot_reload.enabled = False
+        cls.client = TestClient(app)
+        cls.client.__enter__()
+        cls.model = train_local_pipeline()
+        app_module.pipeline.model = cls.model
+
+        df = pd.read_csv(DATASET_PATH, nrows=25).drop(columns=["customer_id", "churn"])
+        df["internet_service"] = df["internet_service"].fillna("Unknown")
+        cls.records = df.to_dict(orient="records")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.client.__exit__(None, None, None)
+        app_module.serving_config.hot_reload.enabled = True
+
+    def test_json_batch_matches_model(self):
+        response = self.client.post("/predict/batch", json=self.records)
+        self.assertEqual(response.status_code, 200)
+        predictions = response.json()["predictions"]
+        self.assertEqual(len(predictions), len(self.records))
+
+        expected = self.model.predict_proba(pd.DataFrame(self.records))[:, 1]
+        for row, proba in zip(predictions, expected):
+            self.assertAlmostEqual(row["probability"], float(proba))
+            self.assertEqual(row["prediction"], "Churn" if proba >= 0.5 else "No Churn")
+
+    def test_ndjson_batch_streams_lines(self):
+        body = "\n".join(json.dumps(r) for r in self.records)
+        response = self.client.post(
+            "/predict/batch", content=body, headers={"content-type": "application/x-ndjson"}
+        )
+        self.assertEqual(response.status_code, 200)
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual(len(lines), len(self.records))
+        self.assertIn("probability", lines[0])
+
+    def test_single_predict_uses_local_model(self):
+        response = self.client.post("/predict", json=self.records[0])
+        self.assertEqual(response.status_code, 200)
+        expected = self.model.predict_proba(pd.DataFrame(self.records[:1]))[0][1]
+        self.assertAlmostEqual(response.json()["probability"], float(expected))
+        self.assertEqual(response.json()["threshold"], 0.5)
+        self.assertIn("model_version", response.json())
+
+    def test_decision_threshold_drives_class(self):
+        app_module.pipeline.threshold = 0.0
+        try:
+            response = self.client.post("/predict/batch", json=self.records)
+        finally:
+            app_module.pipeline.threshold = 0.5
+        self.assertTrue(all(row["prediction"] == "Churn" for row in response.json()["predictions"]))
+
+    def test_missing_fields_are_imputed(self):
+        partial = [{"tenure": 3, "contract": "Month-to-month"}, {}]
+        response = self.client.post("/predict/batch", json=partial)
+        self.assertEqual(response.status_code, 200)
+        features = list(self.model.named_steps["model"].feature_name_)
+        expected = self.model.predict_proba(pd.DataFrame.from_records(partial, columns=features))[:, 1]
+        for row, proba in zip(response.json()["predictions"], expected):
+            self.assertAlmostEqual(row["probability"], float(proba))
+
+    def test_invalid_record_rejected(self):
+        response = self.client.post("/predict/batch", json=[{"tenure": "abc"}])
+        self.assertEqual(response.status_code, 422)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+from scripts.load_test import parse_metrics, summarize_step, saturation_point, sizing_hint
+
+METRICS_TEXT = """# HELP process_cpu_seconds_total Total user and system CPU time spent in seconds.
+# TYPE process_cpu_seconds_total counter
+process_cpu_seconds_total 12.5
+# HELP prediction_latency_seconds Time taken for model inference in seconds
+# TYPE prediction_latency_seconds histogram
+prediction_latency_seconds_bucket{le="0.01"} 3.0
+prediction_latency_seconds_count 4.0
+prediction_latency_seconds_sum 0.02
+# HELP http_requests_total Total number of requests.
+# TYPE http_requests_total counter
+http_requests_total{handler="/predict",method="POST",status="2xx"} 4.0
+"""
+
+def step(target, statuses, latency=0.01, seconds=1.0, mode="rps"):
+    outcomes = [(status, latency) for status in statuses]
+    return summarize_step(mode, target, outcomes, seconds)
+
+class TestLoadTest(unittest.TestCase):
+
+    def test_parse_metrics_keeps_scraped_metrics_only(self):
+        self.assertEqual(parse_metrics(METRICS_TEXT), {
+            "process_cpu_seconds_total": 12.5,
+            "prediction_latency_seconds_count": 4.0,
+            "prediction_latency_seconds_sum": 0.02,
+        })
+
+    def test_summarize_step_counts_errors(self):
+        summary = step(4, [200, 200, 200, 429])
+        self.assertEqual(summary["statuses"], {"200": 3, "429": 1})
+        self.assertAlmostEqual(summary["error_rate"], 0.25)
+        self.assertAlmostEqual(summary["achieved_rps"], 3.0)
+        self.assertAlmostEqual(summary["p95_ms"], 10.0)
+
+    def test_saturation_point(self):
+        steps = [step(10, [200] * 10), step(20, [200] * 20), step(40, [200] * 25), step(80, [200] * 30)]
+        sustainable, saturated, reason = saturation_point(steps, slo_ms=100, max_error_rate=0.01)
+        self.assertEqual((sustainable["target"], saturated["target"]), (20, 40))
+        self.assertIn("25.0 of 40 rps", reason)
+
+        slow = [step(1, [200] * 5, mode="concurrency"), step(8, [200] * 5, latency=0.5, mode="concurrency")]
+        sustainable, saturated, reason = saturation_point(slow, slo_ms=100, max_error_rate=0.01)
+        self.assertEqual((sustainable["target"], saturated["target"]), (1, 8))
+        self.assertIn("p95", reason)
+
+        self.assertEqual(saturation_point(steps[:2], 100, 0.01)[1:], (None, None))
+
+    def test_sizing_hint(self):
+        sustainable = dict(step(10, [200] * 10), server={"cpu_cores": 0.42, "peak_rss_mb": 300})
+        self.assertEqual(sizing_hint(sustainable), {"requests": {"cpu": "0.42", "memory": "300Mi"},
+                                                    "limits": {"memory": "375Mi"}})
+        self.assertIsNone(sizing_hint(None))
+
+if __name__ == "__main__":
+    unittest.main()
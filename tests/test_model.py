@@ -4,6 +4,7 @@ import os
 import pandas as pd
 import yaml
 from sklearn.metrics import accuracy_score, f1_score
+from src.utils.artifacts import load_dataframe
 
 class TestModelLoading(unittest.TestCase):
 
@@ -50,7 +51,7 @@ class TestModelLoading(unittest.TestCase):
             if not os.path.exists(test_data_path):
                  raise FileNotFoundError(f"Test data not found at {test_data_path}. Run 'dvc repro' first.")
                  
-            cls.test_df = pd.read_csv(test_data_path)
+            cls.test_df = load_dataframe(test_data_path)
             
         except Exception as e:
             # If explicit error (like config missing), we assume test failure unless it's just "No Model"
@@ -0,0 +1,47 @@
+import os
+import tempfile
+import unittest
+from src.utils.model_cache import ModelCache
+
+class TestModelCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ModelCache(os.path.join(self.tmp.name, "cache"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_model_dir(self, content):
+        path = tempfile.mkdtemp(dir=self.tmp.name)
+        with open(os.path.join(path, "MLmodel"), "w") as f:
+            f.write(content)
+        return path
+
+    def test_store_and_lookup_by_version_and_alias(self):
+        path = self.cache.store("Churn", "3", self.make_model_dir("v3"), alias="Production")
+
+        self.assertEqual(self.cache.lookup("Churn", version="3"), ("3", path))
+        self.assertEqual(self.cache.lookup("Churn", alias="Production"), ("3", path))
+        self.assertIsNone(self.cache.lookup("Churn", alias="Staging"))
+        self.assertIsNone(self.cache.lookup("Churn", version="4"))
+
+    def test_identical_artifacts_are_stored_once(self):
+        first = self.cache.store("Churn", "1", self.make_model_dir("same"))
+        second = self.cache.store("Churn", "2", self.make_model_dir("same"))
+        third = self.cache.store("Churn", "3", self.make_model_dir("different"))
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, third)
+        self.assertEqual(len(os.listdir(self.cache.objects_dir)), 2)
+
+    def test_alias_moves_to_new_version(self):
+        self.cache.store("Churn", "1", self.make_model_dir("v1"), alias="Production")
+        self.cache.store("Churn", "2", self.make_model_dir("v2"), alias="Production")
+
+        # A fresh instance reads the persisted index
+        version, _ = ModelCache(self.cache.root_dir).lookup("Churn", alias="Production")
+        self.assertEqual(version, "2")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+import numpy as np
+from sklearn.metrics import f1_score, roc_auc_score
+from src.components.model_evaluation import ModelEvaluation
+from src.entity.config_entity import ModelEvaluationConfig
+
+class FakeRegistry:
+    def get_model_version_by_alias(self, name, alias):
+        return SimpleNamespace(version="3")
+
+class TestModelEvaluation(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.evaluation = ModelEvaluation(ModelEvaluationConfig(
+            root_dir=self.tmp.name, test_data_path=None, model_path=None, metric_file_name=None,
+            champion_cache_dir=os.path.join(self.tmp.name, "champion_cache"), decision_threshold=0.5,
+            mlflow_config={}
+        ))
+        rng = np.random.default_rng(0)
+        self.y = rng.integers(0, 2, 500)
+        self.probabilities = np.clip(self.y * 0.6 + rng.uniform(0, 0.4, 500), 0, 1)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_scores_from_one_probability_vector(self):
+        scores = self.evaluation.compute_scores(self.y, self.probabilities)
+        self.assertAlmostEqual(scores["f1_score"], f1_score(self.y, self.probabilities >= 0.5))
+        self.assertAlmostEqual(scores["roc_auc"], roc_auc_score(self.y, self.probabilities))
+        self.assertTrue(0 <= scores["expected_calibration_error"] <= 1)
+
+        # Perfectly calibrated and separated predictions
+        perfect = self.evaluation.compute_scores(self.y, self.y.astype(float))
+        self.assertEqual(perfect["accuracy"], 1.0)
+        self.assertAlmostEqual(perfect["expected_calibration_error"], 0.0)
+
+    def test_labels_use_the_serving_threshold(self):
+        probabilities = np.array([0.2, 0.5, 0.7, 0.9])
+        y = np.array([0, 1, 0, 1])
+        # A probability equal to the threshold is churn, like in PredictionPipeline
+        self.assertEqual(self.evaluation.compute_scores(y, probabilities)["recall"], 1.0)
+        strict = self.evaluation.compute_scores(y, probabilities, threshold=0.8)
+        self.assertEqual((strict["precision"], strict["recall"]), (1.0, 0.5))
+
+    def test_champion_predictions_come_from_cache(self):
+        # A cached entry for this version and test set means the registry model is never loaded
+        test_hash = "ab" * 32
+        os.makedirs(self.evaluation.config.champion_cache_dir)
+        np.save(os.path.join(self.evaluation.config.champion_cache_dir, f"v3_{test_hash[:16]}.npy"), self.probabilities)
+        cached = self.evaluation.champion_probabilities(FakeRegistry(), "ChurnModel", None, test_hash)
+        np.testing.assert_array_equal(cached, self.probabilities)
+
+if __name__ == "__main__":
+    unittest.main()
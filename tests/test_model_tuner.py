@@ -0,0 +1,91 @@
+import os
+import tempfile
+import unittest
+import dataclasses
+import pandas as pd
+from sklearn.metrics import f1_score
+from src.components.model_tuner import ModelTuner, _init_search_worker, _fit_trial, _search_data
+from src.components.model_trainer import ModelTrainer
+from src.config.configuration import ConfigurationManager
+from src.utils.artifacts import save_dataframe
+from src.utils.common import save_json
+from src.utils.transformers import FeaturePreprocessor
+from pathlib import Path
+
+class TestModelTuner(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        df = pd.read_csv("customer_churn_dataset/customer_churn_dataset.csv").head(2000)
+        self.preprocessor = FeaturePreprocessor()
+        encoded = self.preprocessor.fit_transform(df.drop(columns=["customer_id"]).fillna({"internet_service": "Unknown"}))
+        self.encoded = encoded
+        self.train_path = os.path.join(self.tmp.name, "train.parquet")
+        save_dataframe(encoded, self.train_path)
+        manager = ConfigurationManager()
+        self.config = dataclasses.replace(
+            manager.get_model_tuner_config(), train_data_path=self.train_path, n_trials=6, n_jobs=1,
+            min_estimators=10, max_estimators=60, halving_factor=3,
+            best_params_path=os.path.join(self.tmp.name, "best_params.json"),
+        )
+        self.trainer_config = manager.get_model_trainer_config()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_trials_and_rungs_follow_the_config(self):
+        tuner = ModelTuner(self.config)
+        self.assertEqual(tuner.rungs(), [10, 30, 60])
+        trials = tuner.sample_trials()
+        self.assertEqual(trials, tuner.sample_trials())  # seeded
+        for params in trials:
+            space = self.config.search_space["learning_rate"]
+            self.assertTrue(space["low"] <= params["learning_rate"] <= space["high"])
+            self.assertIn(params["max_depth"], self.config.search_space["max_depth"]["choices"])
+
+    def test_search_prunes_down_to_one_finalist(self):
+        tuner = ModelTuner(self.config)
+        trials = tuner.search()
+        # 6 trials -> 2 -> 1 over three rungs
+        self.assertEqual(sum(t["pruned_at"] == 0 for t in trials), 4)
+        self.assertEqual(sum(t["pruned_at"] == 1 for t in trials), 1)
+        best = tuner.best_trial(trials)
+        self.assertIsNone(best["pruned_at"])
+        self.assertLessEqual(best["results"][2]["best_iteration"], 60)
+
+    def test_trial_f1_uses_the_decision_threshold(self):
+        # Run in this process: a threshold of 0 classifies every validation row as churn
+        _init_search_worker(self.train_path, self.config.validation_size, self.config.random_state, [], 0.0)
+        self.addCleanup(_search_data.clear)
+        params = dict(self.config.base_params, n_jobs=1)
+        result = _fit_trial(params, 10, self.config.valid_name, self.config.metric, 5)
+        valid_y = _search_data["valid_y"]
+        self.assertAlmostEqual(result["f1_score"], f1_score(valid_y, [1] * len(valid_y)))
+
+    def test_trainer_uses_tuned_params(self):
+        trainer_config = dataclasses.replace(self.trainer_config, best_params_path=self.config.best_params_path)
+        save_json(Path(self.config.best_params_path), {})
+        self.assertEqual(ModelTrainer(trainer_config).get_model_params()["n_estimators"], trainer_config.n_estimators)
+
+        save_json(Path(self.config.best_params_path), {"n_estimators": 42, "num_leaves": 16})
+        params = ModelTrainer(trainer_config).get_model_params()
+        self.assertEqual(params["n_estimators"], 42)
+        self.assertEqual(params["num_leaves"], 16)
+        self.assertEqual(params["class_weight"], trainer_config.class_weight)
+
+    def test_trainer_early_stopping_and_categorical_features(self):
+        trainer = ModelTrainer(dataclasses.replace(self.trainer_config, early_stopping_rounds=10))
+        x, y = self.encoded.iloc[:, :-1], self.encoded.iloc[:, -1]
+        categorical = trainer.get_categorical_features(self.preprocessor, list(x.columns))
+        self.assertIn("contract", categorical)
+        self.assertNotIn("tenure", categorical)
+
+        params = dict(trainer.get_model_params(), n_estimators=500, learning_rate=0.3)
+        self.assertLess(trainer.find_n_estimators(x, y, params, categorical), 500)
+
+        trainer = ModelTrainer(dataclasses.replace(self.trainer_config, early_stopping_rounds=0, native_categorical=False))
+        self.assertEqual(trainer.get_categorical_features(self.preprocessor, list(x.columns)), [])
+        self.assertEqual(trainer.find_n_estimators(x, y, params, []), 500)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import time
+import asyncio
+import unittest
+from app.prediction_cache import LocalCacheBackend, PredictionCache
+
+class TestLocalCacheBackend(unittest.TestCase):
+
+    def test_least_recently_used_entry_is_evicted(self):
+        backend = LocalCacheBackend(max_entries=2, ttl_seconds=60)
+        backend.set("a", 1)
+        backend.set("b", 2)
+        backend.get("a")
+        backend.set("c", 3)
+
+        self.assertEqual(backend.get("a"), 1)
+        self.assertIsNone(backend.get("b"))
+        self.assertEqual(len(backend), 2)
+
+    def test_entries_expire(self):
+        backend = LocalCacheBackend(ttl_seconds=0.01)
+        backend.set("a", 1)
+        time.sleep(0.02)
+        self.assertIsNone(backend.get("a"))
+
+class TestPredictionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = PredictionCache(LocalCacheBackend())
+        self.calls = []
+
+    def score(self, records, model_version="1", threshold=0.5):
+        async def score_fn(missed):
+            self.calls.append(len(missed))
+            return [(1, r["x"] / 10, model_version, threshold) for r in missed]
+        return asyncio.run(self.cache.score(records, model_version, threshold, score_fn))
+
+    def test_only_misses_are_scored(self):
+        self.score([{"x": 1}, {"x": 2}])
+        results = self.score([{"x": 2}, {"x": 3}, {"x": 1}])
+
+        self.assertEqual(self.calls, [2, 1])
+        self.assertEqual([r[1] for r in results], [0.2, 0.3, 0.1])
+
+    def test_key_is_canonical(self):
+        self.assertEqual(
+            PredictionCache.key({"a": 1, "b": "x"}, "1", 0.5),
+            PredictionCache.key({"b": "x", "a": 1}, "1", 0.5)
+        )
+
+    def test_new_model_version_invalidates(self):
+        self.cache.invalidate("1")
+        self.score([{"x": 1}])
+        self.cache.invalidate("1")
+        self.score([{"x": 1}])
+        self.assertEqual(self.calls, [1])
+
+        self.cache.invalidate("2")
+        self.assertEqual(len(self.cache.backend), 0)
+        self.score([{"x": 1}], model_version="2")
+        self.assertEqual(self.calls, [1, 1])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import asyncio
+import unittest
+from app.reloader import ModelReloader
+
+class FakePipeline:
+    """Stands in for PredictionPipeline; the 'registry' is a shared dict."""
+    registry = {"version": "1"}
+
+    def __init__(self):
+        self.model = None
+        self.model_version = None
+
+    def registry_version(self):
+        return self.registry["version"]
+
+    def load_resources(self, version=None):
+        self.model = object()
+        self.model_version = version
+
+class SharedFakePipeline(FakePipeline):
+    """Serves from a memory-mapped engine, like PredictionPipeline.load_shared: `model` stays None."""
+
+    def load_resources(self, version=None):
+        self.engine = object()
+        self.model_version = version
+
+class TestModelReloader(unittest.TestCase):
+
+    def setUp(self):
+        FakePipeline.registry["version"] = "1"
+        self.served = FakePipeline()
+        self.served.load_resources("1")
+        self.swaps = []
+
+        def swap(new_pipeline):
+            self.swaps.append(new_pipeline)
+            self.served = new_pipeline
+
+        self.reloader = ModelReloader(lambda: self.served, swap, FakePipeline, poll_interval_seconds=0.01)
+
+    def test_no_swap_when_alias_unchanged(self):
+        self.assertFalse(asyncio.run(self.reloader.check()))
+        self.assertEqual(self.swaps, [])
+
+    def test_swaps_in_new_version(self):
+        old = self.served
+        FakePipeline.registry["version"] = "2"
+        self.assertTrue(asyncio.run(self.reloader.check()))
+
+        self.assertEqual(self.served.model_version, "2")
+        # The old pipeline object is untouched, so in-flight requests can finish on it
+        self.assertEqual(old.model_version, "1")
+
+    def test_no_swap_for_shared_model_when_alias_unchanged(self):
+        served = SharedFakePipeline()
+        served.load_resources("1")
+        reloader = ModelReloader(lambda: served, self.swaps.append, SharedFakePipeline, poll_interval_seconds=0.01)
+        self.assertFalse(asyncio.run(reloader.check()))
+        self.assertEqual(self.swaps, [])
+
+    def test_loads_when_startup_failed(self):
+        self.served = None
+        self.assertTrue(asyncio.run(self.reloader.check()))
+        self.assertEqual(self.served.model_version, "1")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from src.entity.schema import apply_schema, code_dtype, fill_label_column
+from src.utils.artifacts import ChunkedWriter, load_dataframe
+
+DTYPES = {"customer_id": "Int32", "tenure": "Int16", "monthly_charges": "float32", "contract": "category"}
+
+class TestSchema(unittest.TestCase):
+
+    def test_chunks_with_their_own_categories_round_trip_in_every_format(self):
+        chunks = [
+            pd.DataFrame({"customer_id": [1, 2], "tenure": [3, None], "monthly_charges": [10.5, 20.0],
+                          "contract": ["One year", "Two year"]}),
+            pd.DataFrame({"customer_id": [3, 4], "tenure": [5, 6], "monthly_charges": [30.0, None],
+                          "contract": ["Month-to-month", None]}),
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            for suffix in [".parquet", ".feather", ".csv"]:
+                path = os.path.join(tmp, f"data{suffix}")
+                with ChunkedWriter(path, dtypes=DTYPES) as writer:
+                    for chunk in chunks:
+                        writer.write(apply_schema(chunk, DTYPES))
+                df = load_dataframe(path, dtypes=DTYPES)
+                self.assertEqual({col: str(dtype) for col, dtype in df.dtypes.items()}, DTYPES)
+                self.assertEqual(sorted(df["contract"].dropna()), ["Month-to-month", "One year", "Two year"])
+                self.assertTrue(pd.isna(df["tenure"][1]))
+
+    def test_label_fill_and_code_dtype(self):
+        filled = fill_label_column(pd.Series(["a", None], dtype="category"))
+        self.assertEqual(filled.tolist(), ["a", "Unknown"])
+        self.assertEqual(code_dtype(2), "int8")
+        self.assertEqual(code_dtype(128), "int8")
+        self.assertEqual(code_dtype(129), "int16")
+        # The unknown code must fit too
+        self.assertEqual(code_dtype(3, unknown_value=999), "int16")
+        self.assertEqual(code_dtype(3, unknown_value=-200), "int16")
+        self.assertEqual(code_dtype(3, unknown_value=-1), "int8")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from lightgbm import LGBMClassifier
+from src.pipeline.prediction_pipeline import PredictionPipeline
+from src.utils.shared_model import SharedModelStore
+from src.utils.transformers import FeaturePreprocessor
+from src.utils.tree_engine import CompiledTreeEnsemble
+
+class TestSharedModelStore(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        df = pd.read_csv("customer_churn_dataset/customer_churn_dataset.csv", nrows=2000).drop(columns=["customer_id"])
+        df["internet_service"] = df["internet_service"].fillna("Unknown")
+        cls.raw = df.drop(columns=["churn"])
+        cls.preprocessor = FeaturePreprocessor().fit(df)
+        encoded = cls.preprocessor.transform(df)
+        model = LGBMClassifier(n_estimators=20, verbosity=-1, random_state=42)
+        model.fit(encoded.drop(columns=["churn"]), encoded["churn"])
+        cls.engine = CompiledTreeEnsemble.from_booster(model.booster_)
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = SharedModelStore(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_export_is_memory_mapped(self):
+        self.assertIsNone(self.store.load("Churn", "1"))
+        self.store.export("Churn", "1", self.preprocessor, self.engine)
+        # Exporting the same version again (another worker) keeps the first export
+        self.store.export("Churn", "1", self.preprocessor, self.engine)
+
+        preprocessor, engine = self.store.load("Churn", "1")
+        self.assertIsInstance(engine.threshold, np.memmap)
+        self.assertFalse(engine.threshold.flags.writeable)
+
+        X = self.preprocessor.transform(self.raw)[self.engine.feature_names].to_numpy(np.float64)
+        np.testing.assert_array_equal(engine.predict_raw(X), self.engine.predict_raw(X))
+        self.assertEqual(preprocessor.encoders.keys(), self.preprocessor.encoders.keys())
+
+    def test_pipeline_serves_from_shared_export(self):
+        self.store.export("Churn", "3", self.preprocessor, self.engine)
+        pipeline = PredictionPipeline()
+        pipeline.shared_store = self.store
+        pipeline.model_name = "Churn"
+        pipeline.load_shared("3", model_uri=None, source="cache")
+        pipeline.prepare_inference()
+
+        records = self.raw.head(20).to_dict(orient="records")
+        _, proba = pipeline.predict_batch(records)
+        self.assertIsNone(pipeline.model)
+        X = self.preprocessor.transform(self.raw.head(20))[self.engine.feature_names].to_numpy(np.float64)
+        np.testing.assert_allclose(proba, self.engine.predict_proba(X)[:, 1], atol=1e-12)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import os
+import sys
+import shutil
+import subprocess
+import tempfile
+from functools import partial
+import unittest
+import yaml
+from src.pipeline.stage_runner import StageRunner
+
+class TestStageRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = lambda name: os.path.join(self.tmp.name, name)
+        self.write(self.path("input.txt"), "a,b\n1,2\n")
+        self.write_params(n_estimators=10)
+        with open(self.path("dvc.yaml"), "w") as f:
+            yaml.safe_dump({"stages": {
+                "ingest": {"cmd": "python ingest.py", "always_changed": True,
+                           "outs": [{self.path("input_copy.txt"): {"persist": True}}]},
+                "train": {"cmd": "python train.py", "deps": [self.path("input.txt")],
+                          "params": ["model.n_estimators"], "outs": [self.path("model.txt")]},
+            }}, f)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    @staticmethod
+    def write(path, content):
+        with open(path, "w") as f:
+            f.write(content)
+
+    def write_params(self, **model):
+        with open(self.path("params.yaml"), "w") as f:
+            yaml.safe_dump({"model": dict(model, learning_rate=0.1)}, f)
+
+    def runner(self):
+        return StageRunner(self.path("manifest.json"), dvc_file=self.path("dvc.yaml"),
+                           params_file=self.path("params.yaml"))
+
+    def run_train(self):
+        # Stage callables run in a worker process, so they must be picklable
+        train = partial(shutil.copyfile, self.path("input.txt"), self.path("model.txt"))
+        return self.runner().run_all([("train", "Train stage", train)]) == ["train"]
+
+    def test_unchanged_stage_is_skipped(self):
+        self.assertTrue(self.run_train())
+        self.assertFalse(self.run_train())
+
+    def test_changed_inputs_params_or_outputs_rerun(self):
+        self.run_train()
+        self.write(self.path("input.txt"), "a,b\n1,3\n")
+        self.assertTrue(self.run_train())
+
+        self.write_params(n_estimators=20)
+        self.assertTrue(self.run_train())
+
+        os.remove(self.path("model.txt"))
+        self.assertTrue(self.run_train())
+
+    def test_always_changed_stage_always_runs(self):
+        stages = [("ingest", "Ingest stage", partial(shutil.copyfile, self.path("input.txt"), self.path("input_copy.txt")))]
+        self.assertEqual(self.runner().run_all(stages), ["ingest"])
+        self.assertEqual(self.runner().run_all(stages), ["ingest"])
+
+class TestStageDAG(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = lambda name: os.path.join(self.tmp.name, name)
+        with open(self.path("input.txt"), "w") as f:
+            f.write("data")
+        with open(self.path("params.yaml"), "w") as f:
+            yaml.safe_dump({}, f)
+        # prepare -> (model_a, model_b) -> compare
+        self.graph = {
+            "prepare": (["input.txt"], "prepared.txt"),
+            "model_a": (["prepared.txt"], "a.txt"),
+            "model_b": (["prepared.txt"], "b.txt"),
+            "compare": (["a.txt", "b.txt"], "report.txt"),
+        }
+        with open(self.path("dvc.yaml"), "w") as f:
+            yaml.safe_dump({"stages": {
+                name: {"cmd": f"python {name}.py", "deps": [self.path(dep) for dep in deps], "outs": [self.path(out)]}
+                for name, (deps, out) in self.graph.items()
+            }}, f)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def runner(self):
+        return StageRunner(self.path("manifest.json"), dvc_file=self.path("dvc.yaml"),
+                           params_file=self.path("params.yaml"))
+
+    def stages(self):
+        # Picklable stage callables: each copies its first dep to its output
+        return [(name, name, partial(shutil.copyfile, self.path(deps[0]), self.path(out)))
+                for name, (deps, out) in self.graph.items()]
+
+    def test_dependencies_follow_deps_and_outs(self):
+        upstream = self.runner().dependencies(list(self.graph))
+        self.assertEqual(upstream["prepare"], set())
+        self.assertEqual(upstream["model_a"], {"prepare"})
+        self.assertEqual(upstream["compare"], {"model_a", "model_b"})
+
+    def test_run_all_runs_in_order_then_skips(self):
+        runner = self.runner()
+        ran = runner.run_all(self.stages(), jobs=2)
+        self.assertEqual(ran[0], "prepare")
+        self.assertEqual(ran[-1], "compare")
+        self.assertTrue(os.path.exists(self.path("report.txt")))
+        self.assertTrue(all(peak_mb > 0 for _, _, _, peak_mb in runner.timings))
+
+        self.assertEqual(self.runner().run_all(self.stages(), jobs=2), [])
+
+    def test_peak_memory_covers_child_processes(self):
+        # A stage whose work happens in a child process, like the tuner's pool workers
+        allocate = partial(subprocess.run, [sys.executable, "-c", "data = b'x' * (300 * 2 ** 20)"], check=True)
+        runner = self.runner()
+        runner.run_all([("prepare", "prepare", allocate)])
+        self.assertGreaterEqual(runner.timings[0][3], 300)
+
+    def test_failed_stage_stops_downstream(self):
+        os.remove(self.path("input.txt"))
+        with self.assertRaises(RuntimeError):
+            self.runner().run_all(self.stages(), jobs=2)
+        self.assertFalse(os.path.exists(self.path("a.txt")))
+
+if __name__ == "__main__":
+    unittest.main()
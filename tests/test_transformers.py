@@ -0,0 +1,110 @@
+import pickle
+import unittest
+import numpy as np
+import pandas as pd
+from src.utils.transformers import FeaturePreprocessor
+
+class TestFeaturePreprocessor(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.df = pd.read_csv("customer_churn_dataset/customer_churn_dataset.csv").drop(columns=["customer_id"])
+        cls.df["internet_service"] = cls.df["internet_service"].fillna("Unknown")
+        cls.preprocessor = FeaturePreprocessor().fit(cls.df)
+
+    def test_matches_label_encoders_on_known_labels(self):
+        transformed = self.preprocessor.transform(self.df)
+        for col, le in self.preprocessor.encoders.items():
+            expected = le.transform(self.df[col].astype(str))
+            np.testing.assert_array_equal(transformed[col].to_numpy(), expected)
+            # Compact codes: every column here has fewer than 128 labels
+            self.assertEqual(transformed[col].dtype, np.int8)
+
+    def test_unseen_labels_use_unknown_value(self):
+        row = self.df.drop(columns=["churn"]).iloc[[0, 1]].copy()
+        row["contract"] = ["Ten year", "Two year"]
+
+        default = self.preprocessor.transform(row)
+        self.assertEqual(default["contract"].tolist(), [0, 2])
+
+        custom = FeaturePreprocessor(unknown_value=-1).fit(self.df).transform(row)
+        self.assertEqual(custom["contract"].tolist(), [-1, 2])
+
+    def test_out_of_range_unknown_value_is_not_wrapped(self):
+        preprocessor = FeaturePreprocessor(unknown_value=999).fit(self.df)
+        row = self.df.drop(columns=["churn"]).iloc[[0, 1]].copy()
+        row["contract"] = ["Ten year", "Two year"]
+        transformed = preprocessor.transform(row)
+        self.assertEqual(transformed["contract"].tolist(), [999, 2])
+        feature_names = list(row.columns)
+        np.testing.assert_array_equal(preprocessor.to_matrix(row.to_dict(orient="records"), feature_names),
+                                      transformed[feature_names].to_numpy(np.float64))
+
+    def test_to_matrix_matches_dataframe_transform(self):
+        features = self.df.drop(columns=["churn"])
+        records = features.head(200).to_dict(orient="records")
+        records[0]["contract"] = "Ten year"  # unseen label
+        records[1]["monthly_charges"] = None  # missing numeric
+
+        feature_names = list(features.columns)
+        expected = self.preprocessor.transform(pd.DataFrame(records))[feature_names].to_numpy(np.float64)
+        actual = self.preprocessor.to_matrix(records, feature_names)
+        np.testing.assert_array_equal(actual, expected)
+
+    def test_missing_values_use_fitted_fill_values(self):
+        raw = pd.read_csv("customer_churn_dataset/customer_churn_dataset.csv").drop(columns=["customer_id"])
+        preprocessor = FeaturePreprocessor().fit(raw)
+        self.assertEqual(preprocessor.fill_values_["internet_service"], "Unknown")
+        self.assertEqual(preprocessor.fill_values_["tenure"], round(raw["tenure"].median()))
+
+        features = raw.drop(columns=["churn"]).head(3).copy()
+        features.loc[0, "internet_service"] = None
+        features.loc[1, "monthly_charges"] = np.nan
+        transformed = preprocessor.transform(features)
+        self.assertEqual(transformed["internet_service"][0],
+                         list(preprocessor.encoders["internet_service"].classes_).index("Unknown"))
+        self.assertEqual(transformed["monthly_charges"][1], preprocessor.fill_values_["monthly_charges"])
+
+        # Absent fields are missing too, on both serving paths
+        records = [{"tenure": 5}, {}]
+        feature_names = list(features.columns)
+        expected = preprocessor.transform(pd.DataFrame.from_records(records, columns=feature_names))
+        actual = preprocessor.to_matrix(records, feature_names)
+        np.testing.assert_array_equal(actual, expected.to_numpy(np.float64))
+        self.assertFalse(np.isnan(actual).any())
+
+    def test_feature_schema(self):
+        feature_names = [col for col in self.df.columns if col != "churn"]
+        schema = self.preprocessor.get_feature_schema(feature_names)
+        self.assertEqual([f["name"] for f in schema["features"]], feature_names)
+        contract = schema["features"][feature_names.index("contract")]
+        self.assertTrue(contract["encoded"])
+        self.assertEqual(contract["categories"], ["Month-to-month", "One year", "Two year"])
+        with self.assertRaises(ValueError):
+            self.preprocessor.get_feature_schema(["not_a_column"])
+
+    def test_pickle_roundtrip(self):
+        self.preprocessor.transform(self.df.head())  # populate lookup cache
+        restored = pickle.loads(pickle.dumps(self.preprocessor))
+        pd.testing.assert_frame_equal(restored.transform(self.df), self.preprocessor.transform(self.df))
+
+    def test_pickling_keeps_the_partial_fit_state_of_the_original(self):
+        preprocessor = FeaturePreprocessor()
+        preprocessor.partial_fit(self.df.iloc[:500])
+        restored = pickle.loads(pickle.dumps(preprocessor))
+        self.assertFalse(hasattr(restored, "value_counts_"))
+        self.assertIn("tenure", preprocessor.value_counts_)
+
+        preprocessor.partial_fit(self.df.iloc[500:])
+        full = FeaturePreprocessor().fit(self.df)
+        self.assertEqual(preprocessor.fill_values_, full.fill_values_)
+        pd.testing.assert_frame_equal(preprocessor.transform(self.df), full.transform(self.df))
+
+    def test_pickling_keeps_the_caches_of_the_original(self):
+        self.preprocessor.transform(self.df.head())  # populate lookup cache
+        self.preprocessor.encode_column(["Two year"], "contract")
+        pickle.dumps(self.preprocessor)
+        self.assertIn("contract", self.preprocessor._category_indexes)
+
+if __name__ == "__main__":
+    unittest.main()
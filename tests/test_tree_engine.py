@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from lightgbm import LGBMClassifier
+from sklearn.pipeline import Pipeline
+from src.pipeline.prediction_pipeline import PredictionPipeline
+from src.utils.transformers import FeaturePreprocessor
+from src.utils.tree_engine import CompiledTreeEnsemble
+
+class TestCompiledTreeEnsemble(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        df = pd.read_csv("customer_churn_dataset/customer_churn_dataset.csv", nrows=5000).drop(columns=["customer_id"])
+        df["internet_service"] = df["internet_service"].fillna("Unknown")
+        cls.raw = df.drop(columns=["churn"])
+        cls.preprocessor = FeaturePreprocessor().fit(df)
+        encoded = cls.preprocessor.transform(df)
+        cls.X = encoded.drop(columns=["churn"])
+        cls.y = encoded["churn"]
+
+        # Exercise NaN handling on numeric splits
+        cls.X_missing = cls.X.astype(float)
+        cls.X_missing.loc[::7, "monthly_charges"] = np.nan
+        cls.X_missing.loc[::11, "tenure"] = 0
+
+    def assert_matches_lightgbm(self, model, X):
+        engine = CompiledTreeEnsemble.from_booster(model.booster_)
+        expected = model.predict_proba(X)
+        actual = engine.predict_proba(X.to_numpy(np.float64))
+        np.testing.assert_allclose(actual, expected, rtol=0, atol=1e-9)
+        return engine
+
+    def test_numerical_splits_with_missing_values(self):
+        model = LGBMClassifier(n_estimators=50, verbosity=-1, random_state=42).fit(self.X_missing, self.y)
+        self.assert_matches_lightgbm(model, self.X_missing)
+
+    def test_categorical_splits(self):
+        categorical = ["contract", "payment_method", "internet_service"]
+        model = LGBMClassifier(n_estimators=50, verbosity=-1, random_state=42)
+        model.fit(self.X, self.y, categorical_feature=categorical)
+
+        X_unseen = self.X.copy()
+        X_unseen.loc[::5, "payment_method"] = 42  # category never seen in training
+        self.assert_matches_lightgbm(model, X_unseen)
+
+    def test_save_and_load(self):
+        model = LGBMClassifier(n_estimators=20, verbosity=-1, random_state=42).fit(self.X, self.y)
+        engine = CompiledTreeEnsemble.from_booster(model.booster_)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "compiled_model.npz")
+            engine.save(path)
+            restored = CompiledTreeEnsemble.load(path)
+        self.assertEqual(restored.feature_names, engine.feature_names)
+        X = self.X.to_numpy(np.float64)
+        np.testing.assert_array_equal(restored.predict_raw(X), engine.predict_raw(X))
+
+    def test_native_backend_in_prediction_pipeline(self):
+        model = LGBMClassifier(n_estimators=20, verbosity=-1, random_state=42).fit(self.X, self.y)
+        pipeline = PredictionPipeline()
+        pipeline.model = Pipeline([("preprocessor", self.preprocessor), ("model", model)])
+        pipeline.compile_native_backend()
+
+        records = self.raw.head(50).to_dict(orient="records")
+        _, proba = pipeline.predict_batch(records)
+        np.testing.assert_allclose(proba, pipeline.model.predict_proba(self.raw.head(50))[:, 1], atol=1e-9)
+
+if __name__ == "__main__":
+    unittest.main()